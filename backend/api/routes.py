@@ -1,113 +1,453 @@
-from fastapi import APIRouter, HTTPException
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional, Tuple
+from fastapi import APIRouter, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from models.conversation import MessageRequest, MessageResponse
 from models.intake_form import (
+    FieldChange,
+    FormHistoryResponse,
+    FormRollbackRequest,
+    FormRollbackResponse,
+    FormVersionSummary,
+    SessionCreateRequest,
     SessionCreateResponse,
+    SessionListResponse,
     SessionStateResponse,
-    IntakeFormData
+    SessionSummary
 )
+from forms.registry import compiled_form, get_enabled_form_ids, get_form
 from services.conversation_service import get_conversation_service
-from services.extraction_service import get_extraction_service
+from services.extraction_scheduler import get_extraction_scheduler, merge_updates
+from services.analytics_service import get_analytics_service
+from services.export_service import MEDIA_TYPES, get_export_service
+from services.idempotency import (
+    IdempotencyKeyReusedError,
+    get_idempotency_cache,
+    request_fingerprint
+)
 from storage import in_memory_store
+from storage.state_token import InvalidStateTokenError, create_state_codec
+from serialization import FastJSONResponse, dumps, loads
+from config import settings
+from deadlines import DeadlineExceededError, start_deadline
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 conversation_service = get_conversation_service()
-extraction_service = get_extraction_service()
+extraction_scheduler = get_extraction_scheduler()
+analytics_service = get_analytics_service()
+idempotency_cache = get_idempotency_cache()
+export_service = get_export_service()
+# Stateless mode: sessions travel in a state token and are only held
+# server-side for the duration of a request
+state_codec = (
+    create_state_codec(settings.STATE_TOKEN_SECRET, settings.STATE_TOKEN_TTL_SECONDS)
+    if settings.STATELESS_SESSIONS else None
+)
+
+
+async def _run_idempotent(
+    scope: str,
+    idempotency_key: Optional[str],
+    payload: Any,
+    handler: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Run a request handler once per Idempotency-Key.
+
+    Args:
+        scope: Endpoint the key belongs to
+        idempotency_key: Idempotency-Key header value (None runs the handler directly)
+        payload: Request body, to detect a key reused for a different request
+        handler: Coroutine function producing the response
+
+    Returns:
+        The handler's response, shared by all requests with the same key
+
+    Raises:
+        HTTPException: If the key was already used for a different request
+    """
+    if not idempotency_key:
+        return await handler()
+    try:
+        return await idempotency_cache.run(
+            f"{scope} {idempotency_key}",
+            request_fingerprint(payload),
+            handler
+        )
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _load_state(session_id: str, state_token: Optional[str]) -> None:
+    """
+    Load a stateless session from its state token for the current request.
+
+    Args:
+        session_id: The session ID in the request path
+        state_token: X-Session-State header value
+
+    Raises:
+        HTTPException: If the token is missing, invalid, for another session,
+            or the session is already in use by another request
+    """
+    if not state_token:
+        raise HTTPException(status_code=400, detail="X-Session-State header is required")
+    try:
+        session = state_codec.decode(state_token)
+    except InvalidStateTokenError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    if session["session_id"] != session_id:
+        raise HTTPException(status_code=401, detail="Session state token is for another session")
+    if not in_memory_store.load_session(session):
+        raise HTTPException(status_code=409, detail="Session is in use by another request")
+
+
+def _unload_state(session_id: str) -> Optional[str]:
+    """
+    Drop a stateless session from the server after a request.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        State token for the session, or None if it was not loaded
+    """
+    extraction_scheduler.forget(session_id)
+    session = in_memory_store.unload_session(session_id)
+    return state_codec.encode(session) if session else None
+
+
+@router.get("/forms")
+async def list_forms():
+    """
+    List the intake forms enabled for this deployment.
+
+    Returns:
+        Form IDs, titles and dotted field paths
+    """
+    return [
+        {
+            "form_id": form.form_id,
+            "title": form.schema.title,
+            "fields": form.paths,
+            "required_fields": form.required_paths
+        }
+        for form in map(compiled_form, get_enabled_form_ids())
+    ]
+
+
+@router.get("/stats")
+async def get_stats():
+    """
+    Get intake analytics: session counts, completion rate, turns and
+    time to completion. Maintained incrementally, so this does not scale
+    with the number of sessions.
+
+    Returns:
+        Analytics snapshot
+    """
+    return analytics_service.get_stats()
+
+
+def _encode_cursor(sort: str, position: Tuple[str, str]) -> str:
+    """Encode a listing position as an opaque cursor."""
+    return base64.urlsafe_b64encode(dumps([sort, *position])).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by _encode_cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        cursor_sort, key, session_id = loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(key, str) or not isinstance(session_id, str):
+            raise ValueError(cursor)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different sort")
+    return key, session_id
+
+
+def _normalize_timestamp(value: Optional[str], name: str) -> Optional[str]:
+    """Parse an ISO timestamp filter into the stored timestamp format."""
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} timestamp")
+
+
+@router.get("/memory")
+async def get_memory_report(largest: int = Query(10, ge=0, le=100)):
+    """
+    Report memory used by sessions: per-tier totals (expanded hot sessions,
+    compressed cold sessions) and the largest sessions.
+
+    Args:
+        largest: Number of largest sessions to list
+
+    Returns:
+        Memory report
+    """
+    return await in_memory_store.get_memory_report(largest)
+
+
+@router.get("/export")
+async def export_intakes(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    form_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+):
+    """
+    Stream completed intakes as NDJSON, CSV or Parquet, oldest first.
+
+    Sessions are read and encoded a page at a time while the response is
+    being sent, so exports of any size start immediately and use constant
+    memory.
+
+    Args:
+        format: "ndjson", "csv" or "parquet" (Parquet needs pyarrow)
+        form_id: Only intakes of this form (defaults to DEFAULT_FORM for
+            CSV and Parquet; NDJSON exports every form if unset)
+        since: Inclusive lower bound on created_at (ISO timestamp)
+        until: Inclusive upper bound on created_at (ISO timestamp)
+
+    Returns:
+        Streaming export file
+    """
+    if form_id is None and format != "ndjson":
+        form_id = get_form().form_id
+    try:
+        export_service.check_format(format, form_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        export_service.stream(
+            format,
+            form_id,
+            _normalize_timestamp(since, "since"),
+            _normalize_timestamp(until, "until")
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="intakes.{format}"'}
+    )
+
+
+@router.get("/sessions", response_model=SessionListResponse)
+async def list_sessions(
+    sort: str = Query("created_at", pattern="^(created_at|last_updated)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    status: Optional[str] = Query(None, pattern="^(complete|incomplete)$"),
+    form_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None
+):
+    """
+    List sessions for operators, one page at a time.
+
+    Served from secondary indexes kept up to date on every mutation, so
+    a page costs the same with a hundred sessions or a few hundred thousand.
+
+    Args:
+        sort: Order by "created_at" or "last_updated"
+        order: "desc" (newest first) or "asc"
+        status: Only "complete" or "incomplete" sessions
+        form_id: Only sessions filling in this form
+        since: Inclusive lower bound (ISO timestamp, UTC) on the sort field
+        until: Inclusive upper bound (ISO timestamp, UTC) on the sort field
+        limit: Page size
+        cursor: next_cursor from the previous page
+
+    Returns:
+        A page of session summaries and the cursor for the next page
+    """
+    after = _decode_cursor(cursor, sort) if cursor else None
+    page, position = in_memory_store.list_sessions(
+        sort=sort,
+        descending=order == "desc",
+        after=after,
+        limit=limit,
+        status=status,
+        form_id=form_id,
+        since=_normalize_timestamp(since, "since"),
+        until=_normalize_timestamp(until, "until")
+    )
+
+    return SessionListResponse(
+        sessions=[SessionSummary(**summary) for summary in page],
+        next_cursor=_encode_cursor(sort, position) if position else None
+    )
 
 
 @router.post("/sessions", response_model=SessionCreateResponse)
-async def create_session():
+async def create_session(
+    request: Optional[SessionCreateRequest] = None,
+    idempotency_key: Optional[str] = Header(None)
+):
     """
     Create a new conversation session.
+    A retried request with the same Idempotency-Key returns the same session.
+
+    Args:
+        request: Optional body selecting the intake form (defaults to DEFAULT_FORM)
+        idempotency_key: Optional Idempotency-Key header
 
     Returns:
-        Session ID and initial greeting message
+        Session ID, form ID and initial greeting message
     """
+    return await _run_idempotent(
+        "POST /sessions",
+        idempotency_key,
+        request.model_dump() if request else None,
+        lambda: _create_session(request)
+    )
+
+
+async def _create_session(request: Optional[SessionCreateRequest]) -> SessionCreateResponse:
+    """Create a session and start its conversation."""
+    try:
+        form = get_form(request.form_id if request else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    session_id = None
     try:
         # Create new session in storage
-        session_id = in_memory_store.create_session()
+        session_id = in_memory_store.create_session(form.form_id)
 
         # Start conversation and get initial message
         initial_message = await conversation_service.start_conversation(session_id)
 
         return SessionCreateResponse(
             session_id=session_id,
-            initial_message=initial_message
+            form_id=form.form_id,
+            initial_message=initial_message,
+            state_token=_unload_state(session_id) if state_codec is not None else None
         )
     except Exception as e:
+        if state_codec is not None and session_id:
+            _unload_state(session_id)
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
 
 
 @router.post("/sessions/{session_id}/messages", response_model=MessageResponse)
-async def send_message(session_id: str, request: MessageRequest):
+async def send_message(
+    session_id: str,
+    request: MessageRequest,
+    idempotency_key: Optional[str] = Header(None),
+    x_session_state: Optional[str] = Header(None)
+):
     """
     Send a user message and get AI response with extracted form data.
 
+    A retried request with the same Idempotency-Key is not processed
+    again: it gets the original response, waiting for it if the original
+    is still running.
+
     Args:
         session_id: The session ID
         request: Message request with user message
+        idempotency_key: Optional Idempotency-Key header
+        x_session_state: Session state token (stateless mode only)
 
     Returns:
-        AI response and updated form fields
+        AI response and updated form fields, plus the new state token in stateless mode
     """
+    return await _run_idempotent(
+        f"POST /sessions/{session_id}/messages",
+        idempotency_key,
+        request.model_dump(),
+        lambda: _send_message(session_id, request, x_session_state)
+    )
+
+
+async def _send_message(
+    session_id: str,
+    request: MessageRequest,
+    state_token: Optional[str] = None
+) -> MessageResponse:
+    """Run a turn for a user message."""
+    if state_codec is not None:
+        _load_state(session_id, state_token)
+
     try:
         # Check if session exists
         session = in_memory_store.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        # Process user message and get AI response
-        assistant_response, conversation_history = await conversation_service.process_user_message(
+        # Process user message, get AI response and extract form data
+        assistant_response, updated_fields = await conversation_service.process_turn(
             session_id,
             request.message
         )
 
-        # Extract form data from conversation
-        conversation_for_extraction = conversation_service.get_conversation_for_extraction(session_id)
-        updated_fields = await extraction_service.extract_form_data(
-            session_id,
-            conversation_for_extraction
-        )
-
-        # Check if form is complete
-        session = in_memory_store.get_session(session_id)
-        form_data = IntakeFormData(**session["form_data"])
-        is_complete = form_data.is_complete()
+        # Check if form is complete (runs a final extraction if turns are pending)
+        is_complete, final_fields = await extraction_scheduler.check_complete(session_id)
+        updated_fields = merge_updates(updated_fields, final_fields, compiled_form(session["form_id"]).groups)
 
         return MessageResponse(
             assistant_message=assistant_response,
             updated_fields=updated_fields,
-            is_complete=is_complete
+            is_complete=is_complete,
+            state_token=_unload_state(session_id) if state_codec is not None else None
         )
 
     except HTTPException:
         raise
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process message: {str(e)}")
+    finally:
+        # A failed turn is dropped; the client keeps its previous token
+        if state_codec is not None:
+            _unload_state(session_id)
 
 
 @router.get("/sessions/{session_id}", response_model=SessionStateResponse)
-async def get_session_state(session_id: str):
+async def get_session_state(session_id: str, x_session_state: Optional[str] = Header(None)):
     """
     Get the complete state of a session.
 
     Args:
         session_id: The session ID
+        x_session_state: Session state token (stateless mode only)
 
     Returns:
         Complete session state including conversation and form data
     """
+    if state_codec is not None:
+        _load_state(session_id, x_session_state)
+
     try:
         session = in_memory_store.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
+        # Bring the form up to date with any turns the scheduler deferred
+        if extraction_scheduler.pending.get(session_id):
+            await extraction_scheduler.flush(session_id)
+            session = in_memory_store.get_session(session_id)
+
         # Check if form is complete
-        form_data = IntakeFormData(**session["form_data"])
-        is_complete = form_data.is_complete()
+        is_complete = compiled_form(session["form_id"]).is_complete(session["form_data"])
 
         return SessionStateResponse(
             session_id=session["session_id"],
+            form_id=session["form_id"],
             conversation_history=session["conversation_history"],
             form_data=session["form_data"],
             is_complete=is_complete,
@@ -118,6 +458,88 @@ async def get_session_state(session_id: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get session: {str(e)}")
+    finally:
+        if state_codec is not None:
+            _unload_state(session_id)
+
+
+@router.get("/sessions/{session_id}/form/history", response_model=FormHistoryResponse)
+async def get_form_history(session_id: str, field: Optional[str] = None):
+    """
+    Get the version history of a session's form.
+
+    Args:
+        session_id: The session ID
+        field: Dotted field path (e.g. "phone", "address.zip") to list the
+            changes of that field instead of all versions
+
+    Returns:
+        Form versions, or the changes of the field
+    """
+    if state_codec is not None:
+        raise HTTPException(status_code=400, detail="Form history is not kept for stateless sessions")
+
+    history = in_memory_store.get_form_history(session_id)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if field is None:
+        return FormHistoryResponse(
+            session_id=session_id,
+            current_version=history.head.number,
+            versions=[FormVersionSummary(**version.summary()) for version in history.versions]
+        )
+
+    if field not in compiled_form(history.form_id).paths:
+        raise HTTPException(status_code=400, detail=f"Unknown field: {field}")
+    return FormHistoryResponse(
+        session_id=session_id,
+        current_version=history.head.number,
+        field=field,
+        changes=[FieldChange(**change) for change in history.field_changes(field)]
+    )
+
+
+@router.post("/sessions/{session_id}/form/rollback", response_model=FormRollbackResponse)
+async def rollback_form(session_id: str, request: Optional[FormRollbackRequest] = None):
+    """
+    Restore a session's form to an earlier version (undo the last change
+    by default). The rollback is recorded as a new version.
+
+    Fields restored this way may be filled in again by extractions of
+    later turns, which re-read the whole conversation.
+
+    Args:
+        session_id: The session ID
+        request: Optional body selecting the version to restore
+
+    Returns:
+        The restored form data and its new version number
+    """
+    if state_codec is not None:
+        raise HTTPException(status_code=400, detail="Form history is not kept for stateless sessions")
+
+    history = in_memory_store.get_form_history(session_id)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    # A deferred extraction finishing later would overwrite the rollback
+    if extraction_scheduler.pending.get(session_id):
+        await extraction_scheduler.flush(session_id)
+
+    version = request.version if request and request.version is not None else history.head.number - 1
+    try:
+        form_data = in_memory_store.rollback_form(session_id, version)
+    except IndexError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if form_data is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    return FormRollbackResponse(
+        form_data=form_data,
+        version=history.head.number,
+        is_complete=compiled_form(history.form_id).is_complete(form_data)
+    )
 
 
 @router.delete("/sessions/{session_id}")
@@ -131,14 +553,130 @@ async def delete_session(session_id: str):
     Returns:
         Success message
     """
+    if state_codec is not None:
+        # Nothing is held server-side; the client discards its token
+        return {"message": "Session deleted successfully"}
+
     try:
         success = in_memory_store.delete_session(session_id)
         if not success:
             raise HTTPException(status_code=404, detail="Session not found")
 
+        extraction_scheduler.forget(session_id)
+
         return {"message": "Session deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete session: {str(e)}")
+
+
+async def _send_event(websocket: WebSocket, event: dict) -> None:
+    """Send an event as a JSON text frame."""
+    await websocket.send_text(dumps(event).decode("utf-8"))
+
+
+@router.websocket("/sessions/{session_id}/ws")
+async def session_websocket(websocket: WebSocket, session_id: str):
+    """
+    Keep a single connection open for a session's chat turns.
+
+    Client messages:
+        {"type": "state", "state_token": "..."} as the first frame (stateless mode only)
+        {"type": "message", "message": "..."}
+
+    Server events:
+        {"type": "token", "content": "..."} for each streamed response chunk
+        {"type": "assistant_message", "content": "..."} once the response is complete
+        {"type": "form_field", "path": "...", "field": {...}} as each field is extracted
+            (EXTRACTION_STREAMING only; the form_update event that follows is authoritative)
+        {"type": "form_update", "updated_fields": {...}, "is_complete": bool} after extraction,
+            including background extractions run by the scheduler
+        {"type": "state", "state_token": "..."} after each turn (stateless mode only)
+        {"type": "error", "detail": "..."} if a turn fails
+
+    In stateless mode the session is loaded from the first frame's state
+    token and held server-side until the connection closes.
+
+    Args:
+        websocket: The WebSocket connection
+        session_id: The session ID
+    """
+    await websocket.accept()
+
+    if state_codec is not None:
+        try:
+            frame = loads(await websocket.receive_text())
+            _load_state(session_id, frame.get("state_token") if frame.get("type") == "state" else None)
+        except WebSocketDisconnect:
+            return
+        except HTTPException as e:
+            await _send_event(websocket, {"type": "error", "detail": e.detail})
+            await websocket.close(code=4000 + e.status_code)
+            return
+        except Exception:
+            await _send_event(websocket, {"type": "error", "detail": "Invalid state payload"})
+            await websocket.close(code=4400)
+            return
+
+    if not in_memory_store.get_session(session_id):
+        await _send_event(websocket, {"type": "error", "detail": "Session not found"})
+        await websocket.close(code=4404)
+        return
+
+    async def push_background_update(updated_fields: dict) -> None:
+        is_complete, _ = await extraction_scheduler.check_complete(session_id)
+        await _send_event(websocket, {
+            "type": "form_update",
+            "updated_fields": updated_fields,
+            "is_complete": is_complete
+        })
+
+    unsubscribe = extraction_scheduler.subscribe(session_id, push_background_update)
+    groups = compiled_form(in_memory_store.get_session(session_id)["form_id"]).groups
+
+    try:
+        while True:
+            raw_message = await websocket.receive_text()
+
+            try:
+                request = MessageRequest(message=loads(raw_message)["message"])
+            except Exception:
+                await _send_event(websocket, {"type": "error", "detail": "Invalid message payload"})
+                continue
+
+            try:
+                # Each turn gets its own time budget
+                start_deadline(settings.REQUEST_DEADLINE_SECONDS)
+                # Forward streamed tokens and form updates as they arrive
+                async for event in conversation_service.stream_turn(
+                    session_id,
+                    request.message
+                ):
+                    if event["type"] == "form_update":
+                        is_complete, final_fields = await extraction_scheduler.check_complete(session_id)
+                        event["updated_fields"] = merge_updates(event["updated_fields"], final_fields, groups)
+                        event["is_complete"] = is_complete
+                    await _send_event(websocket, event)
+
+                if state_codec is not None:
+                    await _send_event(websocket, {
+                        "type": "state",
+                        "state_token": state_codec.encode(in_memory_store.get_session(session_id))
+                    })
+
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                await _send_event(websocket, {
+                    "type": "error",
+                    "detail": f"Failed to process message: {str(e)}"
+                })
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        unsubscribe()
+        if state_codec is not None:
+            _unload_state(session_id)
@@ -1,9 +1,27 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
+from logging_config import setup_logging, RequestLoggingMiddleware
+from deadlines import DeadlineMiddleware
+from profiling import ProfilingMiddleware, RequestProfiler
+from storage import in_memory_store
+from forms.registry import compile_enabled_forms, get_form
+from services.llm_service import get_llm_service
+from services.loop_monitor import get_loop_monitor
+import asyncio
+import logging
 import uvicorn
 
 
+# Log records are written by a background thread, never on the event loop
+log_listener = setup_logging(
+    level=settings.LOG_LEVEL,
+    log_format=settings.LOG_FORMAT,
+    debug_sample_rate=settings.LOG_DEBUG_SAMPLE_RATE
+)
+logger = logging.getLogger(__name__)
+
+
 # Create FastAPI application
 app = FastAPI(
     title="AI Intake Assistant API",
@@ -20,6 +38,82 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestLoggingMiddleware)
+# Outside the logging middleware, so cancelled requests are logged too
+app.add_middleware(DeadlineMiddleware, default_seconds=settings.REQUEST_DEADLINE_SECONDS)
+
+# Opt-in request profiling; nothing is installed when disabled
+if settings.PROFILING_ENABLED:
+    request_profiler = RequestProfiler(
+        directory=settings.PROFILE_DIR,
+        sample_rate=settings.PROFILE_SAMPLE_RATE,
+        path_prefix=settings.PROFILE_PATH_PREFIX
+    )
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
+    @app.post("/api/profiling")
+    async def arm_profiling(requests: int = Query(1, ge=1, le=100)):
+        """Profile the next requests under PROFILE_PATH_PREFIX."""
+        return {"armed": request_profiler.arm(requests), "directory": settings.PROFILE_DIR}
+
+
+async def compact_session_journal():
+    """Periodically fold the session journal into a snapshot."""
+    while True:
+        await asyncio.sleep(settings.SESSION_SNAPSHOT_INTERVAL_SECONDS)
+        try:
+            await in_memory_store.compact_journal()
+        except Exception:
+            logger.exception("Journal compaction error")
+
+
+async def freeze_idle_sessions():
+    """Periodically compress sessions that have gone idle."""
+    while True:
+        await asyncio.sleep(settings.SESSION_TIERING_INTERVAL_SECONDS)
+        try:
+            frozen = await in_memory_store.freeze_idle_sessions(settings.SESSION_COLD_AFTER_SECONDS)
+            if frozen:
+                logger.debug("Compressed %d idle sessions", frozen)
+        except Exception:
+            logger.exception("Session tiering error")
+
+
+@app.on_event("startup")
+async def startup():
+    """Compile intake forms, restore persisted sessions and start background tasks."""
+    log_listener.start()
+    get_loop_monitor().start()
+
+    forms = compile_enabled_forms()
+    get_form()  # DEFAULT_FORM must be one of INTAKE_FORMS
+    logger.info("Compiled intake forms: %s", ", ".join(form.form_id for form in forms))
+
+    if settings.SESSION_JOURNAL_DIR and settings.STATELESS_SESSIONS:
+        logger.warning("SESSION_JOURNAL_DIR is ignored with STATELESS_SESSIONS")
+    elif settings.SESSION_JOURNAL_DIR:
+        recovered = in_memory_store.open_journal(
+            settings.SESSION_JOURNAL_DIR,
+            fsync=settings.SESSION_JOURNAL_FSYNC
+        )
+        logger.info("Recovered %d sessions from journal", recovered)
+        app.state.compaction_task = asyncio.create_task(compact_session_journal())
+
+    if settings.SESSION_COLD_AFTER_SECONDS > 0:
+        app.state.tiering_task = asyncio.create_task(freeze_idle_sessions())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background tasks and flush persisted sessions and logs."""
+    if settings.SESSION_COLD_AFTER_SECONDS > 0:
+        app.state.tiering_task.cancel()
+    if settings.SESSION_JOURNAL_DIR and not settings.STATELESS_SESSIONS:
+        app.state.compaction_task.cancel()
+        await in_memory_store.compact_journal()
+        in_memory_store.close_journal()
+    get_loop_monitor().stop()
+    log_listener.stop()
 
 
 @app.get("/")
@@ -36,10 +130,18 @@ async def root():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
+    llm_service = get_llm_service()
+    breaker = llm_service.breaker
+    loop_monitor = get_loop_monitor()
     return {
-        "status": "healthy",
+        "status": "degraded" if breaker.is_open or loop_monitor.saturated else "healthy",
         "provider": settings.LLM_PROVIDER,
-        "model": settings.MODEL_NAME
+        "model": settings.MODEL_NAME,
+        "extraction_provider": llm_service.extraction_provider.name,
+        "extraction_model": llm_service.extraction_provider.model_name,
+        "llm_circuit": breaker.state,
+        "extraction_llm_circuit": llm_service.extraction_breaker.state,
+        "event_loop": loop_monitor.get_status()
     }
 
 
@@ -48,7 +150,7 @@ try:
     from api.routes import router as api_router
     app.include_router(api_router, prefix="/api")
 except ImportError:
-    print("Warning: API routes not yet implemented")
+    logger.warning("API routes not yet implemented")
 
 
 if __name__ == "__main__":
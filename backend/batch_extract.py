@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+from services.batch_extraction_service import get_batch_extraction_service
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Extract intake forms from a JSONL file of transcripts"
+    )
+    parser.add_argument("input", help="Input JSONL file, one transcript per line")
+    parser.add_argument("output", help="Output JSONL file for extracted forms")
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file (defaults to OUTPUT.checkpoint)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum concurrent extraction calls (default: 4)"
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=50,
+        help="Results between checkpoint writes (default: 50)"
+    )
+    parser.add_argument(
+        "--form",
+        default="demographics",
+        help="Form to extract for records without a form_id (default: demographics)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore any existing checkpoint and start from the beginning"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the batch extraction pipeline."""
+    args = parse_args()
+    service = get_batch_extraction_service()
+
+    stats = asyncio.run(service.run(
+        input_path=args.input,
+        output_path=args.output,
+        checkpoint_path=args.checkpoint,
+        concurrency=args.concurrency,
+        checkpoint_every=args.checkpoint_every,
+        resume=not args.restart,
+        form_id=args.form
+    ))
+
+    print(
+        f"Processed: {stats['processed']}, "
+        f"failed: {stats['failed']}, "
+        f"skipped: {stats['skipped']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark a scripted intake end to end through ConversationService.
+
+The script is a text file with one patient message per line. Record a
+cassette once against the live provider, then replay it offline as often
+as needed; replayed runs send the same prompts, so any change to turn
+latency or the extracted form comes from the code under test.
+
+Usage:
+    cd backend
+    # Record against the configured live provider
+    LLM_RECORD_CASSETTE=data/cassettes/intake.jsonl python -m benchmarks.bench_intake script.txt
+    # Replay offline (add LLM_REPLAY_TIMING=True to reproduce provider latency)
+    LLM_PROVIDER=replay LLM_REPLAY_CASSETTE=data/cassettes/intake.jsonl \\
+        python -m benchmarks.bench_intake script.txt [--runs 5] [--form demographics]
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+from forms.registry import compiled_form
+from providers.replay_provider import ReplayProvider
+from services.conversation_service import get_conversation_service
+from services.llm_service import get_llm_service
+from storage import in_memory_store
+
+
+def load_script(path: str) -> List[str]:
+    """Read patient messages, one per non-empty line."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+async def run_intake(messages: List[str], form_id: str) -> dict:
+    """
+    Run one scripted intake and time each turn.
+
+    Args:
+        messages: Patient messages
+        form_id: Form the session fills in
+
+    Returns:
+        Turn latencies in milliseconds, the final form and whether it is complete
+    """
+    conversation_service = get_conversation_service()
+    session_id = in_memory_store.create_session(form_id)
+    await conversation_service.start_conversation(session_id)
+
+    latencies = []
+    for message in messages:
+        start = time.perf_counter()
+        await conversation_service.process_turn(session_id, message)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    await conversation_service.extraction_scheduler.flush(session_id)
+    form_data = in_memory_store.get_session(session_id)["form_data"]
+    in_memory_store.delete_session(session_id)
+    conversation_service.extraction_scheduler.forget(session_id)
+    return {
+        "latencies": latencies,
+        "form_data": form_data,
+        "is_complete": compiled_form(form_id).is_complete(form_data)
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("script", help="Text file with one patient message per line")
+    parser.add_argument("--runs", type=int, default=1, help="Number of intakes to run")
+    parser.add_argument("--form", default="demographics", help="Form to fill in (default: demographics)")
+    args = parser.parse_args()
+
+    messages = load_script(args.script)
+    if not messages:
+        parser.error("the script has no messages")
+    llm_service = get_llm_service()
+    providers = {llm_service.provider, llm_service.extraction_provider}
+    print(
+        f"Conversation: {llm_service.provider.name} ({llm_service.provider.model_name}), "
+        f"extraction: {llm_service.extraction_provider.name} ({llm_service.extraction_provider.model_name}), "
+        f"{len(messages)} turns\n"
+    )
+
+    for run in range(1, args.runs + 1):
+        for provider in providers:
+            if isinstance(provider, ReplayProvider):
+                provider.rewind()
+        result = asyncio.run(run_intake(messages, args.form))
+        latencies = sorted(result["latencies"])
+        print(
+            f"Run {run}: total {sum(latencies):8.1f} ms, "
+            f"p50 {latencies[len(latencies) // 2]:7.1f} ms, "
+            f"max {latencies[-1]:7.1f} ms, "
+            f"complete: {result['is_complete']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark per-request encode/decode cost of API responses and LLM payloads.
+
+Compares the default stack (Starlette JSONResponse, stdlib json) with the
+serialization layer (FastJSONResponse, orjson when installed).
+
+Usage:
+    cd backend
+    python -m benchmarks.bench_serialization [--turns 20] [--iterations 5000]
+"""
+import argparse
+import json
+import timeit
+from starlette.responses import JSONResponse
+from models.conversation import MessageResponse
+from models.intake_form import IntakeFormData, SessionStateResponse
+import serialization
+
+
+EXTRACTION_JSON = json.dumps({
+    "first_name": {"value": "John", "confidence": "high", "turn": 2},
+    "last_name": {"value": "Doe", "confidence": "high", "turn": 2},
+    "date_of_birth": {"value": "1985-03-15", "confidence": "high", "turn": 3},
+    "phone": {"value": "5551234567", "confidence": "high", "turn": 4},
+    "email": {"value": "john@example.com", "confidence": "high", "turn": 4},
+    "address": {
+        "street": {"value": "123 Main St", "confidence": "medium", "turn": 5},
+        "city": {"value": "Springfield", "confidence": "high", "turn": 5},
+        "state": {"value": "IL", "confidence": "medium", "turn": 5},
+        "zip": {"value": "62701", "confidence": "high", "turn": 5}
+    }
+}, indent=2)
+
+
+def build_payloads(turns: int):
+    """Build a message response and a session state response of realistic size."""
+    form_data = IntakeFormData(**json.loads(EXTRACTION_JSON))
+    history = [{"role": "system", "content": "You are a healthcare intake specialist. " * 40}]
+    for turn in range(turns):
+        history.append({"role": "user", "content": f"Turn {turn}: my phone is 555-123-4567, thanks!"})
+        history.append({"role": "assistant", "content": "Great, thank you! And what's your email address?"})
+
+    message_response = MessageResponse(
+        assistant_message="Great, thank you! And what's your date of birth?",
+        updated_fields=form_data.get_updated_fields(IntakeFormData()),
+        is_complete=True
+    )
+    state_response = SessionStateResponse(
+        session_id="0f8fad5b-d9cb-469f-a165-70867728950e",
+        form_id="demographics",
+        conversation_history=history,
+        form_data=form_data.model_dump(),
+        is_complete=True,
+        created_at="2024-01-01T00:00:00"
+    )
+    return message_response, state_response
+
+
+def bench(label: str, func, iterations: int) -> float:
+    """Time a function and print the per-call cost in microseconds."""
+    seconds = timeit.timeit(func, number=iterations)
+    per_call = seconds / iterations * 1_000_000
+    print(f"  {label:<28} {per_call:8.2f} us")
+    return per_call
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=20, help="Conversation turns in the session state")
+    parser.add_argument("--iterations", type=int, default=5000, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    message_response, state_response = build_payloads(args.turns)
+    encoder = "orjson" if serialization.orjson is not None else "stdlib json (orjson not installed)"
+    print(f"Encoder: {encoder}\n")
+
+    for name, model in [("MessageResponse", message_response), ("SessionStateResponse", state_response)]:
+        # FastAPI serializes response models to JSON-compatible python objects, then renders
+        content = model.model_dump(mode="json")
+        print(f"{name} encode:")
+        before = bench("JSONResponse", lambda: JSONResponse(content), args.iterations)
+        after = bench("FastJSONResponse", lambda: serialization.FastJSONResponse(content), args.iterations)
+        print(f"  speedup: {before / after:.2f}x\n")
+
+    print("Extraction JSON decode:")
+    before = bench("json.loads", lambda: json.loads(EXTRACTION_JSON), args.iterations)
+    after = bench("serialization.loads", lambda: serialization.loads(EXTRACTION_JSON), args.iterations)
+    print(f"  speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import Optional, List
+import logging
 import os
 from pathlib import Path
 
@@ -11,6 +12,16 @@ class Settings(BaseSettings):
     LLM_PROVIDER: str = "openai"
     MODEL_NAME: str = "gpt-4-turbo-preview"
 
+    # Extraction Model Routing
+    # Extraction can run on a smaller, faster provider/model than the conversation;
+    # unset values fall back to LLM_PROVIDER, MODEL_NAME and LLM_TIMEOUT_SECONDS
+    EXTRACTION_LLM_PROVIDER: Optional[str] = None
+    EXTRACTION_MODEL_NAME: Optional[str] = None
+    EXTRACTION_TIMEOUT_SECONDS: Optional[float] = None
+    # Response token budgets per task (None uses the provider default)
+    CONVERSATION_MAX_TOKENS: Optional[int] = None
+    EXTRACTION_MAX_TOKENS: Optional[int] = None
+
     # API Keys
     OPENAI_API_KEY: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
@@ -21,12 +32,107 @@ class Settings(BaseSettings):
     AZURE_OPENAI_MODEL_NAME: Optional[str] = None
     AZURE_OPENAI_API_VERSION: str = "2024-12-01-preview"
 
+    # Local OpenAI-Compatible Server Settings (LLM_PROVIDER "local")
+    LOCAL_LLM_BASE_URL: Optional[str] = None
+    # Bearer token, for servers started with authentication
+    LOCAL_LLM_API_KEY: Optional[str] = None
+    # Model served by the local server (None uses MODEL_NAME)
+    LOCAL_LLM_MODEL_NAME: Optional[str] = None
+    # Server capabilities; disabled features are emulated with plain completions
+    LOCAL_LLM_STREAMING: bool = True
+    LOCAL_LLM_JSON_MODE: bool = False
+
+    # Record/Replay Settings
+    # Cassette file to record every provider call to (None disables recording)
+    LLM_RECORD_CASSETTE: Optional[str] = None
+    # Cassette served when LLM_PROVIDER is "replay"
+    LLM_REPLAY_CASSETTE: Optional[str] = None
+    # Delay replayed responses by their recorded latency
+    LLM_REPLAY_TIMING: bool = False
+
     # Application Settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = True
     SESSION_TIMEOUT_MINUTES: int = 30
 
+    # Session Persistence Settings
+    # Directory for the session journal and snapshots (None keeps sessions in memory only)
+    SESSION_JOURNAL_DIR: Optional[str] = None
+    SESSION_JOURNAL_FSYNC: bool = False
+    SESSION_SNAPSHOT_INTERVAL_SECONDS: int = 300
+
+    # Stateless Session Settings
+    # Keep no session state on the server between requests: the session travels
+    # with the client as an encrypted token (X-Session-State header); extraction
+    # runs eagerly and the session journal is not used
+    STATELESS_SESSIONS: bool = False
+    STATE_TOKEN_SECRET: Optional[str] = None
+    STATE_TOKEN_TTL_SECONDS: int = 86400
+
+    # Session Tiering Settings
+    # Sessions idle this long are compressed until next accessed (0 keeps all sessions expanded)
+    SESSION_COLD_AFTER_SECONDS: int = 0
+    SESSION_TIERING_INTERVAL_SECONDS: int = 60
+
+    # Extraction Scheduling Settings
+    # Options: eager, every_n_turns, idle_debounce, on_completion
+    EXTRACTION_POLICY: str = "eager"
+    EXTRACTION_EVERY_N_TURNS: int = 3
+    EXTRACTION_IDLE_SECONDS: float = 4.0
+    # Micro-batching: extractions of the same form started within the window are
+    # sent as one multi-conversation LLM call (0 disables)
+    EXTRACTION_BATCH_WINDOW_MS: float = 0
+    EXTRACTION_BATCH_MAX_SIZE: int = 8
+    # Stream extraction output on WebSocket turns, pushing each field to the
+    # client as soon as it is parsed (takes precedence over batching there)
+    EXTRACTION_STREAMING: bool = False
+
+    # Conversation Settings
+    # Answer routine turns from templated phrasings instead of the LLM
+    HYBRID_RESPONDER_ENABLED: bool = False
+
+    # Intake Form Settings
+    # Comma-separated form IDs: demographics, insurance, emergency_contact, medical_history
+    INTAKE_FORMS: str = "demographics"
+    DEFAULT_FORM: str = "demographics"
+
+    # LLM Resilience Settings
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    # Time budget of a request or WebSocket turn; LLM call timeouts shrink to fit it.
+    # Clients can shorten it with an X-Request-Timeout header (seconds). 0 disables
+    REQUEST_DEADLINE_SECONDS: float = 60.0
+    # Circuit breaker: open after consecutive failures or slow calls, probe again after the reset time
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 3
+    LLM_CIRCUIT_SLOW_CALL_SECONDS: float = 15.0
+    LLM_CIRCUIT_SLOW_CALL_THRESHOLD: int = 3
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Idempotency Settings
+    # Responses to requests with an Idempotency-Key header are replayed for retries
+    IDEMPOTENCY_TTL_SECONDS: int = 600
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+
+    # Logging Settings
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # Options: json, text
+    # Fraction of DEBUG records kept (high-volume events such as deferred extractions)
+    LOG_DEBUG_SAMPLE_RATE: float = 0.1
+
+    # Event Loop Monitoring
+    # Scheduling delay is sampled every interval; lag above the threshold marks the
+    # worker saturated, and in DEBUG mode logs the stack that blocked the loop
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.5
+    LOOP_LAG_THRESHOLD_MS: float = 100.0
+
+    # Profiling Settings
+    # Profile requests sending an X-Profile header, sampled requests, or requests
+    # armed through POST /api/profiling; the middleware is not installed when disabled
+    PROFILING_ENABLED: bool = False
+    PROFILE_DIR: str = "./data/profiles"
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_PATH_PREFIX: str = "/api/"
+
     # CORS Settings
     CORS_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000"
 
@@ -53,8 +159,14 @@ class Settings(BaseSettings):
                 raise ValueError("AZURE_OPENAI_ENDPOINT must be set when LLM_PROVIDER is 'azure_openai'")
             if not self.AZURE_OPENAI_MODEL_NAME:
                 raise ValueError("AZURE_OPENAI_MODEL_NAME must be set when LLM_PROVIDER is 'azure_openai'")
-        elif self.LLM_PROVIDER not in ["openai", "anthropic", "azure_openai"]:
-            raise ValueError(f"Invalid LLM_PROVIDER: {self.LLM_PROVIDER}. Must be 'openai', 'anthropic', or 'azure_openai'")
+        elif self.LLM_PROVIDER == "local" and not self.LOCAL_LLM_BASE_URL:
+            raise ValueError("LOCAL_LLM_BASE_URL must be set when LLM_PROVIDER is 'local'")
+        elif self.LLM_PROVIDER == "replay" and not self.LLM_REPLAY_CASSETTE:
+            raise ValueError("LLM_REPLAY_CASSETTE must be set when LLM_PROVIDER is 'replay'")
+        elif self.LLM_PROVIDER not in ["openai", "anthropic", "azure_openai", "local", "replay"]:
+            raise ValueError(f"Invalid LLM_PROVIDER: {self.LLM_PROVIDER}. Must be 'openai', 'anthropic', 'azure_openai', 'local' or 'replay'")
+        if self.EXTRACTION_LLM_PROVIDER and self.EXTRACTION_LLM_PROVIDER not in ["openai", "anthropic", "azure_openai", "local", "replay"]:
+            raise ValueError(f"Invalid EXTRACTION_LLM_PROVIDER: {self.EXTRACTION_LLM_PROVIDER}")
 
 
 # Create a global settings instance
@@ -66,4 +178,4 @@ try:
 except ValueError as e:
     if not settings.DEBUG:
         raise
-    print(f"Warning: {e}")
+    logging.getLogger(__name__).warning(str(e))
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+
+# Header a client can send to shorten its request's time budget, in seconds
+DEADLINE_HEADER = b"x-request-timeout"
+
+# Monotonic time by which the current request must finish its LLM calls.
+# Tasks inherit a copy, so work spawned by a request shares its deadline.
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request's time budget runs out before an LLM call completes."""
+    pass
+
+
+def start_deadline(seconds: Optional[float]) -> None:
+    """
+    Give the current task (and tasks it spawns) a time budget.
+
+    Args:
+        seconds: Budget from now, or None for no deadline
+    """
+    request_deadline.set(time.monotonic() + seconds if seconds else None)
+
+
+def remaining() -> Optional[float]:
+    """
+    Get the time left before the current deadline.
+
+    Returns:
+        Seconds left (negative once expired), or None without a deadline
+    """
+    deadline = request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout(timeout: float) -> float:
+    """
+    Shrink a call timeout to fit the current deadline.
+
+    Args:
+        timeout: Timeout configured for the call
+
+    Returns:
+        The smaller of the timeout and the time left
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    return min(timeout, left)
+
+
+def deadline_expired() -> bool:
+    """Check whether the current deadline has passed."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware giving each HTTP request a deadline and cancelling
+    requests whose client has disconnected.
+
+    The deadline is `default_seconds`, shortened by an X-Request-Timeout
+    header. LLM calls made while handling the request get timeouts that
+    shrink to fit it (see call_timeout).
+
+    The request runs in its own task while the middleware reads the
+    client's connection; if the client goes away before the response is
+    complete, the task is cancelled, which cancels any in-flight provider
+    calls and releases their concurrency slots. A cancelled turn leaves its
+    session unchanged: turns store their messages in one update once the
+    reply exists. Idempotent requests run in their own task and finish
+    regardless (see IdempotencyCache).
+    """
+
+    def __init__(self, app, default_seconds: Optional[float] = None):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            default_seconds: Deadline of requests without a header (None for none)
+        """
+        self.app = app
+        self.default_seconds = default_seconds
+
+    def budget(self, scope) -> Optional[float]:
+        """
+        Get a request's time budget.
+
+        Args:
+            scope: ASGI connection scope
+
+        Returns:
+            Seconds, or None for no deadline
+        """
+        seconds = self.default_seconds or None
+        for name, value in scope["headers"]:
+            if name == DEADLINE_HEADER:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                if requested > 0:
+                    seconds = min(seconds, requested) if seconds else requested
+                break
+        return seconds
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_deadline(self.budget(scope))
+
+        messages: asyncio.Queue = asyncio.Queue()
+        state = {"response_complete": False, "disconnected": False}
+
+        async def send_tracking(message):
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                state["response_complete"] = True
+            await send(message)
+
+        request = asyncio.ensure_future(self.app(scope, messages.get, send_tracking))
+
+        async def watch_connection():
+            # Relay request messages to the app; a disconnect before the
+            # response is complete abandons the request
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    if not state["response_complete"] and not request.done():
+                        state["disconnected"] = True
+                        request.cancel()
+                    return
+
+        watcher = asyncio.ensure_future(watch_connection())
+        try:
+            await request
+        except asyncio.CancelledError:
+            if not state["disconnected"]:
+                request.cancel()
+                raise
+            logger.info("Client disconnected, request cancelled", extra={
+                "method": scope["method"],
+                "path": scope["path"]
+            })
+        finally:
+            watcher.cancel()
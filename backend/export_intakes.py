@@ -0,0 +1,65 @@
+import argparse
+import sys
+import httpx
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Download completed intakes from a running server's export endpoint"
+    )
+    parser.add_argument("output", help="Output file ('-' for stdout)")
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "csv", "parquet"],
+        default="ndjson",
+        help="Export format (default: ndjson; parquet needs pyarrow on the server)"
+    )
+    parser.add_argument(
+        "--form",
+        help="Only intakes of this form (CSV and Parquet default to the server's DEFAULT_FORM)"
+    )
+    parser.add_argument("--since", help="Only intakes created at or after this ISO timestamp")
+    parser.add_argument("--until", help="Only intakes created at or before this ISO timestamp")
+    parser.add_argument(
+        "--url",
+        default="http://localhost:8000",
+        help="Server base URL (default: http://localhost:8000)"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Stream the export to the output file without buffering it in memory."""
+    args = parse_args()
+    params = {
+        name: value
+        for name, value in (
+            ("format", args.format),
+            ("form_id", args.form),
+            ("since", args.since),
+            ("until", args.until)
+        )
+        if value is not None
+    }
+
+    written = 0
+    with httpx.stream("GET", f"{args.url.rstrip('/')}/api/export", params=params, timeout=None) as response:
+        if response.status_code != 200:
+            response.read()
+            sys.exit(f"Export failed ({response.status_code}): {response.text}")
+
+        output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        try:
+            for chunk in response.iter_bytes():
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+
+    print(f"Wrote {written} bytes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+from abc import abstractmethod
+from typing import Callable, Dict, List, Tuple, Type
+from pydantic import BaseModel, Field, create_model
+from models.form_schema import FieldValue, FieldGroup, FieldSpec, FormSchema
+from prompts.extraction_prompt import build_extraction_prompt
+from prompts.system_prompt import build_system_prompt
+
+
+# Fields that make a group an address the ZIP index can complete
+ADDRESS_FIELDS = frozenset(("city", "state", "zip"))
+
+
+class FormModel(BaseModel):
+    """Base class for compiled form models. Methods are generated per form."""
+
+    @abstractmethod
+    def is_complete(self) -> bool:
+        """Check if all required fields have values."""
+
+    @abstractmethod
+    def get_updated_fields(self, previous_data: "FormModel") -> dict:
+        """Compare with previous data and return only updated fields."""
+
+
+class CompiledForm:
+    """
+    A form schema compiled into its Pydantic model, prompts and specialized
+    merge/diff/completeness functions.
+
+    The functions are generated as straight-line Python source with every
+    field path inlined, so a request never loops over field names.
+    Dict-based functions work on stored form data (model_dump() output);
+    the model's is_complete/get_updated_fields work on model instances.
+    """
+
+    def __init__(self, schema: FormSchema):
+        """
+        Compile a form schema.
+
+        Args:
+            schema: Declarative form schema
+        """
+        self.schema = schema
+        self.form_id = schema.form_id
+        self.paths, self.required_paths = self._collect_paths(schema)
+
+        self.fields: Dict[str, FieldSpec] = {}
+        self.questions: Dict[str, List[str]] = {}
+        self.group_questions: Dict[str, List[str]] = {}
+        # Names of field groups (stored as nested objects)
+        self.groups: List[str] = []
+        # Groups with city, state and zip fields, completed from the ZIP index
+        self.address_groups: List[str] = []
+        for item in schema.items:
+            if isinstance(item, FieldGroup):
+                self.groups.append(item.name)
+                if ADDRESS_FIELDS <= {field.name for field in item.fields}:
+                    self.address_groups.append(item.name)
+                self.group_questions[item.name] = item.questions
+                for field in item.fields:
+                    self.fields[f"{item.name}.{field.name}"] = field
+                    self.questions[f"{item.name}.{field.name}"] = field.questions
+            else:
+                self.fields[item.name] = item
+                self.questions[item.name] = item.questions
+        self.combined_questions: List[Tuple[List[str], List[str]]] = [
+            (combined.fields, combined.questions) for combined in schema.combined_questions
+        ]
+
+        self.extraction_prompt = build_extraction_prompt(schema)
+        self.system_prompt = build_system_prompt(schema)
+
+        functions = self._generate_functions(schema)
+        self.is_complete: Callable[[dict], bool] = functions["is_complete"]
+        self.get_updated_fields: Callable[[dict, dict], dict] = functions["get_updated_fields"]
+        self.merge: Callable[[dict, dict], dict] = functions["merge"]
+        self.missing_fields: Callable[[dict], List[str]] = functions["missing_fields"]
+        self.empty: Callable[[], dict] = functions["empty"]
+
+        self.model: Type[FormModel] = self._build_model(schema, functions)
+
+    @staticmethod
+    def _collect_paths(schema: FormSchema) -> Tuple[List[str], List[str]]:
+        """Collect dotted field paths in schema order, and the required subset."""
+        paths = []
+        required_paths = []
+        for item in schema.items:
+            fields = item.fields if isinstance(item, FieldGroup) else [item]
+            prefix = f"{item.name}." if isinstance(item, FieldGroup) else ""
+            for field in fields:
+                paths.append(f"{prefix}{field.name}")
+                if field.required:
+                    required_paths.append(f"{prefix}{field.name}")
+        return paths, required_paths
+
+    @staticmethod
+    def _build_model(schema: FormSchema, functions: Dict[str, Callable]) -> Type[FormModel]:
+        """Create the Pydantic model with generated methods."""
+        base = type(f"{schema.form_id.title().replace('_', '')}FormModel", (FormModel,), {
+            "is_complete": functions["model_is_complete"],
+            "get_updated_fields": functions["model_get_updated_fields"],
+            "__module__": __name__
+        })
+
+        model_fields = {}
+        for item in schema.items:
+            if isinstance(item, FieldGroup):
+                group_model = create_model(
+                    item.model_name or item.name.title().replace("_", ""),
+                    __doc__=f"{item.label} information.",
+                    **{
+                        field.name: (FieldValue, Field(default_factory=FieldValue))
+                        for field in item.fields
+                    }
+                )
+                model_fields[item.name] = (group_model, Field(default_factory=group_model))
+            else:
+                model_fields[item.name] = (FieldValue, Field(default_factory=FieldValue))
+
+        model_name = schema.model_name or f"{schema.form_id.title().replace('_', '')}FormData"
+        return create_model(
+            model_name,
+            __base__=base,
+            __doc__=f"{schema.title} form data structure.",
+            **model_fields
+        )
+
+    @classmethod
+    def _generate_functions(cls, schema: FormSchema) -> Dict[str, Callable]:
+        """Generate and compile the specialized functions for a schema."""
+        source = "\n".join([
+            cls._source_is_complete(schema, "is_complete", "d", cls._dict_access),
+            cls._source_is_complete(schema, "model_is_complete", "self", cls._attr_access),
+            cls._source_get_updated_fields(schema, "get_updated_fields", "c, p", cls._dict_access, "dict({})"),
+            cls._source_get_updated_fields(
+                schema, "model_get_updated_fields", "self, previous_data", cls._attr_access, "{}.model_dump()"
+            ),
+            cls._source_merge(schema),
+            cls._source_missing_fields(schema),
+            cls._source_empty(schema)
+        ])
+        namespace: Dict[str, object] = {}
+        exec(compile(source, f"<compiled form {schema.form_id}>", "exec"), namespace)
+        namespace["__source__"] = source
+        return namespace
+
+    @staticmethod
+    def _dict_access(root: str, *names: str) -> str:
+        """Render a dict lookup chain, e.g. d["address"]["zip"]."""
+        return root + "".join(f'["{name}"]' for name in names)
+
+    @staticmethod
+    def _attr_access(root: str, *names: str) -> str:
+        """Render an attribute chain, e.g. self.address.zip."""
+        return ".".join((root,) + names)
+
+    @staticmethod
+    def _field_chains(schema: FormSchema, required_only: bool = False):
+        """Yield (group name or None, field name) pairs in schema order."""
+        for item in schema.items:
+            if isinstance(item, FieldGroup):
+                for field in item.fields:
+                    if field.required or not required_only:
+                        yield item.name, field.name
+            elif item.required or not required_only:
+                yield None, item.name
+
+    @classmethod
+    def _source_is_complete(cls, schema: FormSchema, name: str, root: str, access) -> str:
+        """Generate is_complete: one inlined `is not None` check per required field."""
+        checks = [
+            f"{access(root, *filter(None, (group, field)), 'value')} is not None"
+            for group, field in cls._field_chains(schema, required_only=True)
+        ]
+        body = "\n        and ".join(checks) if checks else "True"
+        return f"def {name}({root}):\n    return (\n        {body}\n    )\n"
+
+    @staticmethod
+    def _source_get_updated_fields(schema: FormSchema, name: str, params: str, access, dump: str) -> str:
+        """Generate get_updated_fields: one inlined comparison per field."""
+        current, previous = [param.strip() for param in params.split(",")]
+        lines = [f"def {name}({params}):", "    updated = {}"]
+        for item in schema.items:
+            if isinstance(item, FieldGroup):
+                lines.append("    group = {}")
+                for field in item.fields:
+                    current_field = access(current, item.name, field.name)
+                    previous_field = access(previous, item.name, field.name)
+                    lines.append(f"    if {access(current_field, 'value')} != {access(previous_field, 'value')}:")
+                    lines.append(f"        group[{field.name!r}] = {dump.format(current_field)}")
+                lines.append("    if group:")
+                lines.append(f"        updated[{item.name!r}] = group")
+            else:
+                current_field = access(current, item.name)
+                previous_field = access(previous, item.name)
+                lines.append(f"    if {access(current_field, 'value')} != {access(previous_field, 'value')}:")
+                lines.append(f"        updated[{item.name!r}] = {dump.format(current_field)}")
+        lines.append("    return updated")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _source_merge(schema: FormSchema) -> str:
+        """
+        Generate merge: copy previous data and overlay extracted fields that
+        have a non-null value. Unknown extracted keys are ignored.
+        """
+        copies = []
+        for item in schema.items:
+            if isinstance(item, FieldGroup):
+                inner = ", ".join(f'"{field.name}": dict(p["{item.name}"]["{field.name}"])' for field in item.fields)
+                copies.append(f'"{item.name}": {{{inner}}}')
+            else:
+                copies.append(f'"{item.name}": dict(p["{item.name}"])')
+
+        lines = ["def merge(p, e):", f"    m = {{{', '.join(copies)}}}"]
+        for item in schema.items:
+            if isinstance(item, FieldGroup):
+                lines.append(f'    g = e.get("{item.name}")')
+                lines.append("    if isinstance(g, dict):")
+                lines.append(f'        group = m["{item.name}"]')
+                for field in item.fields:
+                    lines.append(f'        v = g.get("{field.name}")')
+                    lines.append('        if isinstance(v, dict) and v.get("value") is not None:')
+                    lines.append(f'            group["{field.name}"] = v')
+            else:
+                lines.append(f'    v = e.get("{item.name}")')
+                lines.append('    if isinstance(v, dict) and v.get("value") is not None:')
+                lines.append(f'        m["{item.name}"] = v')
+        lines.append("    return m")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def _source_missing_fields(cls, schema: FormSchema) -> str:
+        """Generate missing_fields: required paths without a value, in schema order."""
+        pairs = [
+            f'("{".".join(filter(None, (group, field)))}", '
+            f'{cls._dict_access("d", *filter(None, (group, field)), "value")})'
+            for group, field in cls._field_chains(schema, required_only=True)
+        ]
+        return (
+            "def missing_fields(d):\n"
+            f"    return [path for path, value in ({', '.join(pairs)}{',' if len(pairs) == 1 else ''}) "
+            "if value is None]\n"
+        )
+
+    @staticmethod
+    def _source_empty(schema: FormSchema) -> str:
+        """Generate empty: a literal of the empty form data."""
+        empty_field = '{"value": None, "confidence": None, "turn": None}'
+        entries = []
+        for item in schema.items:
+            if isinstance(item, FieldGroup):
+                inner = ", ".join(f'"{field.name}": {empty_field}' for field in item.fields)
+                entries.append(f'"{item.name}": {{{inner}}}')
+            else:
+                entries.append(f'"{item.name}": {empty_field}')
+        return f"def empty():\n    return {{{', '.join(entries)}}}\n"
+
+
+def compile_form(schema: FormSchema) -> CompiledForm:
+    """
+    Compile a form schema.
+
+    Args:
+        schema: Declarative form schema
+
+    Returns:
+        Compiled form
+    """
+    return CompiledForm(schema)
@@ -0,0 +1,262 @@
+from models.form_schema import FormSchema, FieldSpec, FieldGroup, CombinedQuestion
+
+
+DEMOGRAPHICS_FORM = FormSchema(
+    form_id="demographics",
+    title="Demographics",
+    model_name="IntakeFormData",
+    purpose="demographic information",
+    greeting="Hi! I'm here to help you get checked in today. To get started, could you tell me your name?",
+    completion_message="Perfect! I have all your information. Thank you for providing that!",
+    items=[
+        FieldSpec(
+            name="first_name",
+            label="First name",
+            description="Patient's first name",
+            example="John",
+            questions=["What's your first name?", "Could you share your first name?"]
+        ),
+        FieldSpec(
+            name="last_name",
+            label="Last name",
+            description="Patient's last name",
+            example="Doe",
+            questions=["And what's your last name?", "Could you share your last name as well?"]
+        ),
+        FieldSpec(
+            name="date_of_birth",
+            label="Date of birth (in MM/DD/YYYY format)",
+            description="Date of birth in YYYY-MM-DD format",
+            example="1985-03-15",
+            local_format="date",
+            rules=[
+                "Dates should be converted to YYYY-MM-DD format",
+                "Parse dates flexibly (MM/DD/YYYY, MM-DD-YYYY, Month DD, YYYY, etc.) and convert to YYYY-MM-DD"
+            ],
+            questions=[
+                "What's your date of birth?",
+                "And what's your date of birth?",
+                "Could you share your date of birth?"
+            ]
+        ),
+        FieldSpec(
+            name="phone",
+            label="Phone number",
+            description="Phone number (digits only, no formatting)",
+            example="5551234567",
+            local_format="phone",
+            rules=["Phone numbers should be digits only (remove spaces, dashes, parentheses)"],
+            questions=[
+                "What phone number should we have on file?",
+                "What's the best phone number to reach you?",
+                "Could you share a phone number for your file?"
+            ]
+        ),
+        FieldSpec(
+            name="email",
+            label="Email address",
+            description="Email address",
+            example="john@example.com",
+            local_format="email",
+            questions=[
+                "What email address should we use?",
+                "And what's your email address?",
+                "Could you share your email address?"
+            ]
+        ),
+        FieldGroup(
+            name="address",
+            label="Current mailing address",
+            model_name="Address",
+            fields=[
+                FieldSpec(
+                    name="street",
+                    label="street",
+                    description="Street address",
+                    example="123 Main St",
+                    questions=["What's your street address?", "Could you share the street address?"]
+                ),
+                FieldSpec(
+                    name="city",
+                    label="city",
+                    description="City name",
+                    example="Springfield",
+                    questions=["Which city is that in?", "And what city is that?"]
+                ),
+                FieldSpec(
+                    name="state",
+                    label="state",
+                    description="State (2-letter code if possible)",
+                    example="IL",
+                    local_format="state",
+                    rules=['State should be 2-letter code when possible (e.g., "Illinois" -> "IL")'],
+                    questions=["Which state is that in?", "And what state is that?"]
+                ),
+                FieldSpec(
+                    name="zip",
+                    label="zip code",
+                    description="ZIP code",
+                    example="62701",
+                    local_format="zip",
+                    questions=["What's the ZIP code?", "And the ZIP code?"]
+                )
+            ],
+            questions=[
+                "What's your current mailing address?",
+                "Could you share your mailing address, including city, state and ZIP?",
+                "And what's your current address?"
+            ]
+        )
+    ],
+    combined_questions=[
+        CombinedQuestion(
+            fields=["first_name", "last_name"],
+            questions=["Could you tell me your full name?", "What's your first and last name?"]
+        )
+    ]
+)
+
+
+INSURANCE_FORM = FormSchema(
+    form_id="insurance",
+    title="Insurance",
+    purpose="insurance information",
+    greeting="Hi! Let's get your insurance on file. Who is your health insurance provider?",
+    completion_message="Thank you! I have all of your insurance information.",
+    items=[
+        FieldSpec(
+            name="insurance_provider",
+            label="Insurance provider",
+            description="Name of the health insurance company or plan",
+            example="Blue Cross Blue Shield",
+            questions=["Who is your health insurance provider?"]
+        ),
+        FieldSpec(
+            name="member_id",
+            label="Member ID",
+            description="Member or subscriber ID as printed on the card",
+            example="XYZ123456789",
+            rules=["Member IDs should keep letters and digits, without spaces or dashes"],
+            questions=["What's the member ID on your insurance card?"]
+        ),
+        FieldSpec(
+            name="group_number",
+            label="Group number",
+            description="Group number as printed on the card",
+            example="0012345",
+            questions=["And the group number on the card?"]
+        ),
+        FieldSpec(
+            name="policy_holder_name",
+            label="Policy holder's full name",
+            description="Full name of the primary policy holder",
+            example="John Doe",
+            questions=["Who is the primary policy holder?"]
+        ),
+        FieldSpec(
+            name="policy_holder_relationship",
+            label="Relationship to the policy holder",
+            description="Patient's relationship to the policy holder (self, spouse, child, other)",
+            example="self",
+            rules=['Relationship should be one of "self", "spouse", "child", or "other"'],
+            questions=["What's your relationship to the policy holder?"]
+        )
+    ]
+)
+
+
+EMERGENCY_CONTACT_FORM = FormSchema(
+    form_id="emergency_contact",
+    title="Emergency Contact",
+    purpose="emergency contact information",
+    greeting="Hi! Who should we contact in case of an emergency?",
+    completion_message="Thank you! I have your emergency contact on file.",
+    items=[
+        FieldSpec(
+            name="contact_name",
+            label="Contact's full name",
+            description="Full name of the emergency contact",
+            example="Jane Doe",
+            questions=["Who should we contact in case of an emergency?"]
+        ),
+        FieldSpec(
+            name="relationship",
+            label="Relationship to the patient",
+            description="Contact's relationship to the patient",
+            example="spouse",
+            questions=["How are they related to you?"]
+        ),
+        FieldSpec(
+            name="phone",
+            label="Contact's phone number",
+            description="Contact's phone number (digits only, no formatting)",
+            example="5559876543",
+            local_format="phone",
+            rules=["Phone numbers should be digits only (remove spaces, dashes, parentheses)"],
+            questions=["What's the best phone number to reach them?"]
+        ),
+        FieldSpec(
+            name="alternate_phone",
+            label="Alternate phone number (optional)",
+            description="Contact's alternate phone number (digits only, no formatting)",
+            example="5550001111",
+            local_format="phone",
+            required=False,
+            questions=["Is there an alternate number for them?"]
+        )
+    ]
+)
+
+
+MEDICAL_HISTORY_FORM = FormSchema(
+    form_id="medical_history",
+    title="Medical History",
+    purpose="medical history",
+    greeting="Hi! I'd like to go over a bit of your medical history. Do you have any allergies?",
+    completion_message="Thank you for sharing that. I have everything I need for your medical history.",
+    items=[
+        FieldSpec(
+            name="allergies",
+            label="Allergies",
+            description="Known allergies, comma-separated (use \"none\" if the patient has none)",
+            example="penicillin, peanuts",
+            questions=["Do you have any allergies?"]
+        ),
+        FieldSpec(
+            name="current_medications",
+            label="Current medications",
+            description="Current medications with dosage if given, comma-separated (\"none\" if none)",
+            example="lisinopril 10mg, metformin 500mg",
+            questions=["Are you currently taking any medications?"]
+        ),
+        FieldSpec(
+            name="chronic_conditions",
+            label="Chronic conditions",
+            description="Ongoing medical conditions, comma-separated (\"none\" if none)",
+            example="hypertension, type 2 diabetes",
+            questions=["Do you have any ongoing medical conditions?"]
+        ),
+        FieldSpec(
+            name="past_surgeries",
+            label="Past surgeries",
+            description="Past surgeries with year if given, comma-separated (\"none\" if none)",
+            example="appendectomy 2010",
+            questions=["Have you had any surgeries in the past?"]
+        ),
+        FieldSpec(
+            name="primary_care_physician",
+            label="Primary care physician (optional)",
+            description="Name of the patient's primary care physician",
+            example="Dr. Smith",
+            required=False,
+            questions=["Who is your primary care physician?"]
+        )
+    ],
+    extraction_rules=['Use "none" only when the patient explicitly says they have none']
+)
+
+
+FORM_DEFINITIONS = {
+    form.form_id: form
+    for form in [DEMOGRAPHICS_FORM, INSURANCE_FORM, EMERGENCY_CONTACT_FORM, MEDICAL_HISTORY_FORM]
+}
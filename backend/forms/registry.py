@@ -0,0 +1,62 @@
+from typing import Dict, List, Optional
+from forms.compiler import CompiledForm, compile_form
+from forms.definitions import FORM_DEFINITIONS
+from config import settings
+
+
+# Compiled forms by form ID, compiled once on first use
+_compiled_forms: Dict[str, CompiledForm] = {}
+
+
+def compiled_form(form_id: str) -> CompiledForm:
+    """
+    Get a compiled form by ID, whether or not it is enabled.
+
+    Args:
+        form_id: Form ID
+
+    Returns:
+        Compiled form
+
+    Raises:
+        ValueError: If no form with that ID is defined
+    """
+    form = _compiled_forms.get(form_id)
+    if form is None:
+        schema = FORM_DEFINITIONS.get(form_id)
+        if schema is None:
+            raise ValueError(
+                f"Unknown form: {form_id}. "
+                f"Defined forms: {', '.join(FORM_DEFINITIONS)}"
+            )
+        form = _compiled_forms[form_id] = compile_form(schema)
+    return form
+
+
+def get_enabled_form_ids() -> List[str]:
+    """Get the IDs of forms enabled for this deployment."""
+    return [form_id.strip() for form_id in settings.INTAKE_FORMS.split(",") if form_id.strip()]
+
+
+def get_form(form_id: Optional[str] = None) -> CompiledForm:
+    """
+    Get an enabled compiled form.
+
+    Args:
+        form_id: Form ID (defaults to DEFAULT_FORM)
+
+    Returns:
+        Compiled form
+
+    Raises:
+        ValueError: If the form is not enabled
+    """
+    form_id = form_id or settings.DEFAULT_FORM
+    if form_id not in get_enabled_form_ids():
+        raise ValueError(f"Form is not enabled: {form_id}")
+    return compiled_form(form_id)
+
+
+def compile_enabled_forms() -> List[CompiledForm]:
+    """Compile every enabled form up front."""
+    return [compiled_form(form_id) for form_id in get_enabled_form_ids()]
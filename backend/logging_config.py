@@ -0,0 +1,218 @@
+import asyncio
+import copy
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict
+from serialization import dumps
+
+
+# Structured fields copied from log records (passed via `extra=`) when present
+STRUCTURED_FIELDS = (
+    "session_id",
+    "turn",
+    "provider",
+    "model",
+    "operation",
+    "status",
+    "latency_ms",
+    "prompt_tokens",
+    "completion_tokens",
+    "method",
+    "path",
+    "status_code",
+    "error",
+    "profile",
+    "batch_size",
+    "fallbacks"
+)
+
+# Request-scoped fields (session ID, turn) attached to every record logged in
+# the current task. Tasks inherit a copy, so background extraction keeps them.
+log_context: ContextVar[Dict] = ContextVar("log_context", default={})
+
+SESSION_PATH = re.compile(r"/sessions/([0-9a-fA-F-]{36})")
+
+logger = logging.getLogger(__name__)
+
+
+def bind_log_context(**fields) -> None:
+    """
+    Attach fields to every record logged by the current task.
+
+    Args:
+        **fields: Structured fields, e.g. session_id, turn
+    """
+    log_context.set({**log_context.get(), **fields})
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current log context onto records. Runs in the caller, before queueing."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Attach context fields without overriding explicit extras."""
+        for key, value in log_context.get().items():
+            if key not in record.__dict__:
+                setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of DEBUG records.
+    A record can override the rate with `extra={"sample_rate": ...}`.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Initialize the filter.
+
+        Args:
+            rate: Fraction of DEBUG records to keep (0.0 to 1.0)
+        """
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Drop sampled-out DEBUG records."""
+        if record.levelno > logging.DEBUG:
+            return True
+        rate = record.__dict__.get("sample_rate", self.rate)
+        return rate >= 1.0 or random.random() < rate
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that keeps structured fields for the listener thread.
+
+    The stdlib QueueHandler formats the message (and traceback) into a
+    single string; this keeps the traceback separate so the JSON formatter
+    can emit it as its own field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve the message and exception text before queueing."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render a record with its structured fields."""
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for field in STRUCTURED_FIELDS:
+            value = record.__dict__.get(field)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return dumps(entry).decode("utf-8")
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_format: str = "json",
+    debug_sample_rate: float = 1.0
+) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Request handling only appends records to an unbounded in-memory queue;
+    formatting and stdout writes happen in the listener thread. Records
+    logged before the listener starts wait in the queue.
+
+    Args:
+        level: Root log level name
+        log_format: "json" for structured output, "text" for plain lines
+        debug_sample_rate: Fraction of DEBUG records to keep
+
+    Returns:
+        Queue listener (start it on startup, stop it on shutdown to flush)
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if log_format == "json":
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(debug_sample_rate))
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level.upper())
+
+    return logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+
+class RequestLoggingMiddleware:
+    """
+    ASGI middleware that logs one structured record per HTTP request and
+    binds the session ID from the path to the request's log context.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        match = SESSION_PATH.search(scope["path"])
+        if match:
+            bind_log_context(session_id=match.group(1))
+
+        if scope["type"] == "websocket":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except asyncio.CancelledError:
+            # Client went away before the response was sent
+            status["code"] = 499
+            raise
+        finally:
+            logger.info("Request", extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status["code"],
+                "latency_ms": round((time.perf_counter() - start) * 1000, 1)
+            })
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Literal
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
@@ -36,3 +36,4 @@ class MessageResponse(BaseModel):
     assistant_message: str = Field(..., description="AI assistant's response")
     updated_fields: dict = Field(default_factory=dict, description="Newly updated form fields")
     is_complete: bool = Field(default=False, description="Whether all required fields are filled")
+    state_token: Optional[str] = Field(default=None, description="Session state token (stateless mode only)")
@@ -0,0 +1,72 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Optional, Literal, Union
+
+
+class FieldValue(BaseModel):
+    """A single form field value with metadata."""
+    value: Optional[str] = None
+    confidence: Optional[Literal["high", "medium", "low"]] = None
+    turn: Optional[int] = None
+
+
+class FieldSpec(BaseModel):
+    """Declarative definition of a single form field."""
+    name: str
+    label: str = Field(..., description="Human-readable label, used in the system prompt")
+    description: str = Field(..., description="What to extract, used in the extraction prompt")
+    example: str = Field(..., description="Example value for the extraction output format")
+    rules: List[str] = Field(default_factory=list, description="Extra extraction rules for this field")
+    questions: List[str] = Field(default_factory=list, description="Phrasings for asking this field")
+    required: bool = True
+    local_format: Optional[Literal["date", "phone", "email", "zip", "state"]] = Field(
+        None,
+        description="Format recognized by local extraction when the LLM is unavailable"
+    )
+
+    @field_validator("name")
+    @classmethod
+    def name_is_identifier(cls, name: str) -> str:
+        """Field names become model attributes and generated code."""
+        if not name.isidentifier():
+            raise ValueError(f"Field name must be a valid identifier: {name}")
+        return name
+
+
+class FieldGroup(BaseModel):
+    """A named group of fields stored as a nested object (e.g. address)."""
+    model_config = ConfigDict(protected_namespaces=())
+
+    name: str
+    label: str
+    model_name: Optional[str] = None
+    fields: List[FieldSpec]
+    questions: List[str] = Field(default_factory=list, description="Phrasings for asking the whole group")
+
+    @field_validator("name")
+    @classmethod
+    def name_is_identifier(cls, name: str) -> str:
+        """Group names become model attributes and generated code."""
+        if not name.isidentifier():
+            raise ValueError(f"Group name must be a valid identifier: {name}")
+        return name
+
+
+class CombinedQuestion(BaseModel):
+    """Phrasings for asking several missing fields at once (e.g. full name)."""
+    fields: List[str] = Field(..., description="Dotted field paths asked together")
+    questions: List[str]
+
+
+class FormSchema(BaseModel):
+    """Declarative definition of an intake form."""
+    model_config = ConfigDict(protected_namespaces=())
+
+    form_id: str
+    title: str
+    model_name: Optional[str] = None
+    purpose: str = Field(..., description="What the form collects, used in both prompts")
+    greeting: str
+    completion_message: str
+    items: List[Union[FieldSpec, FieldGroup]]
+    combined_questions: List[CombinedQuestion] = Field(default_factory=list)
+    extraction_rules: List[str] = Field(default_factory=list, description="Form-wide extraction rules")
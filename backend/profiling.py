@@ -0,0 +1,147 @@
+import asyncio
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+# Request header that asks for a profile of the request
+PROFILE_HEADER = b"x-profile"
+
+UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and writes their profiles.
+
+    A request is profiled when it sends the X-Profile header, when it is
+    picked by the sampling rate, or while requests armed through the admin
+    endpoint remain. Only one request is profiled at a time (cProfile
+    cannot nest); requests arriving meanwhile run unprofiled.
+    """
+
+    def __init__(self, directory: str, sample_rate: float = 0.0, path_prefix: str = "/api/"):
+        """
+        Initialize the profiler.
+
+        Args:
+            directory: Directory profiles are written to
+            sample_rate: Fraction of matching requests profiled without being asked
+            path_prefix: Only requests under this path are profiled
+        """
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.path_prefix = path_prefix
+        self.armed = 0
+        self.active = False
+
+    def arm(self, count: int) -> int:
+        """
+        Profile the next requests under the path prefix.
+
+        Args:
+            count: Number of requests to profile
+
+        Returns:
+            Number of requests now armed
+        """
+        self.armed += count
+        return self.armed
+
+    def should_profile(self, scope) -> bool:
+        """
+        Decide whether to profile a request, consuming an armed slot if used.
+
+        Args:
+            scope: ASGI HTTP scope
+
+        Returns:
+            True if the request should be profiled
+        """
+        if self.active or not scope["path"].startswith(self.path_prefix):
+            return False
+        if any(name == PROFILE_HEADER for name, _ in scope["headers"]):
+            return True
+        if self.armed:
+            self.armed -= 1
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def save(self, profile: cProfile.Profile, scope, latency_ms: float) -> str:
+        """
+        Write a profile as a pstats file in a worker thread.
+
+        Args:
+            profile: Finished profile
+            scope: ASGI HTTP scope of the profiled request
+            latency_ms: Request latency in milliseconds
+
+        Returns:
+            Path of the written file
+        """
+        name = UNSAFE_FILENAME_CHARS.sub("_", scope["path"]).strip("_")
+        filename = (
+            f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}_"
+            f"{scope['method']}_{name}_{int(latency_ms)}ms.prof"
+        )
+        path = os.path.join(self.directory, filename)
+        await asyncio.to_thread(os.makedirs, self.directory, exist_ok=True)
+        await asyncio.to_thread(profile.dump_stats, path)
+        return path
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles selected HTTP requests with cProfile.
+
+    Only installed when profiling is enabled, so it costs nothing otherwise.
+    The profile covers the whole request, including the streamed response.
+    cProfile records the worker thread, so other requests served
+    concurrently on the event loop show up in the profile too; profile on
+    a quiet worker for a clean picture. Profiles open with
+    `python -m pstats FILE`, snakeviz, or speedscope.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            profiler: Profiler deciding which requests to profile
+        """
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope["type"] != "http" or not self.profiler.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self.profiler.active = True
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profile.disable()
+            self.profiler.active = False
+            latency_ms = (time.perf_counter() - start) * 1000
+            try:
+                path = await self.profiler.save(profile, scope, latency_ms)
+                logger.info("Request profiled", extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "latency_ms": round(latency_ms, 1),
+                    "profile": path
+                })
+            except OSError:
+                logger.exception("Failed to write request profile")
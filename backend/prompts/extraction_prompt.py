@@ -1,16 +1,12 @@
-EXTRACTION_PROMPT = """Analyze the conversation history and extract demographic information into a structured JSON format.
+import json
+from typing import List
+from models.form_schema import FormSchema, FieldGroup
+
+
+EXTRACTION_PROMPT_TEMPLATE = """Analyze the conversation history and extract {purpose} into a structured JSON format.
 
 Required fields to extract:
-- first_name: Patient's first name
-- last_name: Patient's last name
-- date_of_birth: Date of birth in YYYY-MM-DD format
-- phone: Phone number (digits only, no formatting)
-- email: Email address
-- address: Object with:
-  - street: Street address
-  - city: City name
-  - state: State (2-letter code if possible)
-  - zip: ZIP code
+{field_list}
 
 Rules for extraction:
 1. Only include fields where information was explicitly mentioned
@@ -18,58 +14,120 @@ Rules for extraction:
 3. Use null for fields that haven't been mentioned yet
 4. Include a confidence level for each field: "high" (explicitly stated), "medium" (implied or unclear), "low" (guessed)
 5. Track which conversation turn number the data came from (1-indexed)
-6. Dates should be converted to YYYY-MM-DD format
-7. Phone numbers should be digits only (remove spaces, dashes, parentheses)
-8. State should be 2-letter code when possible (e.g., "Illinois" -> "IL")
-
+{field_rules}
 Output format (return ONLY valid JSON, no other text):
-{
-  "first_name": {"value": "John", "confidence": "high", "turn": 2},
-  "last_name": {"value": "Doe", "confidence": "high", "turn": 2},
-  "date_of_birth": {"value": "1985-03-15", "confidence": "high", "turn": 3},
-  "phone": {"value": "5551234567", "confidence": "high", "turn": 4},
-  "email": {"value": "john@example.com", "confidence": "high", "turn": 4},
-  "address": {
-    "street": {"value": "123 Main St", "confidence": "medium", "turn": 5},
-    "city": {"value": "Springfield", "confidence": "high", "turn": 5},
-    "state": {"value": "IL", "confidence": "medium", "turn": 5},
-    "zip": {"value": "62701", "confidence": "high", "turn": 5}
-  }
-}
+{output_example}
 
 For fields not yet mentioned, use:
-"field_name": {"value": null, "confidence": null, "turn": null}
+"field_name": {{"value": null, "confidence": null, "turn": null}}
 
 Important:
 - Return ONLY the JSON object, no other text
 - If a field is corrected, update the value and turn number
 - Be conservative with confidence - use "medium" if there's any ambiguity
-- Parse dates flexibly (MM/DD/YYYY, MM-DD-YYYY, Month DD, YYYY, etc.) and convert to YYYY-MM-DD
 """
 
 
-def get_extraction_prompt(conversation_history: list) -> str:
+BATCH_EXTRACTION_INSTRUCTIONS = """Batch mode: below are several independent conversations, each with a different patient.
+Extract each conversation separately, following the rules above; turn numbers count from 1 within each conversation.
+
+Return ONLY a JSON object with one entry per conversation, keyed by conversation number as a string,
+each entry being the output format above:
+{"1": {...}, "2": {...}}"""
+
+
+def build_extraction_prompt(form_schema: FormSchema) -> str:
+    """
+    Build the extraction instructions for a form schema.
+
+    Args:
+        form_schema: Declarative form schema
+
+    Returns:
+        Extraction prompt without conversation history
+    """
+    field_list = []
+    rules = []
+    example = {}
+    turn = 2
+
+    for item in form_schema.items:
+        if isinstance(item, FieldGroup):
+            field_list.append(f"- {item.name}: Object with:")
+            group_example = {}
+            for field in item.fields:
+                field_list.append(f"  - {field.name}: {field.description}")
+                rules.extend(field.rules)
+                group_example[field.name] = {"value": field.example, "confidence": "high", "turn": turn}
+            example[item.name] = group_example
+        else:
+            field_list.append(f"- {item.name}: {item.description}")
+            rules.extend(item.rules)
+            example[item.name] = {"value": item.example, "confidence": "high", "turn": turn}
+        turn += 1
+
+    rules.extend(form_schema.extraction_rules)
+    field_rules = "".join(f"{number}. {rule}\n" for number, rule in enumerate(rules, 6))
+
+    return EXTRACTION_PROMPT_TEMPLATE.format(
+        purpose=form_schema.purpose,
+        field_list="\n".join(field_list),
+        field_rules=field_rules,
+        output_example=json.dumps(example, indent=2)
+    )
+
+
+def get_extraction_prompt(conversation_history: list, extraction_prompt: str) -> str:
     """
     Create the extraction prompt with conversation history.
 
     Args:
         conversation_history: List of conversation messages
+        extraction_prompt: Compiled extraction instructions for the session's form
 
     Returns:
         Complete prompt with conversation history
     """
-    # Format conversation history
+    return f"""{extraction_prompt}
+
+Conversation history:
+{format_conversation(conversation_history)}
+
+Now extract the information as JSON:"""
+
+
+def get_batch_extraction_prompt(conversations: List[list], extraction_prompt: str) -> str:
+    """
+    Create one extraction prompt covering several independent conversations,
+    so the shared instructions are sent once.
+
+    Args:
+        conversations: Conversation histories, numbered from 1 in the prompt
+        extraction_prompt: Compiled extraction instructions for the conversations' form
+
+    Returns:
+        Complete prompt asking for a JSON object keyed by conversation number
+    """
+    sections = "\n\n".join(
+        f"Conversation {number}:\n{format_conversation(history)}"
+        for number, history in enumerate(conversations, 1)
+    )
+
+    return f"""{extraction_prompt}
+
+{BATCH_EXTRACTION_INSTRUCTIONS}
+
+{sections}
+
+Now extract the information for all {len(conversations)} conversations as JSON:"""
+
+
+def format_conversation(conversation_history: list) -> str:
+    """Format conversation messages as numbered turns."""
     formatted_history = []
     for i, msg in enumerate(conversation_history, 1):
         role = msg.get("role", "unknown")
         content = msg.get("content", "")
         formatted_history.append(f"Turn {i} ({role}): {content}")
 
-    history_text = "\n".join(formatted_history)
-
-    return f"""{EXTRACTION_PROMPT}
-
-Conversation history:
-{history_text}
-
-Now extract the demographic information as JSON:"""
+    return "\n".join(formatted_history)
@@ -1,11 +1,10 @@
-SYSTEM_PROMPT = """You are a professional and friendly healthcare intake specialist helping patients complete their demographic information form. Your role is to collect the following information through natural conversation:
+from models.form_schema import FormSchema, FieldGroup
+
+
+SYSTEM_PROMPT_TEMPLATE = """You are a professional and friendly healthcare intake specialist helping patients complete their {purpose} form. Your role is to collect the following information through natural conversation:
 
 Required Information:
-1. Full name (first and last name)
-2. Date of birth (in MM/DD/YYYY format)
-3. Phone number
-4. Email address
-5. Current mailing address (street, city, state, zip code)
+{required_information}
 
 Guidelines for your conversation:
 - Be warm, welcoming, and professional
@@ -25,14 +24,41 @@ Important:
 - Never say "I need" or "I require" - instead use friendly language like "Could you share..." or "What's..."
 
 Example conversation flow:
-- Start: "Hi! I'm here to help you get checked in today. To get started, could you tell me your name?"
-- Middle: "Great, thank you! And what's your date of birth?"
-- Correction: "No problem at all, I've updated that. What phone number should we have on file?"
-- End: "Perfect! I have all your information. Thank you for providing that!"
+- Start: "{greeting}"
+- Middle: "Great, thank you! {middle_question}"
+- Correction: "No problem at all, I've updated that. {correction_question}"
+- End: "{completion_message}"
 
 Remember: You're a helpful human assistant, not a chatbot. Be natural, friendly, and conversational."""
 
 
-def get_system_prompt() -> str:
-    """Return the system prompt for the conversational AI."""
-    return SYSTEM_PROMPT
+def build_system_prompt(form_schema: FormSchema) -> str:
+    """
+    Build the system prompt for the conversational AI from a form schema.
+
+    Args:
+        form_schema: Declarative form schema
+
+    Returns:
+        System prompt text
+    """
+    required_information = []
+    for number, item in enumerate(form_schema.items, 1):
+        if isinstance(item, FieldGroup):
+            parts = ", ".join(field.label for field in item.fields)
+            required_information.append(f"{number}. {item.label} ({parts})")
+        else:
+            required_information.append(f"{number}. {item.label}")
+
+    def example_question(index: int) -> str:
+        item = form_schema.items[min(index, len(form_schema.items) - 1)]
+        return item.questions[0] if item.questions else f"What's your {item.label.lower()}?"
+
+    return SYSTEM_PROMPT_TEMPLATE.format(
+        purpose=form_schema.purpose,
+        required_information="\n".join(required_information),
+        greeting=form_schema.greeting,
+        middle_question=example_question(2),
+        correction_question=example_question(3),
+        completion_message=form_schema.completion_message
+    )
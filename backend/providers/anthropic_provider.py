@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, AsyncIterator
 from anthropic import AsyncAnthropic
 from providers.base_provider import BaseProvider
 
@@ -6,6 +6,9 @@ from providers.base_provider import BaseProvider
 class AnthropicProvider(BaseProvider):
     """Anthropic Claude LLM provider implementation."""
 
+    name = "anthropic"
+    supports_streaming = True
+
     def __init__(self, api_key: str, model_name: str):
         """
         Initialize Anthropic provider.
@@ -61,10 +64,58 @@ class AnthropicProvider(BaseProvider):
                 messages=conversation_messages
             )
 
+            self.record_usage(response.usage.input_tokens, response.usage.output_tokens)
             return response.content[0].text
         except Exception as e:
             raise Exception(f"Anthropic API error: {str(e)}")
 
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion using Anthropic's API.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response (defaults to 1024)
+
+        Yields:
+            Chunks of the generated response text
+
+        Raises:
+            Exception: If API call fails
+        """
+        try:
+            system_message = None
+            conversation_messages = []
+
+            for msg in messages:
+                if msg["role"] == "system":
+                    system_message = msg["content"]
+                else:
+                    conversation_messages.append(msg)
+
+            if max_tokens is None:
+                max_tokens = 1024
+
+            async with self.client.messages.stream(
+                model=self.model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_message,
+                messages=conversation_messages
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                message = await stream.get_final_message()
+                self.record_usage(message.usage.input_tokens, message.usage.output_tokens)
+        except Exception as e:
+            raise Exception(f"Anthropic API error: {str(e)}")
+
     def validate_config(self) -> bool:
         """
         Validate Anthropic configuration.
@@ -1,5 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+
+
+# Holder for the token usage (prompt_tokens, completion_tokens) of the current
+# call. The caller installs a fresh holder and the provider fills it in: on
+# Python < 3.12 asyncio.wait_for runs the call in a task with a copied context,
+# so a value the provider set on the variable itself would not reach the caller.
+usage_holder: ContextVar[Optional[List[Optional[Tuple[int, int]]]]] = ContextVar("usage_holder", default=None)
+
+
+def reset_usage() -> None:
+    """Start recording token usage for a call made by the current task."""
+    usage_holder.set([None])
+
+
+def last_usage() -> Optional[Tuple[int, int]]:
+    """Token usage recorded for the current call, if the provider reported it."""
+    holder = usage_holder.get()
+    return holder[0] if holder is not None else None
 
 
 class BaseProvider(ABC):
@@ -8,6 +27,13 @@ class BaseProvider(ABC):
     All LLM provider implementations must inherit from this class and implement its methods.
     """
 
+    # Provider name used in logs
+    name = "base"
+    # Capabilities of the backing API; without them the default
+    # implementations below emulate the feature
+    supports_streaming = False
+    supports_json_mode = False
+
     def __init__(self, api_key: str, model_name: str):
         """
         Initialize the provider with API credentials and model configuration.
@@ -43,6 +69,62 @@ class BaseProvider(ABC):
         """
         pass
 
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a chat completion response as a stream of text chunks.
+        Default implementation yields the full completion as a single chunk.
+        Override this method if your provider supports token streaming.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in the response (None for default)
+
+        Yields:
+            Chunks of the generated response text
+
+        Raises:
+            Exception: If the API call fails
+        """
+        yield await self.chat_completion(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+
+    async def json_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Generate a chat completion whose response is a JSON object.
+        Default implementation relies on the prompt asking for JSON.
+        Override this method if your provider has a JSON output mode.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in the response (None for default)
+
+        Returns:
+            The generated response text
+
+        Raises:
+            Exception: If the API call fails
+        """
+        return await self.chat_completion(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+
     @abstractmethod
     def validate_config(self) -> bool:
         """
@@ -56,6 +138,19 @@ class BaseProvider(ABC):
         """
         pass
 
+    def record_usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        """
+        Record token usage reported by the API for the current call.
+        Providers call this when the response includes usage data.
+
+        Args:
+            prompt_tokens: Input tokens
+            completion_tokens: Output tokens
+        """
+        holder = usage_holder.get()
+        if holder is not None:
+            holder[0] = (prompt_tokens, completion_tokens)
+
     def format_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
         """
         Format messages to match the provider's expected format.
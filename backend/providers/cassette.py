@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+def request_key(
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: Optional[int]
+) -> str:
+    """
+    Hash a provider request.
+
+    Args:
+        messages: Request messages
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in the response
+
+    Returns:
+        SHA-256 hex digest of the canonical request
+    """
+    canonical = json.dumps(
+        {"messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded provider calls, stored as JSON lines.
+
+    Each entry holds the request hash and messages, the response chunks
+    with their offsets in seconds from the start of the call, the total
+    latency, token usage and the error message of a failed call. A
+    non-streamed call is recorded as a single chunk.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a cassette.
+
+        Args:
+            path: Cassette file path
+        """
+        self.path = path
+        self.entries: Dict[str, Deque[dict]] = {}
+
+    def load(self) -> int:
+        """
+        Load recorded calls, grouped by request hash in recording order.
+
+        Returns:
+            Number of loaded calls
+
+        Raises:
+            FileNotFoundError: If the cassette file does not exist
+        """
+        self.entries.clear()
+        count = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self.entries.setdefault(entry["key"], deque()).append(entry)
+                count += 1
+        return count
+
+    def next_entry(self, key: str) -> Optional[dict]:
+        """
+        Get the recorded call for a request hash.
+
+        Repeated identical requests get the recorded calls in order; once
+        only one is left it is served for every further request.
+
+        Args:
+            key: Request hash
+
+        Returns:
+            Recorded entry, or None if the request was never recorded
+        """
+        queue = self.entries.get(key)
+        if not queue:
+            return None
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def append(self, entry: dict) -> None:
+        """
+        Append a recorded call to the cassette file.
+
+        Args:
+            entry: Entry to record
+        """
+        self.append_line(self.encode(entry))
+
+    @staticmethod
+    def encode(entry: dict) -> str:
+        """Encode an entry as a cassette line."""
+        return json.dumps(entry, ensure_ascii=False) + "\n"
+
+    def append_line(self, line: str) -> None:
+        """
+        Append an encoded entry to the cassette file.
+
+        Args:
+            line: Line returned by encode()
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
@@ -0,0 +1,176 @@
+from typing import List, Dict, Optional, AsyncIterator
+from openai import AsyncOpenAI
+from providers.base_provider import BaseProvider
+
+
+# Placeholder key for servers without authentication (the client requires one)
+NO_API_KEY = "not-needed"
+
+
+class LocalOpenAIProvider(BaseProvider):
+    """
+    Provider for self-hosted OpenAI-compatible inference servers
+    (vLLM, llama.cpp server, Ollama and similar).
+
+    Servers differ in what they implement, so streaming and JSON mode are
+    enabled per deployment; when disabled, the base class emulates them
+    with plain completions.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        base_url: str,
+        model_name: str,
+        api_key: Optional[str] = None,
+        streaming: bool = True,
+        json_mode: bool = False
+    ):
+        """
+        Initialize the local provider.
+
+        Args:
+            base_url: Server API root (e.g., 'http://localhost:8080/v1')
+            model_name: Model ID served by the server
+            api_key: Bearer token, if the server requires one
+            streaming: Whether the server supports streamed completions
+            json_mode: Whether the server supports response_format json_object
+        """
+        super().__init__(api_key, model_name)
+        self.base_url = base_url
+        self.supports_streaming = streaming
+        self.supports_json_mode = json_mode
+        self.client = AsyncOpenAI(api_key=api_key or NO_API_KEY, base_url=base_url)
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Generate a chat completion using the local server.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Generated response text
+
+        Raises:
+            Exception: If API call fails
+        """
+        return await self._complete(messages, temperature, max_tokens)
+
+    async def json_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Generate a JSON completion, using the server's JSON mode if enabled.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Generated response text
+
+        Raises:
+            Exception: If API call fails
+        """
+        if not self.supports_json_mode:
+            return await self._complete(messages, temperature, max_tokens)
+        return await self._complete(
+            messages, temperature, max_tokens,
+            response_format={"type": "json_object"}
+        )
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        **options
+    ) -> str:
+        """Run a non-streaming completion request."""
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **options
+            )
+            if response.usage:
+                self.record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            raise Exception(f"Local LLM server error: {str(e)}")
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from the local server, or yield the full
+        completion as one chunk if streaming is disabled.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Chunks of the generated response text
+
+        Raises:
+            Exception: If API call fails
+        """
+        if not self.supports_streaming:
+            yield await self._complete(messages, temperature, max_tokens)
+            return
+
+        try:
+            # stream_options is not sent: not every server accepts it, and
+            # those that report usage anyway do so in the final chunk
+            stream = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if getattr(chunk, "usage", None):
+                    self.record_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+        except Exception as e:
+            raise Exception(f"Local LLM server error: {str(e)}")
+
+    def validate_config(self) -> bool:
+        """
+        Validate local server configuration.
+
+        Returns:
+            True if configuration is valid
+
+        Raises:
+            ValueError: If the base URL or model is missing or malformed
+        """
+        if not self.base_url:
+            raise ValueError("Local LLM base URL is required")
+        if not self.base_url.startswith(("http://", "https://")):
+            raise ValueError("Local LLM base URL must start with http:// or https://")
+        if not self.model_name:
+            raise ValueError("Local LLM model name is required")
+        return True
@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, AsyncIterator
 from openai import AsyncOpenAI
 from providers.base_provider import BaseProvider
 
@@ -6,6 +6,9 @@ from providers.base_provider import BaseProvider
 class OpenAIProvider(BaseProvider):
     """OpenAI LLM provider implementation."""
 
+    name = "openai"
+    supports_streaming = True
+
     def __init__(self, api_key: str, model_name: str):
         """
         Initialize OpenAI provider.
@@ -44,10 +47,50 @@ class OpenAIProvider(BaseProvider):
                 temperature=temperature,
                 max_tokens=max_tokens
             )
+            if response.usage:
+                self.record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
             return response.choices[0].message.content
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
 
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion using OpenAI's API.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Chunks of the generated response text
+
+        Raises:
+            Exception: If API call fails
+        """
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if chunk.usage:
+                    # Sent in a final chunk without choices
+                    self.record_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
+
     def validate_config(self) -> bool:
         """
         Validate OpenAI configuration.
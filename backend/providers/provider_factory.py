@@ -1,17 +1,52 @@
+from typing import Optional, Tuple
 from providers.base_provider import BaseProvider
 from providers.openai_provider import OpenAIProvider
 from providers.anthropic_provider import AnthropicProvider
 from providers.azure_openai_provider import AzureOpenAIProvider
+from providers.local_openai_provider import LocalOpenAIProvider
+from providers.recording_provider import RecordingProvider
+from providers.replay_provider import ReplayProvider
 from config import settings
 
 
+# Tasks that can be routed to their own provider and model
+TASKS = ("conversation", "extraction")
+
+
 class ProviderFactory:
     """Factory class for creating LLM provider instances."""
 
     @staticmethod
-    def create_provider() -> BaseProvider:
+    def task_route(task: str) -> Tuple[str, Optional[str]]:
+        """
+        Get the provider type and model override configured for a task.
+        Extraction falls back to the conversation provider and model.
+
+        Args:
+            task: "conversation" or "extraction"
+
+        Returns:
+            Tuple of (provider type, model name or None for the provider default)
+
+        Raises:
+            ValueError: If the task is unknown
+        """
+        if task not in TASKS:
+            raise ValueError(f"Unknown LLM task: {task}")
+        if task == "extraction":
+            provider_type = settings.EXTRACTION_LLM_PROVIDER or settings.LLM_PROVIDER
+            return provider_type.lower(), settings.EXTRACTION_MODEL_NAME
+        return settings.LLM_PROVIDER.lower(), None
+
+    @staticmethod
+    def create_provider(task: str = "conversation") -> BaseProvider:
         """
-        Create and return the appropriate LLM provider based on configuration.
+        Create and return the appropriate LLM provider for a task based on
+        configuration. When LLM_RECORD_CASSETTE is set, the provider's calls
+        are recorded.
+
+        Args:
+            task: "conversation" or "extraction"
 
         Returns:
             An instance of the configured LLM provider
@@ -19,8 +54,34 @@ class ProviderFactory:
         Raises:
             ValueError: If provider type is invalid or required API key is missing
         """
-        provider_type = settings.LLM_PROVIDER.lower()
-        model_name = settings.MODEL_NAME
+        provider_type, model_name = ProviderFactory.task_route(task)
+        provider = ProviderFactory.create_base_provider(provider_type, model_name)
+        if settings.LLM_RECORD_CASSETTE:
+            return RecordingProvider(provider, settings.LLM_RECORD_CASSETTE)
+        return provider
+
+    @staticmethod
+    def create_base_provider(
+        provider_type: Optional[str] = None,
+        model_name: Optional[str] = None
+    ) -> BaseProvider:
+        """
+        Create an LLM provider without recording.
+
+        Args:
+            provider_type: Provider type (defaults to LLM_PROVIDER)
+            model_name: Model, or deployment for Azure (defaults to the provider's configured model)
+
+        Returns:
+            An instance of the configured LLM provider
+
+        Raises:
+            ValueError: If provider type is invalid or required API key is missing
+        """
+        provider_type = (provider_type or settings.LLM_PROVIDER).lower()
+        deployment_name = model_name or settings.AZURE_OPENAI_MODEL_NAME
+        local_model_name = model_name or settings.LOCAL_LLM_MODEL_NAME or settings.MODEL_NAME
+        model_name = model_name or settings.MODEL_NAME
 
         if provider_type == "openai":
             if not settings.OPENAI_API_KEY:
@@ -49,30 +110,59 @@ class ProviderFactory:
                 raise ValueError("AZURE_OPENAI_API_KEY is required when using Azure OpenAI provider")
             if not settings.AZURE_OPENAI_ENDPOINT:
                 raise ValueError("AZURE_OPENAI_ENDPOINT is required when using Azure OpenAI provider")
-            if not settings.AZURE_OPENAI_MODEL_NAME:
+            if not deployment_name:
                 raise ValueError("AZURE_OPENAI_MODEL_NAME is required when using Azure OpenAI provider")
 
             provider = AzureOpenAIProvider(
                 api_key=settings.AZURE_OPENAI_API_KEY,
                 endpoint=settings.AZURE_OPENAI_ENDPOINT,
-                model_name=settings.AZURE_OPENAI_MODEL_NAME,
+                model_name=deployment_name,
                 api_version=settings.AZURE_OPENAI_API_VERSION
             )
             provider.validate_config()
             return provider
 
+        elif provider_type == "local":
+            if not settings.LOCAL_LLM_BASE_URL:
+                raise ValueError("LOCAL_LLM_BASE_URL is required when using the local provider")
+
+            provider = LocalOpenAIProvider(
+                base_url=settings.LOCAL_LLM_BASE_URL,
+                model_name=local_model_name,
+                api_key=settings.LOCAL_LLM_API_KEY,
+                streaming=settings.LOCAL_LLM_STREAMING,
+                json_mode=settings.LOCAL_LLM_JSON_MODE
+            )
+            provider.validate_config()
+            return provider
+
+        elif provider_type == "replay":
+            if not settings.LLM_REPLAY_CASSETTE:
+                raise ValueError("LLM_REPLAY_CASSETTE is required when using the replay provider")
+
+            provider = ReplayProvider(
+                cassette_path=settings.LLM_REPLAY_CASSETTE,
+                reproduce_timing=settings.LLM_REPLAY_TIMING,
+                model_name=model_name
+            )
+            provider.validate_config()
+            return provider
+
         else:
             raise ValueError(
                 f"Invalid LLM_PROVIDER: {provider_type}. "
-                f"Supported providers: openai, anthropic, azure_openai"
+                f"Supported providers: openai, anthropic, azure_openai, local, replay"
             )
 
 
-def get_provider() -> BaseProvider:
+def get_provider(task: str = "conversation") -> BaseProvider:
     """
     Convenience function to get a provider instance.
 
+    Args:
+        task: "conversation" or "extraction"
+
     Returns:
-        An instance of the configured LLM provider
+        An instance of the LLM provider configured for the task
     """
-    return ProviderFactory.create_provider()
+    return ProviderFactory.create_provider(task)
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, AsyncIterator, Awaitable, Callable
+from providers.base_provider import BaseProvider, last_usage
+from providers.cassette import Cassette, request_key
+
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingProvider(BaseProvider):
+    """
+    Wraps any provider and records its calls to a cassette file for
+    ReplayProvider. Calls pass through unchanged.
+    """
+
+    def __init__(self, provider: BaseProvider, cassette_path: str):
+        """
+        Initialize the recording wrapper.
+
+        Args:
+            provider: Provider whose calls are recorded
+            cassette_path: Cassette file to append to
+        """
+        super().__init__(provider.api_key, provider.model_name)
+        self.provider = provider
+        self.name = provider.name
+        self.supports_streaming = provider.supports_streaming
+        self.supports_json_mode = provider.supports_json_mode
+        self.cassette = Cassette(cassette_path)
+        # A single worker appends cassette lines in call order, off the event loop
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cassette-writer")
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Generate a chat completion with the wrapped provider and record it.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Generated response text
+
+        Raises:
+            Exception: If the wrapped provider fails (the failure is recorded)
+        """
+        return await self._record_completion(
+            self.provider.chat_completion, messages, temperature, max_tokens
+        )
+
+    async def json_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Generate a JSON completion with the wrapped provider and record it.
+        Replays are served as plain completions.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Generated response text
+
+        Raises:
+            Exception: If the wrapped provider fails (the failure is recorded)
+        """
+        return await self._record_completion(
+            self.provider.json_completion, messages, temperature, max_tokens
+        )
+
+    async def _record_completion(
+        self,
+        completion: Callable[..., Awaitable[str]],
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> str:
+        """Run a non-streaming completion of the wrapped provider and record it."""
+        start = time.perf_counter()
+        try:
+            response = await completion(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        except Exception as e:
+            self._record(messages, temperature, max_tokens, start, [], [], str(e))
+            raise
+        self._record(
+            messages, temperature, max_tokens, start,
+            [response], [time.perf_counter() - start]
+        )
+        return response
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from the wrapped provider and record it
+        with the arrival time of each chunk. Streams abandoned by the
+        consumer are not recorded.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Chunks of the generated response text
+
+        Raises:
+            Exception: If the wrapped provider fails (the failure is recorded)
+        """
+        start = time.perf_counter()
+        chunks: List[str] = []
+        offsets: List[float] = []
+        try:
+            async for chunk in self.provider.stream_chat_completion(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            ):
+                chunks.append(chunk)
+                offsets.append(time.perf_counter() - start)
+                yield chunk
+        except Exception as e:
+            self._record(messages, temperature, max_tokens, start, chunks, offsets, str(e))
+            raise
+        self._record(messages, temperature, max_tokens, start, chunks, offsets)
+
+    def validate_config(self) -> bool:
+        """
+        Validate the wrapped provider's configuration.
+
+        Returns:
+            True if configuration is valid
+
+        Raises:
+            ValueError: If configuration is invalid
+        """
+        return self.provider.validate_config()
+
+    def _record(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        start: float,
+        chunks: List[str],
+        offsets: List[float],
+        error: Optional[str] = None
+    ) -> None:
+        """Queue a finished call for appending to the cassette."""
+        # Encoded now: the caller may change the messages list after the call
+        line = self.cassette.encode({
+            "key": request_key(messages, temperature, max_tokens),
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "chunks": chunks,
+            "offsets": [round(offset, 4) for offset in offsets],
+            "latency": round(time.perf_counter() - start, 4),
+            "usage": last_usage(),
+            "error": error
+        })
+        write = asyncio.get_running_loop().run_in_executor(self.writer, self.cassette.append_line, line)
+        write.add_done_callback(self._log_write_error)
+
+    @staticmethod
+    def _log_write_error(write: asyncio.Future) -> None:
+        """Log a failed cassette write."""
+        if not write.cancelled() and write.exception() is not None:
+            logger.warning("Failed to record call to cassette", extra={"error": str(write.exception())})
@@ -0,0 +1,129 @@
+import asyncio
+from typing import List, Dict, Optional, AsyncIterator
+from providers.base_provider import BaseProvider
+from providers.cassette import Cassette, request_key
+
+
+class ReplayProvider(BaseProvider):
+    """
+    Serves calls recorded by RecordingProvider instead of calling a live API.
+
+    Requests are matched by hash, so a replay follows the recording as
+    long as the prompts built by the services are unchanged. Recorded
+    failures are raised again. With reproduce_timing, responses are
+    delayed by the recorded latency (and streamed chunks by their recorded
+    arrival times).
+    """
+
+    name = "replay"
+    supports_streaming = True
+
+    def __init__(self, cassette_path: str, reproduce_timing: bool = False, model_name: str = "replay"):
+        """
+        Initialize the replay provider.
+
+        Args:
+            cassette_path: Cassette file written by RecordingProvider
+            reproduce_timing: Delay responses by the recorded timing
+            model_name: Model name reported in logs
+        """
+        super().__init__("", model_name)
+        self.cassette = Cassette(cassette_path)
+        self.reproduce_timing = reproduce_timing
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Replay a recorded chat completion.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Recorded response text
+
+        Raises:
+            Exception: If the request was not recorded or the recorded call failed
+        """
+        entry = self._lookup(messages, temperature, max_tokens)
+        if self.reproduce_timing:
+            await asyncio.sleep(entry["latency"])
+        self._replay_outcome(entry)
+        return "".join(entry["chunks"])
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Replay a recorded chat completion as a stream of its recorded chunks.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response
+
+        Yields:
+            Recorded chunks of the response text
+
+        Raises:
+            Exception: If the request was not recorded or the recorded call failed
+        """
+        entry = self._lookup(messages, temperature, max_tokens)
+        elapsed = 0.0
+        for chunk, offset in zip(entry["chunks"], entry["offsets"]):
+            if self.reproduce_timing:
+                await asyncio.sleep(max(offset - elapsed, 0.0))
+                elapsed = offset
+            yield chunk
+        if self.reproduce_timing:
+            await asyncio.sleep(max(entry["latency"] - elapsed, 0.0))
+        self._replay_outcome(entry)
+
+    def validate_config(self) -> bool:
+        """
+        Load the cassette.
+
+        Returns:
+            True if the cassette was loaded
+
+        Raises:
+            ValueError: If the cassette file cannot be read
+        """
+        try:
+            self.cassette.load()
+        except (OSError, ValueError, KeyError) as e:
+            raise ValueError(f"Cannot load cassette {self.cassette.path}: {e}")
+        return True
+
+    def rewind(self) -> None:
+        """Reload the cassette so the recording can be replayed again from the start."""
+        self.cassette.load()
+
+    def _lookup(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> dict:
+        """Find the recorded call for a request."""
+        key = request_key(messages, temperature, max_tokens)
+        entry = self.cassette.next_entry(key)
+        if entry is None:
+            raise Exception(f"Replay error: no recorded response for request {key[:12]}")
+        return entry
+
+    def _replay_outcome(self, entry: dict) -> None:
+        """Record the call's token usage, or raise its recorded failure."""
+        if entry["error"]:
+            raise Exception(entry["error"])
+        if entry["usage"]:
+            self.record_usage(*entry["usage"])
@@ -0,0 +1,55 @@
+import json
+from typing import Any, Union
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch this either way
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object as compact UTF-8 JSON.
+    Uses orjson when installed, otherwise the stdlib json module.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode JSON text.
+    Uses orjson when installed, otherwise the stdlib json module.
+
+    Args:
+        data: JSON text as str or bytes
+
+    Returns:
+        Decoded object
+
+    Raises:
+        JSONDecodeError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the fastest available encoder."""
+
+    def render(self, content: Any) -> bytes:
+        """Render response content as JSON bytes."""
+        return dumps(content)
@@ -0,0 +1,240 @@
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional
+from forms.registry import compiled_form
+
+
+# Histogram bucket upper bounds; larger values fall into an overflow bucket
+TURN_BUCKETS = [2, 4, 6, 8, 10, 12, 15, 20, 25, 30, 40, 50, 75, 100]
+SECONDS_BUCKETS = [30, 60, 120, 180, 300, 450, 600, 900, 1200, 1800, 3600, 7200]
+
+
+class Histogram:
+    """
+    Streaming histogram with fixed buckets.
+    Observing a value and summarizing are independent of the number of observations.
+    """
+
+    def __init__(self, bounds: List[float]):
+        """
+        Initialize the histogram.
+
+        Args:
+            bounds: Sorted bucket upper bounds (inclusive)
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimate a percentile as the upper bound of the bucket holding it.
+
+        Args:
+            fraction: Percentile as a fraction (e.g. 0.9)
+
+        Returns:
+            Estimated value, or None if nothing was observed
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> Dict:
+        """Summarize the distribution."""
+        buckets = {f"<={bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": buckets
+        }
+
+
+class AnalyticsService:
+    """
+    Intake analytics maintained incrementally as sessions change.
+
+    Storage and extraction report events as they happen, so get_stats()
+    never walks the sessions. Per-session state is a few counters used to
+    detect turns and the transitions to and from a complete form.
+    """
+
+    def __init__(self):
+        """Initialize analytics counters."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        self.sessions_created = 0
+        self.sessions_completed = 0
+        self.active_sessions = 0
+        self.active_complete_sessions = 0
+        self.user_turns = 0
+        self.extractions = 0
+        self.fields_extracted = 0
+        self.turns_to_completion = Histogram(TURN_BUCKETS)
+        self.seconds_to_completion = Histogram(SECONDS_BUCKETS)
+        # session_id -> [messages seen, user turns, complete, ever completed]
+        self.session_state: Dict[str, list] = {}
+
+    def session_created(self, session_id: str) -> None:
+        """Record a new session."""
+        self.sessions_created += 1
+        self.active_sessions += 1
+        self.session_state[session_id] = [0, 0, False, False]
+
+    def session_restored(self, session: dict) -> None:
+        """
+        Track a session recovered from persistent storage.
+        Only current-state counters are restored; history-based
+        distributions start empty.
+
+        Args:
+            session: Recovered session dict
+        """
+        history = session["conversation_history"]
+        complete = compiled_form(session["form_id"]).is_complete(session["form_data"])
+        self.active_sessions += 1
+        self.active_complete_sessions += complete
+        self.session_state[session["session_id"]] = [
+            len(history),
+            sum(1 for msg in history if msg["role"] == "user"),
+            complete,
+            complete
+        ]
+
+    def session_updated(
+        self,
+        session: dict,
+        history_changed: bool,
+        form_changed: bool
+    ) -> None:
+        """
+        Record a session mutation.
+
+        New user messages are counted from where the previous update left
+        off, so each message is looked at once.
+
+        Args:
+            session: Session dict after the update
+            history_changed: Whether the conversation history was replaced
+            form_changed: Whether the form data was replaced
+        """
+        state = self.session_state.get(session["session_id"])
+        if state is None:
+            return
+
+        if history_changed:
+            history = session["conversation_history"]
+            if len(history) < state[0]:
+                # History was rewritten; recount, dropping the turns already counted
+                self.user_turns -= state[1]
+                state[0], state[1] = 0, 0
+            new_turns = sum(1 for msg in history[state[0]:] if msg["role"] == "user")
+            state[0] = len(history)
+            state[1] += new_turns
+            self.user_turns += new_turns
+
+        if form_changed:
+            complete = compiled_form(session["form_id"]).is_complete(session["form_data"])
+            if complete != state[2]:
+                # A rollback can take a complete form back to incomplete
+                state[2] = complete
+                self.active_complete_sessions += 1 if complete else -1
+            if complete and not state[3]:
+                state[3] = True
+                self.sessions_completed += 1
+                self.turns_to_completion.observe(state[1])
+                started = datetime.fromisoformat(session["created_at"])
+                finished = datetime.fromisoformat(session["last_updated"])
+                self.seconds_to_completion.observe((finished - started).total_seconds())
+
+    def session_deleted(self, session_id: str) -> None:
+        """Record a deleted session."""
+        state = self.session_state.pop(session_id, None)
+        if state is None:
+            return
+        self.active_sessions -= 1
+        self.active_complete_sessions -= state[2]
+
+    def extraction_completed(self, updated_fields: Dict) -> None:
+        """
+        Record an extraction result.
+
+        Args:
+            updated_fields: Nested updated fields returned by the extraction
+        """
+        self.extractions += 1
+        self.fields_extracted += self._count_fields(updated_fields)
+
+    @staticmethod
+    def _count_fields(fields: Dict) -> int:
+        """Count leaf fields in a nested updated-fields dict."""
+        return sum(
+            AnalyticsService._count_fields(value) if "value" not in value else 1
+            for value in fields.values()
+            if isinstance(value, dict)
+        )
+
+    def get_stats(self) -> Dict:
+        """
+        Get current analytics.
+
+        Returns:
+            Session counts, completion rate and distributions
+        """
+        return {
+            "sessions": {
+                "created": self.sessions_created,
+                "completed": self.sessions_completed,
+                "active": self.active_sessions,
+                "active_incomplete": self.active_sessions - self.active_complete_sessions,
+                "completion_rate": (
+                    round(self.sessions_completed / self.sessions_created, 4)
+                    if self.sessions_created else None
+                )
+            },
+            "turns": {
+                "user_turns": self.user_turns,
+                "extractions": self.extractions,
+                "fields_extracted": self.fields_extracted,
+                "avg_fields_per_turn": (
+                    round(self.fields_extracted / self.user_turns, 3)
+                    if self.user_turns else None
+                )
+            },
+            "turns_to_completion": self.turns_to_completion.summary(),
+            "seconds_to_completion": self.seconds_to_completion.summary()
+        }
+
+
+# Create singleton instance
+analytics_service = AnalyticsService()
+
+
+def get_analytics_service() -> AnalyticsService:
+    """Get the analytics service instance."""
+    return analytics_service
@@ -0,0 +1,279 @@
+import asyncio
+import json
+import os
+from typing import Dict, List, Optional, Set
+from services.extraction_service import get_extraction_service
+from forms.registry import compiled_form
+
+
+class BatchCheckpoint:
+    """
+    Resumable progress marker for a batch run.
+
+    Lines are dispatched in input order but may finish out of order, so the
+    checkpoint keeps a watermark (every line before it is done) plus the small
+    set of finished lines past the watermark. Its size is bounded by the
+    number of lines in flight, not by the input size.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize checkpoint.
+
+        Args:
+            path: Checkpoint file path
+        """
+        self.path = path
+        self.watermark = 0
+        self.input_offset = 0
+        self.output_offset = 0
+        self.done: Set[int] = set()
+
+    def load(self) -> bool:
+        """
+        Load checkpoint state from disk.
+
+        Returns:
+            True if a checkpoint was found, False otherwise
+        """
+        if not os.path.exists(self.path):
+            return False
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.watermark = data["watermark"]
+        self.input_offset = data["input_offset"]
+        self.output_offset = data["output_offset"]
+        self.done = set(data["done"])
+        return True
+
+    def save(self) -> None:
+        """Atomically write checkpoint state to disk."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "watermark": self.watermark,
+                "input_offset": self.input_offset,
+                "output_offset": self.output_offset,
+                "done": sorted(self.done)
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def is_done(self, line_no: int) -> bool:
+        """Check whether a line was already processed."""
+        return line_no < self.watermark or line_no in self.done
+
+    def mark_done(self, line_no: int, line_offsets: Dict[int, int], next_offset: int) -> None:
+        """
+        Record a finished line and advance the watermark.
+
+        Args:
+            line_no: Finished input line number (0-indexed)
+            line_offsets: Byte offsets of lines that are still in flight
+            next_offset: Byte offset of the next line the reader will produce
+        """
+        self.done.add(line_no)
+        while self.watermark in self.done:
+            self.done.discard(self.watermark)
+            self.watermark += 1
+        self.input_offset = line_offsets.get(self.watermark, next_offset)
+
+
+class BatchExtractionService:
+    """Service for extracting intake forms from archived transcript files."""
+
+    def __init__(self):
+        """Initialize batch extraction service."""
+        self.extraction_service = get_extraction_service()
+
+    @staticmethod
+    def parse_transcript(record: Dict) -> List[Dict]:
+        """
+        Convert a transcript record into conversation messages.
+
+        Accepts either a message list ("conversation_history" or "messages")
+        or a raw "transcript" string, as produced by phone transcription.
+
+        Args:
+            record: Parsed JSONL record
+
+        Returns:
+            Conversation messages without system messages
+
+        Raises:
+            ValueError: If the record has no transcript
+        """
+        messages = record.get("conversation_history") or record.get("messages")
+        if messages is not None:
+            return [msg for msg in messages if msg.get("role") != "system"]
+
+        transcript = record.get("transcript")
+        if transcript:
+            return [{"role": "user", "content": transcript}]
+
+        raise ValueError("Record has no conversation_history, messages or transcript")
+
+    async def _process_record(self, line_no: int, raw_line: bytes, form_id: str) -> Dict:
+        """
+        Run extraction for a single input line.
+
+        Args:
+            line_no: Input line number (0-indexed)
+            raw_line: Raw JSONL line
+            form_id: Form to extract unless the record names its own "form_id"
+
+        Returns:
+            Output record with form data, or an error description
+        """
+        record_id = None
+        try:
+            record = json.loads(raw_line)
+            record_id = record.get("id")
+            conversation_history = self.parse_transcript(record)
+            form = compiled_form(record.get("form_id") or form_id)
+            form_data = await self.extraction_service.extract_from_conversation(
+                conversation_history,
+                form=form
+            )
+            return {
+                "id": record_id,
+                "line": line_no,
+                "form_id": form.form_id,
+                "form_data": form_data.model_dump(),
+                "is_complete": form_data.is_complete()
+            }
+        except Exception as e:
+            return {"id": record_id, "line": line_no, "error": str(e)}
+
+    async def run(
+        self,
+        input_path: str,
+        output_path: str,
+        checkpoint_path: Optional[str] = None,
+        concurrency: int = 4,
+        checkpoint_every: int = 50,
+        resume: bool = True,
+        form_id: str = "demographics"
+    ) -> Dict[str, int]:
+        """
+        Stream transcripts from a JSONL file and write extracted forms as JSONL.
+
+        Input is read line by line and at most `concurrency` extractions are in
+        flight, so memory use does not depend on the input size. Results are
+        written in completion order; each output record carries its input
+        line number. On resume, the output file is truncated to the last
+        checkpointed offset so no record is written twice.
+
+        Args:
+            input_path: Path to the input JSONL file
+            output_path: Path to the output JSONL file
+            checkpoint_path: Path to the checkpoint file (defaults to output_path + ".checkpoint")
+            concurrency: Maximum number of concurrent extractions
+            checkpoint_every: Number of results between checkpoint writes
+            resume: Continue from an existing checkpoint if present
+            form_id: Form to extract for records without a "form_id"
+
+        Returns:
+            Counts of processed, failed and skipped records
+        """
+        checkpoint = BatchCheckpoint(checkpoint_path or f"{output_path}.checkpoint")
+        resuming = resume and checkpoint.load()
+
+        stats = {"processed": 0, "failed": 0, "skipped": 0}
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        line_offsets: Dict[int, int] = {}
+        reader_state = {"offset": checkpoint.input_offset}
+
+        async def read_lines() -> None:
+            with open(input_path, "rb") as f:
+                f.seek(checkpoint.input_offset)
+                line_no = checkpoint.watermark
+                while True:
+                    raw_line = f.readline()
+                    if not raw_line:
+                        break
+                    line_start = reader_state["offset"]
+                    reader_state["offset"] += len(raw_line)
+
+                    if checkpoint.is_done(line_no) or not raw_line.strip():
+                        if line_no not in checkpoint.done:
+                            # Blank lines count as done so the watermark can pass them
+                            checkpoint.mark_done(line_no, line_offsets, reader_state["offset"])
+                        stats["skipped"] += 1
+                    else:
+                        line_offsets[line_no] = line_start
+                        await queue.put((line_no, raw_line))
+                    line_no += 1
+
+            for _ in range(concurrency):
+                await queue.put(None)
+
+        async def work() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    await results.put(None)
+                    return
+                line_no, raw_line = item
+                await results.put((line_no, await self._process_record(line_no, raw_line, form_id)))
+
+        async def write_results(output_file) -> None:
+            finished_workers = 0
+            since_checkpoint = 0
+            while finished_workers < concurrency:
+                item = await results.get()
+                if item is None:
+                    finished_workers += 1
+                    continue
+
+                line_no, result = item
+                output_file.write(json.dumps(result) + "\n")
+                stats["failed" if "error" in result else "processed"] += 1
+
+                line_offsets.pop(line_no, None)
+                checkpoint.mark_done(line_no, line_offsets, reader_state["offset"])
+
+                since_checkpoint += 1
+                if since_checkpoint >= checkpoint_every:
+                    self._write_checkpoint(checkpoint, output_file)
+                    since_checkpoint = 0
+
+            self._write_checkpoint(checkpoint, output_file)
+
+        mode = "r+" if resuming and os.path.exists(output_path) else "w"
+        with open(output_path, mode, encoding="utf-8") as output_file:
+            if mode == "r+":
+                # Drop results written after the last checkpoint
+                output_file.seek(checkpoint.output_offset)
+                output_file.truncate()
+            else:
+                checkpoint.output_offset = 0
+
+            await asyncio.gather(
+                read_lines(),
+                write_results(output_file),
+                *(work() for _ in range(concurrency))
+            )
+
+        return stats
+
+    @staticmethod
+    def _write_checkpoint(checkpoint: BatchCheckpoint, output_file) -> None:
+        """Flush output and persist the checkpoint that covers it."""
+        output_file.flush()
+        os.fsync(output_file.fileno())
+        checkpoint.output_offset = output_file.tell()
+        checkpoint.save()
+
+
+# Create singleton instance
+batch_extraction_service = BatchExtractionService()
+
+
+def get_batch_extraction_service() -> BatchExtractionService:
+    """Get the batch extraction service instance."""
+    return batch_extraction_service
@@ -0,0 +1,114 @@
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit is open."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for LLM provider calls.
+
+    Opens after `failure_threshold` consecutive failures or
+    `slow_call_threshold` consecutive calls slower than `slow_call_seconds`.
+    While open, calls fail immediately with CircuitOpenError. After
+    `reset_seconds` a single probe call is let through (half-open); its
+    outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        slow_call_seconds: float,
+        slow_call_threshold: int,
+        reset_seconds: float
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            slow_call_seconds: Latency above which a successful call counts as slow
+            slow_call_threshold: Consecutive slow calls that open the circuit
+            reset_seconds: Time the circuit stays open before a probe call
+        """
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_seconds = reset_seconds
+
+        self.state = CLOSED
+        self.failures = 0
+        self.slow_calls = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at < self.reset_seconds
+        return self.state == HALF_OPEN and self.probe_in_flight
+
+    def before_call(self) -> None:
+        """
+        Check that a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is in flight
+        """
+        if self.state == CLOSED:
+            return
+        if self.is_open:
+            raise CircuitOpenError("LLM provider circuit is open")
+        # Reset timeout elapsed: let this call through as the probe
+        self.state = HALF_OPEN
+        self.probe_in_flight = True
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a successful call.
+
+        Args:
+            latency: Call duration in seconds
+        """
+        self.failures = 0
+        if latency > self.slow_call_seconds:
+            self.slow_calls += 1
+            if self.state == HALF_OPEN or self.slow_calls >= self.slow_call_threshold:
+                self._open(f"{self.slow_calls} slow calls")
+                return
+        else:
+            self.slow_calls = 0
+
+        if self.state != CLOSED:
+            logger.info("LLM circuit closed")
+        self.state = CLOSED
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._open(f"{self.failures} consecutive failures")
+
+    def record_cancelled(self) -> None:
+        """Record a call abandoned by its caller; a probe may be retried."""
+        self.probe_in_flight = False
+
+    def _open(self, reason: str) -> None:
+        """Open the circuit."""
+        if self.state != OPEN:
+            logger.warning("LLM circuit opened", extra={"error": reason})
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.probe_in_flight = False
@@ -1,7 +1,23 @@
-from typing import List, Dict, Tuple
+import asyncio
+from typing import List, Dict, Tuple, Optional, AsyncIterator
 from services.llm_service import get_llm_service
-from prompts.system_prompt import get_system_prompt
+from services.extraction_scheduler import get_extraction_scheduler
+from services.response_planner import get_response_planner
+from services.extraction_service import get_extraction_service
+from services.circuit_breaker import CircuitOpenError
+from deadlines import DeadlineExceededError
+from services.local_extraction import extract_locally
+from forms.compiler import CompiledForm
+from forms.registry import compiled_form
 from storage import in_memory_store
+from logging_config import bind_log_context
+from config import settings
+
+
+# Degraded-mode replies, used while the LLM provider circuit is open
+DEGRADED_NOTICE = "I'm having a little trouble on my end, so let's keep things simple for a moment."
+DEGRADED_ACKNOWLEDGEMENT = "Thanks."
+DEGRADED_RETRY = "Sorry, I didn't quite catch that."
 
 
 class ConversationService:
@@ -10,11 +26,18 @@ class ConversationService:
     def __init__(self):
         """Initialize conversation service."""
         self.llm_service = get_llm_service()
-        self.system_prompt = get_system_prompt()
+        self.extraction_scheduler = get_extraction_scheduler()
+        self.response_planner = get_response_planner()
+        self.extraction_service = get_extraction_service()
+        # Field each session was last asked for in degraded mode
+        self.degraded_questions: Dict[str, str] = {}
+        # Times each field was asked per session in degraded mode, to rotate phrasings
+        self.degraded_asks: Dict[str, Dict[str, int]] = {}
+        self.hybrid_mode = settings.HYBRID_RESPONDER_ENABLED
 
     async def start_conversation(self, session_id: str) -> str:
         """
-        Start a new conversation with an initial greeting.
+        Start a new conversation with the session form's greeting.
 
         Args:
             session_id: The session ID
@@ -22,11 +45,12 @@ class ConversationService:
         Returns:
             Initial greeting message
         """
-        initial_message = "Hi! I'm here to help you get checked in today. To get started, could you tell me your name?"
+        form = compiled_form(in_memory_store.get_session(session_id)["form_id"])
+        initial_message = form.schema.greeting
 
         # Add system message and initial assistant message to conversation history
         conversation_history = [
-            {"role": "system", "content": self.system_prompt},
+            {"role": "system", "content": form.system_prompt},
             {"role": "assistant", "content": initial_message}
         ]
 
@@ -37,61 +61,440 @@ class ConversationService:
 
         return initial_message
 
-    async def process_user_message(
+    async def process_turn(
         self,
         session_id: str,
         user_message: str
-    ) -> Tuple[str, List[Dict]]:
+    ) -> Tuple[str, Dict]:
         """
-        Process a user message and generate AI response.
+        Run a full turn: generate the AI response and extract form data
+        when the extraction scheduler's policy says so.
+
+        In hybrid mode, extraction runs first and routine turns are answered
+        by the response planner; the LLM is only called for free-form,
+        ambiguous or correction turns. While the LLM provider circuit is
+        open, turns run in degraded mode (see _degraded_turn).
 
         Args:
             session_id: The session ID
             user_message: The user's message
 
         Returns:
-            Tuple of (assistant_response, updated_conversation_history)
+            Tuple of (assistant_response, updated_fields)
 
         Raises:
             ValueError: If session not found
             Exception: If LLM call fails
         """
-        # Get current session
+        self._bind_turn(session_id)
+        if self.llm_service.breaker.is_open:
+            return await self._degraded_turn(session_id, user_message)
+        self.degraded_questions.pop(session_id, None)
+        self.degraded_asks.pop(session_id, None)
+
+        try:
+            if self.hybrid_mode:
+                planned_response, updated_fields, conversation_history = await self._plan_turn(
+                    session_id, user_message
+                )
+                if planned_response is not None:
+                    self._store_turn(session_id, conversation_history, planned_response)
+                    return planned_response, updated_fields
+
+                assistant_response = await self._generate_reply(session_id, conversation_history)
+                return assistant_response, updated_fields
+
+            assistant_response, _ = await self.process_user_message(session_id, user_message)
+            updated_fields = await self.extraction_scheduler.on_turn(session_id, assistant_response)
+            return assistant_response, updated_fields
+        except CircuitOpenError:
+            # Another request is probing the provider
+            return await self._degraded_turn(session_id, user_message)
+
+    async def stream_turn(
+        self,
+        session_id: str,
+        user_message: str
+    ) -> AsyncIterator[Dict]:
+        """
+        Run a full turn, streaming events as they become available.
+
+        Yields "token" events while the response is generated, an
+        "assistant_message" event with the full response, "form_field"
+        events as fields are extracted (with EXTRACTION_STREAMING), and a
+        "form_update" event once extraction finishes (empty if the scheduler
+        deferred extraction). While the LLM provider circuit is open, turns
+        run in degraded mode (see _degraded_turn).
+
+        Args:
+            session_id: The session ID
+            user_message: The user's message
+
+        Yields:
+            Event dicts with a "type" key
+
+        Raises:
+            ValueError: If session not found
+            Exception: If LLM call fails
+        """
+        self._bind_turn(session_id)
+        if self.llm_service.breaker.is_open:
+            async for event in self._stream_degraded_turn(session_id, user_message):
+                yield event
+            return
+        self.degraded_questions.pop(session_id, None)
+        self.degraded_asks.pop(session_id, None)
+
+        try:
+            if self.hybrid_mode:
+                planned_response, updated_fields, conversation_history = await self._plan_turn(
+                    session_id, user_message
+                )
+                if planned_response is not None:
+                    self._store_turn(session_id, conversation_history, planned_response)
+                    yield {"type": "token", "content": planned_response}
+                    yield {"type": "assistant_message", "content": planned_response}
+                    yield {"type": "form_update", "updated_fields": updated_fields}
+                    return
+
+                # Form fields are already known, push them before the LLM reply
+                yield {"type": "form_update", "updated_fields": updated_fields}
+                chunks = []
+                async for chunk in self._stream_reply(session_id, conversation_history):
+                    chunks.append(chunk)
+                    yield {"type": "token", "content": chunk}
+                yield {"type": "assistant_message", "content": "".join(chunks)}
+                return
+
+            chunks = []
+            async for chunk in self.stream_user_message(session_id, user_message):
+                chunks.append(chunk)
+                yield {"type": "token", "content": chunk}
+            assistant_response = "".join(chunks)
+            yield {"type": "assistant_message", "content": assistant_response}
+
+            async for event in self._stream_extraction(session_id, assistant_response):
+                yield event
+        except CircuitOpenError:
+            # Raised before the first chunk, while another request probes the provider
+            async for event in self._stream_degraded_turn(session_id, user_message):
+                yield event
+
+    async def _stream_extraction(self, session_id: str, assistant_response: str) -> AsyncIterator[Dict]:
+        """
+        Run the turn's extraction, yielding a "form_field" event for each
+        field as soon as it is extracted (with EXTRACTION_STREAMING), then
+        the "form_update" event.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+
+        def on_field(path: str, field: Dict) -> None:
+            events.put_nowait({"type": "form_field", "path": path, "field": field})
+
+        extraction = asyncio.ensure_future(
+            self.extraction_scheduler.on_turn(session_id, assistant_response, on_field)
+        )
+        extraction.add_done_callback(lambda _: events.put_nowait(None))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # The consumer went away mid-extraction
+            if not extraction.done():
+                extraction.cancel()
+
+        yield {"type": "form_update", "updated_fields": extraction.result()}
+
+    async def _degraded_turn(
+        self,
+        session_id: str,
+        user_message: str
+    ) -> Tuple[str, Dict]:
+        """
+        Run a turn without the LLM while the provider circuit is open.
+
+        Structured fields are extracted locally from the message, and the
+        reply asks for the next missing field with a templated question. The
+        turn stays pending with the extraction scheduler, so the LLM
+        re-extracts the full conversation once the provider recovers.
+
+        Args:
+            session_id: The session ID
+            user_message: The user's message
+
+        Returns:
+            Tuple of (assistant_response, updated_fields)
+
+        Raises:
+            ValueError: If session not found
+        """
         session = in_memory_store.get_session(session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
 
-        conversation_history = session["conversation_history"]
+        conversation_history = session["conversation_history"] + [{
+            "role": "user",
+            "content": user_message
+        }]
+
+        form = compiled_form(session["form_id"])
+        turn = sum(1 for msg in conversation_history if msg["role"] != "system")
+        asked_field = self.degraded_questions.pop(session_id, None)
+
+        extracted = extract_locally(form, session["form_data"], user_message, asked_field, turn)
+        updated_fields = self.extraction_service.apply_extracted_data(session_id, extracted) if extracted else {}
+        self.extraction_scheduler.mark_turn(session_id)
+
+        missing = form.missing_fields(in_memory_store.get_session(session_id)["form_data"])
+        if not missing:
+            assistant_response = form.schema.completion_message
+        else:
+            self.degraded_questions[session_id] = missing[0]
+            asks = self.degraded_asks.setdefault(session_id, {})
+            asked = asks.get(missing[0], 0)
+            asks[missing[0]] = asked + 1
+            if asked_field is None:
+                opener = DEGRADED_NOTICE
+            elif updated_fields:
+                opener = DEGRADED_ACKNOWLEDGEMENT
+            else:
+                opener = DEGRADED_RETRY
+            assistant_response = f"{opener} {self._degraded_question(form, missing[0], asked)}"
+
+        self._store_turn(session_id, conversation_history, assistant_response)
+        return assistant_response, updated_fields
+
+    async def _stream_degraded_turn(
+        self,
+        session_id: str,
+        user_message: str
+    ) -> AsyncIterator[Dict]:
+        """Run a degraded turn, yielding the same events as stream_turn."""
+        assistant_response, updated_fields = await self._degraded_turn(session_id, user_message)
+        yield {"type": "token", "content": assistant_response}
+        yield {"type": "assistant_message", "content": assistant_response}
+        yield {"type": "form_update", "updated_fields": updated_fields}
+
+    @staticmethod
+    def _degraded_question(form: CompiledForm, path: str, asked: int) -> str:
+        """
+        Ask for a single field, so the answer can be taken as its value.
+        Each re-ask of the field uses its next phrasing.
+        """
+        questions = form.questions.get(path)
+        if questions:
+            return questions[asked % len(questions)]
+        return f"Could you share your {form.fields[path].label.lower()}?"
+
+    @staticmethod
+    def _bind_turn(session_id: str) -> None:
+        """Attach the turn number of the incoming user message to log records."""
+        session = in_memory_store.get_session(session_id)
+        if session:
+            # The incoming message is the next user turn (1-indexed)
+            turn = sum(1 for msg in session["conversation_history"] if msg["role"] == "user") + 1
+            bind_log_context(session_id=session_id, turn=turn)
+
+    async def _plan_turn(
+        self,
+        session_id: str,
+        user_message: str
+    ) -> Tuple[Optional[str], Dict, List[Dict]]:
+        """
+        Extract form data from the conversation with the user message and
+        try to plan a reply. The user message is not stored yet; it is
+        stored together with the reply (see _store_turn).
+
+        Args:
+            session_id: The session ID
+            user_message: The user's message
+
+        Returns:
+            Tuple of (planned_response or None, updated_fields,
+            conversation history with the user message)
+
+        Raises:
+            ValueError: If session not found
+        """
+        session = in_memory_store.get_session(session_id)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
 
-        # Add user message to history
-        conversation_history.append({
+        conversation_history = session["conversation_history"] + [{
             "role": "user",
             "content": user_message
-        })
+        }]
 
-        # Generate AI response
+        # The planner needs the latest form, so hybrid turns always extract
+        previous_data = session["form_data"]
+        self.extraction_scheduler.mark_turn(session_id)
+        updated_fields = await self.extraction_scheduler.flush(session_id, conversation_history=conversation_history)
+
+        session = in_memory_store.get_session(session_id)
+        new_data = session["form_data"]
+
+        planned_response = self.response_planner.plan_reply(
+            compiled_form(session["form_id"]),
+            user_message,
+            previous_data,
+            new_data,
+            updated_fields,
+            # Count user turns: the history grows by two messages per turn
+            turn=sum(1 for msg in conversation_history if msg["role"] == "user")
+        )
+        return planned_response, updated_fields, conversation_history
+
+    async def _generate_reply(self, session_id: str, conversation_history: List[Dict]) -> str:
+        """Generate an LLM reply to a turn's history and store the turn."""
         try:
             assistant_response = await self.llm_service.generate_response(
                 messages=conversation_history,
                 temperature=0.7
             )
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate response: {str(e)}")
 
-        # Add assistant response to history
-        conversation_history.append({
-            "role": "assistant",
-            "content": assistant_response
-        })
+        self._store_turn(session_id, conversation_history, assistant_response)
+        return assistant_response
+
+    async def _stream_reply(self, session_id: str, conversation_history: List[Dict]) -> AsyncIterator[str]:
+        """Stream an LLM reply to a turn's history and store the turn."""
+        chunks = []
+        try:
+            async for chunk in self.llm_service.stream_response(
+                messages=conversation_history,
+                temperature=0.7
+            ):
+                chunks.append(chunk)
+                yield chunk
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate response: {str(e)}")
+
+        self._store_turn(session_id, conversation_history, "".join(chunks))
 
-        # Update session
+    @staticmethod
+    def _store_turn(session_id: str, conversation_history: List[Dict], content: str) -> List[Dict]:
+        """
+        Store a turn: its history (ending with the user message) plus the
+        assistant's reply, in a single update. Nothing is stored before the
+        reply exists, so a turn that fails or is cancelled leaves the
+        session as it was.
+
+        Returns:
+            The stored conversation history
+        """
+        conversation_history = conversation_history + [{
+            "role": "assistant",
+            "content": content
+        }]
         in_memory_store.update_session(
             session_id,
             conversation_history=conversation_history
         )
+        return conversation_history
+
+    async def process_user_message(
+        self,
+        session_id: str,
+        user_message: str
+    ) -> Tuple[str, List[Dict]]:
+        """
+        Process a user message and generate AI response.
+
+        The user message and the response are stored together once the
+        response is generated.
+
+        Args:
+            session_id: The session ID
+            user_message: The user's message
+
+        Returns:
+            Tuple of (assistant_response, updated_conversation_history)
+
+        Raises:
+            ValueError: If session not found
+            Exception: If LLM call fails
+        """
+        # Get current session
+        session = in_memory_store.get_session(session_id)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+
+        # Add user message to a copy of the history
+        conversation_history = session["conversation_history"] + [{
+            "role": "user",
+            "content": user_message
+        }]
+
+        # Generate AI response
+        try:
+            assistant_response = await self.llm_service.generate_response(
+                messages=conversation_history,
+                temperature=0.7
+            )
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate response: {str(e)}")
+
+        # Store the turn
+        conversation_history = self._store_turn(session_id, conversation_history, assistant_response)
 
         return assistant_response, conversation_history
 
+    async def stream_user_message(
+        self,
+        session_id: str,
+        user_message: str
+    ) -> AsyncIterator[str]:
+        """
+        Process a user message and stream the AI response as it is generated.
+        The user message and the complete response are added to the
+        conversation history once the stream finishes.
+
+        Args:
+            session_id: The session ID
+            user_message: The user's message
+
+        Yields:
+            Chunks of the assistant response
+
+        Raises:
+            ValueError: If session not found
+            Exception: If LLM call fails
+        """
+        session = in_memory_store.get_session(session_id)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+
+        conversation_history = session["conversation_history"] + [{
+            "role": "user",
+            "content": user_message
+        }]
+
+        # Stream AI response, collecting chunks for the history
+        chunks = []
+        try:
+            async for chunk in self.llm_service.stream_response(
+                messages=conversation_history,
+                temperature=0.7
+            ):
+                chunks.append(chunk)
+                yield chunk
+        except (CircuitOpenError, DeadlineExceededError):
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate response: {str(e)}")
+
+        self._store_turn(session_id, conversation_history, "".join(chunks))
+
     def get_conversation_for_extraction(self, session_id: str) -> List[Dict]:
         """
         Get conversation history for extraction (without system message).
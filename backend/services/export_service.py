@@ -0,0 +1,245 @@
+import asyncio
+import csv
+import io
+from typing import AsyncIterator, Dict, List, Optional
+from forms.registry import compiled_form
+from serialization import dumps
+from storage import in_memory_store
+from storage.session_journal import flatten_form
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet"
+}
+# Sessions read per index page; each page becomes one output chunk
+# (and one Parquet row group)
+EXPORT_PAGE_SIZE = 500
+METADATA_COLUMNS = ["session_id", "form_id", "created_at", "last_updated"]
+
+
+def form_values(form_data: Dict) -> Dict:
+    """
+    Strip confidence and turn from form data, keeping the nested shape.
+
+    Args:
+        form_data: Form data dict
+
+    Returns:
+        Field values keyed like the form model
+    """
+    return {
+        name: form_values(item) if isinstance(item, dict) and "value" not in item else item["value"]
+        for name, item in form_data.items()
+    }
+
+
+class _ChunkSink:
+    """Write-only file object collecting output until it is drained."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class ExportService:
+    """
+    Streams completed intakes out of the session store.
+
+    Sessions are walked page by page through the created_at index, and
+    each page is encoded and handed to the caller before the next one is
+    read, so memory use does not grow with the number of sessions and the
+    first chunk is ready after one page.
+    """
+
+    def check_format(self, fmt: str, form_id: Optional[str]) -> None:
+        """
+        Check that an export can be produced.
+
+        Args:
+            fmt: "ndjson", "csv" or "parquet"
+            form_id: Form to export (required for the tabular formats)
+
+        Raises:
+            ValueError: If the format or form is unknown, a tabular format
+                has no form, or pyarrow is missing for Parquet
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}. Supported formats: {', '.join(EXPORT_FORMATS)}")
+        if fmt != "ndjson" and form_id is None:
+            raise ValueError(f"form_id is required for {fmt} exports (columns are the form's fields)")
+        if form_id is not None:
+            compiled_form(form_id)
+        if fmt == "parquet" and pyarrow is None:
+            raise ValueError("Parquet export requires the pyarrow package")
+
+    async def iter_pages(
+        self,
+        form_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Walk completed sessions in creation order, a page at a time.
+
+        Args:
+            form_id: Only sessions filling in this form
+            since: Inclusive lower bound on created_at
+            until: Inclusive upper bound on created_at
+
+        Yields:
+            Lists of session summaries with their form_data added
+        """
+        position = None
+        while True:
+            page, position = in_memory_store.list_sessions(
+                sort="created_at",
+                descending=False,
+                after=position,
+                limit=EXPORT_PAGE_SIZE,
+                status="complete",
+                form_id=form_id,
+                since=since,
+                until=until
+            )
+            records = []
+            for summary in page:
+                summary["form_data"] = in_memory_store.get_form_data(summary["session_id"])
+                records.append(summary)
+            if records:
+                yield records
+            if position is None:
+                return
+            # The next page resumes after the last session's index position,
+            # so sessions created or updated meanwhile do not break the walk
+            await asyncio.sleep(0)
+
+    async def stream(
+        self,
+        fmt: str,
+        form_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream completed intakes in an export format.
+
+        Args:
+            fmt: "ndjson", "csv" or "parquet" (call check_format first)
+            form_id: Only sessions filling in this form (all forms for NDJSON if None)
+            since: Inclusive lower bound on created_at
+            until: Inclusive upper bound on created_at
+
+        Yields:
+            Encoded output chunks
+        """
+        pages = self.iter_pages(form_id, since, until)
+        if fmt == "ndjson":
+            encode = self._stream_ndjson
+        elif fmt == "csv":
+            encode = self._stream_csv
+        else:
+            encode = self._stream_parquet
+        async for chunk in encode(pages, form_id):
+            yield chunk
+
+    @staticmethod
+    async def _stream_ndjson(pages: AsyncIterator[List[dict]], form_id: Optional[str]) -> AsyncIterator[bytes]:
+        """One JSON object per completed intake, with nested field values."""
+        async for page in pages:
+            yield b"".join(
+                dumps({
+                    **{column: record[column] for column in METADATA_COLUMNS},
+                    "form_data": form_values(record["form_data"])
+                }) + b"\n"
+                for record in page
+            )
+
+    @staticmethod
+    async def _stream_csv(pages: AsyncIterator[List[dict]], form_id: str) -> AsyncIterator[bytes]:
+        """One row per completed intake, one column per dotted field path."""
+        paths = compiled_form(form_id).paths
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(METADATA_COLUMNS + paths)
+        yield buffer.getvalue().encode("utf-8")
+
+        async for page in pages:
+            buffer.seek(0)
+            buffer.truncate()
+            for record in page:
+                fields = flatten_form(record["form_data"])
+                writer.writerow(
+                    [record[column] for column in METADATA_COLUMNS]
+                    + [_csv_value(fields.get(path, {}).get("value")) for path in paths]
+                )
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    async def _stream_parquet(pages: AsyncIterator[List[dict]], form_id: str) -> AsyncIterator[bytes]:
+        """One row group per page; field values are string columns."""
+        paths = compiled_form(form_id).paths
+        schema = pyarrow.schema([(column, pyarrow.string()) for column in METADATA_COLUMNS + paths])
+        sink = _ChunkSink()
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+
+        async for page in pages:
+            columns = {column: [record[column] for record in page] for column in METADATA_COLUMNS}
+            flat = [flatten_form(record["form_data"]) for record in page]
+            for path in paths:
+                columns[path] = [_text_value(fields.get(path, {}).get("value")) for fields in flat]
+            writer.write_table(pyarrow.table(columns, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+        # The footer (schema and row group index) is written on close
+        writer.close()
+        yield sink.drain()
+
+
+def _csv_value(value) -> str:
+    """Render a field value as a CSV cell (empty for missing values)."""
+    return "" if value is None else _text_value(value)
+
+
+def _text_value(value) -> Optional[str]:
+    """Render a field value as text, JSON-encoding lists and dicts."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (list, dict)):
+        return dumps(value).decode("utf-8")
+    return str(value)
+
+
+# Create singleton instance
+export_service = ExportService()
+
+
+def get_export_service() -> ExportService:
+    """Get the export service instance."""
+    return export_service
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Tuple
+from forms.compiler import CompiledForm
+from prompts.extraction_prompt import get_batch_extraction_prompt, get_extraction_prompt
+from deadlines import DeadlineExceededError, remaining, start_deadline
+from logging_config import log_context
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionBatcher:
+    """
+    Combines concurrent extraction jobs into multi-conversation LLM calls.
+
+    Jobs for the same form arriving within `window_seconds` of the first
+    are sent as one request, so the form's extraction instructions are
+    sent once per batch instead of once per session. A batch is sent early
+    once it reaches `max_batch_size`. The response is split back per job;
+    any job whose entry is missing or malformed, and every job of a
+    failed batch, falls back to its own single extraction call.
+    """
+
+    def __init__(
+        self,
+        llm_service,
+        parse_response: Callable[[str], Dict],
+        window_seconds: float,
+        max_batch_size: int
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            llm_service: LLM service making the extraction calls
+            parse_response: Parses a JSON object out of an LLM response
+            window_seconds: Time a batch stays open after its first job
+            max_batch_size: Jobs per batch
+        """
+        self.llm_service = llm_service
+        self.parse_response = parse_response
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        # form_id -> (form, open batch of (conversation, future) jobs, window timer)
+        self.open_batches: Dict[str, Tuple[CompiledForm, List[Tuple[list, asyncio.Future]], asyncio.TimerHandle]] = {}
+
+    async def extract(self, form: CompiledForm, conversation_history: List[Dict]) -> Dict:
+        """
+        Extract data from one conversation as part of a batch.
+
+        Args:
+            form: Compiled form to extract
+            conversation_history: Conversation messages (without system prompt)
+
+        Returns:
+            Extracted data dict (not yet merged into the form)
+
+        Raises:
+            DeadlineExceededError: If the request deadline passes first
+            Exception: If the extraction fails
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Callers that gave up on their deadline no longer await the result
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+        batch = self.open_batches.get(form.form_id)
+        if batch is None:
+            timer = loop.call_later(self.window_seconds, self._close_batch, form.form_id)
+            batch = (form, [], timer)
+            self.open_batches[form.form_id] = batch
+        batch[1].append((conversation_history, future))
+        if len(batch[1]) >= self.max_batch_size:
+            self._close_batch(form.form_id)
+
+        # The batch serves several requests, so each waits under its own deadline
+        left = remaining()
+        if left is None:
+            return await asyncio.shield(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=max(left, 0))
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("Request deadline exceeded")
+
+    def _close_batch(self, form_id: str) -> None:
+        """Stop collecting jobs for a form and send the batch."""
+        form, jobs, timer = self.open_batches.pop(form_id)
+        timer.cancel()
+        asyncio.ensure_future(self._run_batch(form, jobs))
+
+    async def _run_batch(self, form: CompiledForm, jobs: List[Tuple[list, asyncio.Future]]) -> None:
+        """Send a batch and resolve its jobs' futures."""
+        # Not tied to the request or session of whichever job opened the batch
+        start_deadline(None)
+        log_context.set({})
+
+        if len(jobs) == 1:
+            conversation_history, future = jobs[0]
+            await self._run_single(form, conversation_history, future)
+            return
+
+        try:
+            results = await self._extract_batch(form, [history for history, _ in jobs])
+            if isinstance(results, list):
+                results = {str(number): result for number, result in enumerate(results, 1)}
+        except Exception as e:
+            logger.warning("Batched extraction failed, extracting individually", extra={
+                "batch_size": len(jobs),
+                "error": str(e)
+            })
+            results = {}
+
+        fallbacks = []
+        for number, (conversation_history, future) in enumerate(jobs, 1):
+            result = results.get(str(number))
+            if isinstance(result, dict):
+                if not future.done():
+                    future.set_result(result)
+            else:
+                fallbacks.append(self._run_single(form, conversation_history, future))
+
+        if fallbacks:
+            logger.debug("Extraction batch fallbacks", extra={
+                "batch_size": len(jobs),
+                "fallbacks": len(fallbacks)
+            })
+            await asyncio.gather(*fallbacks)
+
+    async def _extract_batch(self, form: CompiledForm, conversations: List[list]) -> Dict:
+        """Run one multi-conversation extraction call; the token budget scales with the batch."""
+        budget = self.llm_service.extraction_max_tokens
+        response = await self.llm_service.extract_structured_data(
+            [{"role": "user", "content": get_batch_extraction_prompt(conversations, form.extraction_prompt)}],
+            max_tokens=budget * len(conversations) if budget else None
+        )
+        return self.parse_response(response)
+
+    async def _run_single(self, form: CompiledForm, conversation_history: list, future: asyncio.Future) -> None:
+        """Extract one conversation on its own and resolve its future."""
+        try:
+            response = await self.llm_service.extract_structured_data([
+                {"role": "user", "content": get_extraction_prompt(conversation_history, form.extraction_prompt)}
+            ])
+            result = self.parse_response(response)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
@@ -0,0 +1,384 @@
+import asyncio
+import logging
+import re
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+from services.extraction_service import get_extraction_service
+from forms.registry import compiled_form
+from storage import in_memory_store
+from config import settings
+from deadlines import start_deadline
+
+
+logger = logging.getLogger(__name__)
+
+
+# Assistant replies that signal the intake is finished
+COMPLETION_CUE_PATTERN = re.compile(
+    r"(all (of )?(your|the) information|"
+    r"(intake|form|check-in) is (now )?complete|"
+    r"you'?re all (set|checked in)|"
+    r"that'?s everything)",
+    re.IGNORECASE
+)
+
+
+class ExtractionPolicy:
+    """Decides when extraction runs after a turn. Default behavior is eager."""
+
+    name = "eager"
+
+    def should_extract(self, pending_turns: int, assistant_message: str) -> bool:
+        """
+        Check whether extraction should run right after this turn.
+
+        Args:
+            pending_turns: Turns since the last extraction, including this one
+            assistant_message: The assistant's reply for this turn
+
+        Returns:
+            True to extract now
+        """
+        return True
+
+    def idle_delay(self) -> Optional[float]:
+        """
+        Get the idle delay after which deferred turns are extracted.
+
+        Returns:
+            Delay in seconds, or None to never extract in the background
+        """
+        return None
+
+
+class EveryNTurnsPolicy(ExtractionPolicy):
+    """Extract once every N turns."""
+
+    name = "every_n_turns"
+
+    def __init__(self, turns: int):
+        """
+        Initialize policy.
+
+        Args:
+            turns: Number of turns between extractions
+        """
+        self.turns = max(1, turns)
+
+    def should_extract(self, pending_turns: int, assistant_message: str) -> bool:
+        """Extract when N turns have accumulated."""
+        return pending_turns >= self.turns
+
+
+class IdleDebouncePolicy(ExtractionPolicy):
+    """Extract in the background once the user pauses."""
+
+    name = "idle_debounce"
+
+    def __init__(self, seconds: float):
+        """
+        Initialize policy.
+
+        Args:
+            seconds: Idle time after the last turn before extracting
+        """
+        self.seconds = seconds
+
+    def should_extract(self, pending_turns: int, assistant_message: str) -> bool:
+        """Never extract inline; wait for the idle timer."""
+        return False
+
+    def idle_delay(self) -> Optional[float]:
+        """Get the debounce delay."""
+        return self.seconds
+
+
+class OnCompletionCheckPolicy(ExtractionPolicy):
+    """Extract only when the conversation looks finished or the state is read."""
+
+    name = "on_completion"
+
+    def should_extract(self, pending_turns: int, assistant_message: str) -> bool:
+        """Defer extraction; completion cues are handled by the scheduler."""
+        return False
+
+
+def create_policy(name: str) -> ExtractionPolicy:
+    """
+    Create an extraction policy from its configured name.
+
+    Args:
+        name: Policy name
+
+    Returns:
+        Extraction policy instance
+
+    Raises:
+        ValueError: If the policy name is invalid
+    """
+    name = name.lower()
+    if name == "eager":
+        return ExtractionPolicy()
+    elif name == "every_n_turns":
+        return EveryNTurnsPolicy(settings.EXTRACTION_EVERY_N_TURNS)
+    elif name == "idle_debounce":
+        return IdleDebouncePolicy(settings.EXTRACTION_IDLE_SECONDS)
+    elif name == "on_completion":
+        return OnCompletionCheckPolicy()
+    else:
+        raise ValueError(
+            f"Invalid EXTRACTION_POLICY: {name}. "
+            f"Supported policies: eager, every_n_turns, idle_debounce, on_completion"
+        )
+
+
+def merge_updates(first: Dict, second: Dict, groups: Collection[str]) -> Dict:
+    """
+    Merge two updated-field dicts, with the second taking precedence.
+
+    Args:
+        first: Earlier updates
+        second: Later updates
+        groups: Field group names of the form (see CompiledForm.groups),
+            whose updates are merged field by field
+
+    Returns:
+        Combined updates
+    """
+    merged = dict(first)
+    for field_name, value in second.items():
+        if field_name in groups and isinstance(merged.get(field_name), dict):
+            merged[field_name] = {**merged[field_name], **value}
+        else:
+            merged[field_name] = value
+    return merged
+
+
+class ExtractionScheduler:
+    """
+    Schedules form extraction according to a pluggable policy.
+
+    Turns that are not extracted right away are counted as pending. A
+    session is never reported complete while it has pending turns, and an
+    assistant reply that signals completion always triggers extraction,
+    so the final form is extracted before the intake is reported complete.
+    """
+
+    def __init__(self, policy: ExtractionPolicy):
+        """
+        Initialize extraction scheduler.
+
+        Args:
+            policy: Extraction policy
+        """
+        self.extraction_service = get_extraction_service()
+        self.policy = policy
+        self.pending: Dict[str, int] = {}
+        self.unreported: Dict[str, Dict] = {}
+        self.timers: Dict[str, asyncio.Task] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.listeners: Dict[str, List[Callable]] = {}
+
+    def mark_turn(self, session_id: str) -> int:
+        """
+        Record a new turn and cancel any pending idle timer.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            Turns since the last extraction
+        """
+        timer = self.timers.pop(session_id, None)
+        if timer is not None:
+            timer.cancel()
+        self.pending[session_id] = self.pending.get(session_id, 0) + 1
+        return self.pending[session_id]
+
+    async def on_turn(
+        self,
+        session_id: str,
+        assistant_message: str,
+        on_field: Optional[Callable[[str, Dict], None]] = None
+    ) -> Dict:
+        """
+        Handle a completed turn, extracting now or deferring per policy.
+
+        Args:
+            session_id: The session ID
+            assistant_message: The assistant's reply for this turn
+            on_field: Called with each field as soon as it is extracted
+                (see ExtractionService.extract_form_data)
+
+        Returns:
+            Updated fields, including any background updates not yet reported
+        """
+        pending_turns = self.mark_turn(session_id)
+
+        if (self.policy.should_extract(pending_turns, assistant_message)
+                or COMPLETION_CUE_PATTERN.search(assistant_message)):
+            return await self.flush(session_id, on_field)
+
+        logger.debug("Extraction deferred (%d pending turns)", pending_turns, extra={"session_id": session_id})
+
+        delay = self.policy.idle_delay()
+        if delay is not None:
+            self.timers[session_id] = asyncio.create_task(self._extract_when_idle(session_id, delay))
+
+        return self.unreported.pop(session_id, {})
+
+    async def flush(
+        self,
+        session_id: str,
+        on_field: Optional[Callable[[str, Dict], None]] = None,
+        conversation_history: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Extract pending turns now.
+
+        Args:
+            session_id: The session ID
+            on_field: Called with each field as soon as it is extracted
+            conversation_history: History to extract from instead of the
+                stored one, for a turn that is not stored yet
+
+        Returns:
+            Updated fields, including any background updates not yet reported
+        """
+        lock = self.locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            updated_fields = await self._extract(session_id, on_field, conversation_history)
+        return merge_updates(
+            self.unreported.pop(session_id, {}),
+            updated_fields,
+            self._form_groups(session_id)
+        )
+
+    async def check_complete(self, session_id: str) -> Tuple[bool, Dict]:
+        """
+        Check whether the form is complete, extracting pending turns first if
+        the stored form already looks complete.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            Tuple of (is_complete, updated fields from the final extraction)
+        """
+        updated_fields = {}
+        if self._is_stored_form_complete(session_id) and self.pending.get(session_id):
+            updated_fields = await self.flush(session_id)
+        return self._is_stored_form_complete(session_id), updated_fields
+
+    def subscribe(self, session_id: str, callback: Callable) -> Callable:
+        """
+        Receive background extraction updates for a session.
+
+        Args:
+            session_id: The session ID
+            callback: Coroutine function called with the updated fields
+
+        Returns:
+            Unsubscribe function
+        """
+        self.listeners.setdefault(session_id, []).append(callback)
+
+        def unsubscribe() -> None:
+            callbacks = self.listeners.get(session_id, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self.listeners.pop(session_id, None)
+
+        return unsubscribe
+
+    def forget(self, session_id: str) -> None:
+        """Drop scheduling state for a deleted session."""
+        timer = self.timers.pop(session_id, None)
+        if timer is not None:
+            timer.cancel()
+        self.pending.pop(session_id, None)
+        self.unreported.pop(session_id, None)
+        self.locks.pop(session_id, None)
+        self.listeners.pop(session_id, None)
+
+    async def _extract(
+        self,
+        session_id: str,
+        on_field: Optional[Callable[[str, Dict], None]] = None,
+        conversation_history: Optional[List[Dict]] = None
+    ) -> Dict:
+        """Run extraction over the session's conversation and clear pending turns."""
+        session = in_memory_store.get_session(session_id)
+        if not session:
+            self.forget(session_id)
+            return {}
+
+        taken = self.pending.get(session_id, 0)
+        if conversation_history is None:
+            conversation_history = session["conversation_history"]
+        conversation_history = [
+            msg for msg in conversation_history if msg["role"] != "system"
+        ]
+        updated_fields = await self.extraction_service.extract_form_data(
+            session_id,
+            conversation_history,
+            on_field
+        )
+        # Turns that arrived during extraction stay pending
+        self.pending[session_id] = max(0, self.pending.get(session_id, 0) - taken)
+        return updated_fields
+
+    async def _extract_when_idle(self, session_id: str, delay: float) -> None:
+        """Extract after the session has been idle for `delay` seconds."""
+        # Runs after the request that scheduled it, so its deadline does not apply
+        start_deadline(None)
+        await asyncio.sleep(delay)
+        self.timers.pop(session_id, None)
+
+        lock = self.locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            updated_fields = await self._extract(session_id)
+
+        if not updated_fields:
+            return
+
+        callbacks = list(self.listeners.get(session_id, []))
+        if callbacks:
+            for callback in callbacks:
+                try:
+                    await callback(updated_fields)
+                except Exception:
+                    logger.exception("Extraction listener error", extra={"session_id": session_id})
+        else:
+            # Report with the next response instead
+            self.unreported[session_id] = merge_updates(
+                self.unreported.get(session_id, {}),
+                updated_fields,
+                self._form_groups(session_id)
+            )
+
+    @staticmethod
+    def _form_groups(session_id: str) -> List[str]:
+        """Get the field group names of a session's form (none if it is gone)."""
+        session = in_memory_store.get_session(session_id)
+        return compiled_form(session["form_id"]).groups if session else []
+
+    @staticmethod
+    def _is_stored_form_complete(session_id: str) -> bool:
+        """Check the stored form data of a session for completeness."""
+        session = in_memory_store.get_session(session_id)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+        return compiled_form(session["form_id"]).is_complete(session["form_data"])
+
+
+# Create singleton instance
+# Stateless sessions leave the server after every request, so nothing can be deferred
+extraction_scheduler = ExtractionScheduler(
+    create_policy("eager" if settings.STATELESS_SESSIONS else settings.EXTRACTION_POLICY)
+)
+
+
+def get_extraction_scheduler() -> ExtractionScheduler:
+    """Get the extraction scheduler instance."""
+    return extraction_scheduler
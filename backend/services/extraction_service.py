@@ -1,10 +1,21 @@
-import json
+import logging
 import re
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 from services.llm_service import get_llm_service
+from services.extraction_batcher import ExtractionBatcher
+from services.json_stream import FieldValueParser
 from prompts.extraction_prompt import get_extraction_prompt
-from models.intake_form import IntakeFormData
+from forms.compiler import CompiledForm, FormModel
+from forms.registry import compiled_form
+from services.zip_index import get_zip_index, normalize_state, normalize_zip
 from storage import in_memory_store
+from storage.session_journal import apply_form_delta, flatten_form
+from services.analytics_service import get_analytics_service
+from serialization import loads, JSONDecodeError
+from config import settings
+
+
+logger = logging.getLogger(__name__)
 
 
 class ExtractionService:
@@ -13,11 +24,24 @@ class ExtractionService:
     def __init__(self):
         """Initialize extraction service."""
         self.llm_service = get_llm_service()
+        self.analytics = get_analytics_service()
+        # Optional micro-batching of concurrent extraction calls
+        self.batcher = None
+        if settings.EXTRACTION_BATCH_WINDOW_MS > 0:
+            self.batcher = ExtractionBatcher(
+                self.llm_service,
+                self._parse_json_response,
+                window_seconds=settings.EXTRACTION_BATCH_WINDOW_MS / 1000,
+                max_batch_size=settings.EXTRACTION_BATCH_MAX_SIZE
+            )
+        # Stream extraction output when the caller wants fields as they arrive
+        self.streaming = settings.EXTRACTION_STREAMING
 
     async def extract_form_data(
         self,
         session_id: str,
-        conversation_history: List[Dict]
+        conversation_history: List[Dict],
+        on_field: Optional[Callable[[str, Dict], None]] = None
     ) -> Dict:
         """
         Extract structured form data from conversation history.
@@ -25,6 +49,8 @@ class ExtractionService:
         Args:
             session_id: The session ID
             conversation_history: List of conversation messages
+            on_field: Called with (dotted path, field value dict) for each
+                field as soon as it is extracted (with EXTRACTION_STREAMING)
 
         Returns:
             Extracted form data as dictionary
@@ -32,44 +58,168 @@ class ExtractionService:
         Raises:
             Exception: If extraction fails
         """
-        # Get extraction prompt with conversation history
-        extraction_prompt = get_extraction_prompt(conversation_history)
-
-        # Create messages for LLM
-        messages = [
-            {"role": "user", "content": extraction_prompt}
-        ]
-
         try:
-            # Get structured data from LLM
-            response = await self.llm_service.extract_structured_data(messages)
-
-            # Parse JSON response
-            extracted_data = self._parse_json_response(response)
-
             # Get previous form data
             session = in_memory_store.get_session(session_id)
-            previous_form_data = IntakeFormData(**session["form_data"])
+            form = compiled_form(session["form_id"])
+            previous_form_data = session["form_data"]
 
             # Create new form data with extracted information
-            new_form_data = self._merge_extracted_data(previous_form_data, extracted_data)
+            if on_field is not None and self.streaming:
+                form_model = await self.stream_from_conversation(
+                    conversation_history,
+                    previous_form_data,
+                    form,
+                    on_field
+                )
+            else:
+                form_model = await self.extract_from_conversation(
+                    conversation_history,
+                    previous_form_data,
+                    form
+                )
+            new_form_data = form_model.model_dump()
 
             # Update session with new form data
             in_memory_store.update_session(
                 session_id,
-                form_data=new_form_data.model_dump()
+                form_data=new_form_data,
+                source="extraction"
             )
 
             # Get updated fields only
-            updated_fields = new_form_data.get_updated_fields(previous_form_data)
+            updated_fields = form.get_updated_fields(new_form_data, previous_form_data)
+            self.analytics.extraction_completed(updated_fields)
 
             return updated_fields
 
         except Exception as e:
-            print(f"Extraction error: {str(e)}")
+            logger.warning("Extraction failed", extra={"session_id": session_id, "error": str(e)})
             # Return empty dict if extraction fails
             return {}
 
+    def apply_extracted_data(self, session_id: str, extracted_data: Dict) -> Dict:
+        """
+        Merge data extracted elsewhere (e.g. locally in degraded mode) into
+        a session's stored form.
+
+        Args:
+            session_id: The session ID
+            extracted_data: Extracted data in the extraction output format
+
+        Returns:
+            Dictionary of updated fields
+        """
+        session = in_memory_store.get_session(session_id)
+        form = compiled_form(session["form_id"])
+        previous_form_data = session["form_data"]
+
+        new_form_data = self._merge_extracted_data(form, previous_form_data, extracted_data).model_dump()
+        in_memory_store.update_session(session_id, form_data=new_form_data, source="local_extraction")
+
+        updated_fields = form.get_updated_fields(new_form_data, previous_form_data)
+        self.analytics.extraction_completed(updated_fields)
+        return updated_fields
+
+    async def extract_from_conversation(
+        self,
+        conversation_history: List[Dict],
+        previous_form_data: Optional[Dict] = None,
+        form: Optional[CompiledForm] = None
+    ) -> FormModel:
+        """
+        Extract form data from a conversation without touching session storage.
+
+        Args:
+            conversation_history: List of conversation messages
+            previous_form_data: Form data dict to merge into (defaults to an empty form)
+            form: Compiled form to extract (defaults to demographics)
+
+        Returns:
+            Merged form model instance
+
+        Raises:
+            Exception: If the LLM call fails or its response cannot be parsed
+        """
+        if form is None:
+            form = compiled_form("demographics")
+        if previous_form_data is None:
+            previous_form_data = form.empty()
+
+        if self.batcher is not None:
+            # Shares one LLM call with other sessions extracting the same form
+            extracted_data = await self.batcher.extract(form, conversation_history)
+        else:
+            # Get extraction prompt with conversation history
+            extraction_prompt = get_extraction_prompt(conversation_history, form.extraction_prompt)
+
+            # Create messages for LLM
+            messages = [
+                {"role": "user", "content": extraction_prompt}
+            ]
+
+            # Get structured data from LLM
+            response = await self.llm_service.extract_structured_data(messages)
+
+            # Parse JSON response
+            extracted_data = self._parse_json_response(response)
+
+        return self._merge_extracted_data(form, previous_form_data, extracted_data)
+
+    async def stream_from_conversation(
+        self,
+        conversation_history: List[Dict],
+        previous_form_data: Dict,
+        form: CompiledForm,
+        on_field: Callable[[str, Dict], None]
+    ) -> FormModel:
+        """
+        Extract form data from a streamed LLM response, reporting fields
+        while the rest of the response is still being generated.
+
+        Each field object is merged into the previous form as soon as it
+        closes in the stream, and on_field is called for every field whose
+        merged value changed (including fields derived from it, such as a
+        city completed from a ZIP code). The returned model is merged from
+        the complete response, exactly as in extract_from_conversation.
+
+        Args:
+            conversation_history: List of conversation messages
+            previous_form_data: Form data dict to merge into
+            form: Compiled form to extract
+            on_field: Called with (dotted path, merged field value dict)
+
+        Returns:
+            Merged form model instance
+
+        Raises:
+            Exception: If the LLM call fails or its response cannot be parsed
+        """
+        messages = [
+            {"role": "user", "content": get_extraction_prompt(conversation_history, form.extraction_prompt)}
+        ]
+
+        parser = FieldValueParser()
+        extracted_so_far: Dict = {}
+        reported = flatten_form(previous_form_data)
+        async for chunk in self.llm_service.stream_structured_data(messages):
+            fields = parser.feed(chunk)
+            if not fields:
+                continue
+            apply_form_delta(extracted_so_far, dict(fields))
+            try:
+                merged = self._merge_extracted_data(form, previous_form_data, extracted_so_far)
+            except Exception:
+                # A value that fails validation waits for the final merge
+                continue
+            for path, field in flatten_form(merged.model_dump()).items():
+                if reported.get(path) != field:
+                    reported[path] = field
+                    on_field(path, field)
+
+        extracted_data = self._parse_json_response(parser.text)
+        return self._merge_extracted_data(form, previous_form_data, extracted_data)
+
     def _parse_json_response(self, response: str) -> Dict:
         """
         Parse JSON from LLM response, handling various formats.
@@ -88,46 +238,88 @@ class ExtractionService:
         if json_match:
             json_str = json_match.group(0)
             try:
-                return json.loads(json_str)
-            except json.JSONDecodeError:
+                return loads(json_str)
+            except JSONDecodeError:
                 pass
 
         # Try parsing the entire response
         try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
+            return loads(response)
+        except JSONDecodeError as e:
             raise ValueError(f"Failed to parse JSON from response: {str(e)}")
 
     def _merge_extracted_data(
         self,
-        previous_data: IntakeFormData,
+        form: CompiledForm,
+        previous_data: Dict,
         extracted_data: Dict
-    ) -> IntakeFormData:
+    ) -> FormModel:
         """
         Merge extracted data with previous form data.
 
         Args:
-            previous_data: Previous form data
+            form: Compiled form the data belongs to
+            previous_data: Previous form data dict
             extracted_data: Newly extracted data
 
         Returns:
-            Updated IntakeFormData instance
+            Updated form model instance (validates the extracted values)
+        """
+        merged_data = form.merge(previous_data, extracted_data)
+
+        for group in form.address_groups:
+            self._complete_address(merged_data[group])
+
+        return form.model(**merged_data)
+
+    def _complete_address(self, address: Dict) -> None:
+        """
+        Normalize and validate address fields against the bundled ZIP index.
+
+        Fills city and state from the ZIP code, or the ZIP code from a city
+        that has exactly one, and lowers the ZIP confidence when it is
+        unknown or belongs to a different state. Derived values get medium
+        confidence and the turn of the field they were derived from.
+
+        Args:
+            address: Merged address data, updated in place
         """
-        # Start with previous data
-        merged_data = previous_data.model_dump()
-
-        # Update with extracted data
-        for field_name, field_value in extracted_data.items():
-            if field_name == "address" and isinstance(field_value, dict):
-                # Handle nested address fields
-                for addr_field, addr_value in field_value.items():
-                    if isinstance(addr_value, dict) and addr_value.get("value") is not None:
-                        merged_data["address"][addr_field] = addr_value
-            elif isinstance(field_value, dict) and field_value.get("value") is not None:
-                # Update top-level field if value is not None
-                merged_data[field_name] = field_value
-
-        return IntakeFormData(**merged_data)
+        state = address["state"]
+        if state.get("value"):
+            state_code = normalize_state(state["value"])
+            if state_code:
+                state["value"] = state_code
+
+        zip_field = address["zip"]
+        if zip_field.get("value"):
+            normalized = normalize_zip(zip_field["value"])
+            if normalized:
+                zip_field["value"] = normalized
+
+        zip_index = get_zip_index()
+        if zip_index is None:
+            return
+
+        if zip_field.get("value"):
+            location = zip_index.lookup_zip(zip_field["value"])
+            if location is None:
+                zip_field["confidence"] = "low"
+                return
+
+            city, state_code = location
+            if state.get("value") is not None and state["value"] != state_code:
+                zip_field["confidence"] = "low"
+                return
+
+            if address["city"].get("value") is None:
+                address["city"] = {"value": city, "confidence": "medium", "turn": zip_field.get("turn")}
+            if state.get("value") is None:
+                address["state"] = {"value": state_code, "confidence": "medium", "turn": zip_field.get("turn")}
+
+        elif address["city"].get("value") and state.get("value"):
+            zip_codes = zip_index.lookup_city(address["city"]["value"], state["value"])
+            if len(zip_codes) == 1:
+                address["zip"] = {"value": zip_codes[0], "confidence": "medium", "turn": address["city"].get("turn")}
 
 
 # Create singleton instance
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+from serialization import dumps
+from config import settings
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an idempotency key is reused with a different request."""
+    pass
+
+
+class IdempotencyCache:
+    """
+    Runs each idempotent request once and shares its outcome.
+
+    Requests are keyed by their Idempotency-Key header and endpoint. The
+    first request runs the handler in its own task; duplicates arriving
+    while it runs await the same task, and duplicates arriving later get
+    the stored response. Failed requests are not stored, so a retry after
+    an error runs again. A handler keeps running when the clients waiting
+    on it disconnect, so their retries get its response instead of
+    running the request a second time. Entries expire after `ttl_seconds` and the oldest are evicted beyond
+    `max_entries`.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum stored requests
+            ttl_seconds: Time a request is remembered
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, request fingerprint, task)
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        handler: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run a request once per idempotency key.
+
+        Args:
+            key: Idempotency key scoped to the endpoint
+            fingerprint: Hash of the request body
+            handler: Coroutine function producing the response
+
+        Returns:
+            The response of the first request with this key
+
+        Raises:
+            IdempotencyKeyReusedError: If the key was used for a different request
+            Exception: Whatever the handler raised
+        """
+        self._evict_expired()
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            _, stored_fingerprint, task = entry
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyKeyReusedError("Idempotency-Key was already used for a different request")
+        else:
+            # The handler runs in its own task, so it finishes (and its
+            # response is stored) even if every waiting client disconnects
+            task = asyncio.ensure_future(handler())
+            task.add_done_callback(lambda done: self._on_done(key, done))
+            self.entries[key] = (time.monotonic() + self.ttl_seconds, fingerprint, task)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        if task.done():
+            return task.result()
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Future) -> None:
+        """Forget failed requests so they can be retried."""
+        entry = self.entries.get(key)
+        if entry is not None and entry[2] is task and (task.cancelled() or task.exception() is not None):
+            del self.entries[key]
+
+    def _evict_expired(self) -> None:
+        """Drop expired entries (entries expire in insertion order)."""
+        now = time.monotonic()
+        while self.entries:
+            key, (expires_at, _, _) = next(iter(self.entries.items()))
+            if expires_at > now:
+                break
+            del self.entries[key]
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Hash a request payload for detecting reused idempotency keys."""
+    return hashlib.sha256(dumps(payload)).hexdigest()
+
+
+# Create singleton instance
+idempotency_cache = IdempotencyCache(
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS
+)
+
+
+def get_idempotency_cache() -> IdempotencyCache:
+    """Get the idempotency cache instance."""
+    return idempotency_cache
@@ -0,0 +1,91 @@
+from typing import Dict, List, Optional, Tuple
+from serialization import loads, JSONDecodeError
+
+
+class FieldValueParser:
+    """
+    Incremental parser picking field values out of streamed extraction JSON.
+
+    Text is fed in chunks as the provider streams it. The parser tracks
+    string and nesting state character by character (each character is
+    scanned once), and whenever an object with a "value" key closes, it
+    returns that object with its dotted field path, e.g.
+    ("address.zip", {"value": "62701", "confidence": "high", "turn": 2}).
+
+    Text before the first "{" (prose, a ```json fence) is skipped, as is
+    anything after the top-level object closes. Objects inside arrays have
+    no field path and are not reported.
+    """
+
+    def __init__(self):
+        """Initialize the parser."""
+        self.text = ""
+        self.position = 0
+        self.done = False
+        # Open containers: (key the container is stored under, start offset);
+        # arrays use a None key, the top-level object an empty one
+        self.stack: List[Tuple[Optional[str], int]] = []
+        self.in_string = False
+        self.escaped = False
+        self.string_start = 0
+        self.last_string: Optional[str] = None
+        self.pending_key: Optional[str] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict]]:
+        """
+        Parse the next chunk of streamed text.
+
+        Args:
+            chunk: Text chunk
+
+        Returns:
+            (dotted path, field value dict) for each field object closed in the chunk
+        """
+        self.text += chunk
+        fields = []
+        text = self.text
+        while self.position < len(text) and not self.done:
+            char = text[self.position]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    self.last_string = text[self.string_start + 1:self.position]
+            elif not self.stack:
+                if char == "{":
+                    self.stack.append(("", self.position))
+            elif char == '"':
+                self.in_string = True
+                self.string_start = self.position
+            elif char == ":":
+                self.pending_key = self.last_string
+            elif char == ",":
+                self.pending_key = None
+            elif char in "{[":
+                key = self.pending_key if char == "{" and self.stack[-1][0] is not None else None
+                self.stack.append((key, self.position))
+                self.pending_key = None
+            elif char in "}]":
+                key, start = self.stack.pop()
+                if char == "}" and key:
+                    field = self._field(text[start:self.position + 1])
+                    if field is not None:
+                        fields.append((".".join(name for name, _ in self.stack[1:] + [(key, start)]), field))
+                if not self.stack:
+                    self.done = True
+            self.position += 1
+        return fields
+
+    @staticmethod
+    def _field(text: str) -> Optional[Dict]:
+        """Decode a closed object if it is a field value."""
+        try:
+            value = loads(text)
+        except JSONDecodeError:
+            return None
+        if isinstance(value, dict) and "value" in value:
+            return value
+        return None
@@ -1,14 +1,52 @@
-from typing import List, Dict
-from providers.provider_factory import get_provider
-from providers.base_provider import BaseProvider
+import asyncio
+import logging
+import time
+from typing import List, Dict, AsyncIterator, Optional
+from providers.provider_factory import ProviderFactory, get_provider
+from providers.base_provider import BaseProvider, last_usage, reset_usage
+from services.circuit_breaker import CircuitBreaker
+from config import settings
+from deadlines import DeadlineExceededError, call_timeout, deadline_expired, remaining
+
+
+logger = logging.getLogger(__name__)
+
+
+def _create_breaker() -> CircuitBreaker:
+    """Create a circuit breaker with the configured thresholds."""
+    return CircuitBreaker(
+        failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        slow_call_seconds=settings.LLM_CIRCUIT_SLOW_CALL_SECONDS,
+        slow_call_threshold=settings.LLM_CIRCUIT_SLOW_CALL_THRESHOLD,
+        reset_seconds=settings.LLM_CIRCUIT_RESET_SECONDS
+    )
 
 
 class LLMService:
-    """High-level service for LLM interactions."""
+    """
+    High-level service for LLM interactions.
+
+    Conversation replies and structured extraction are routed separately:
+    each task has its own provider, model, timeout and max_tokens budget.
+    When extraction is not configured separately it shares the
+    conversation provider and circuit breaker.
+    """
 
     def __init__(self):
-        """Initialize the LLM service with the configured provider."""
-        self.provider: BaseProvider = get_provider()
+        """Initialize the LLM service with the configured providers."""
+        self.provider: BaseProvider = get_provider("conversation")
+        self.timeout = settings.LLM_TIMEOUT_SECONDS
+        self.max_tokens = settings.CONVERSATION_MAX_TOKENS
+        self.breaker = _create_breaker()
+
+        if ProviderFactory.task_route("extraction") == ProviderFactory.task_route("conversation"):
+            self.extraction_provider: BaseProvider = self.provider
+            self.extraction_breaker = self.breaker
+        else:
+            self.extraction_provider = get_provider("extraction")
+            self.extraction_breaker = _create_breaker()
+        self.extraction_timeout = settings.EXTRACTION_TIMEOUT_SECONDS or settings.LLM_TIMEOUT_SECONDS
+        self.extraction_max_tokens = settings.EXTRACTION_MAX_TOKENS
 
     async def generate_response(
         self,
@@ -26,42 +64,272 @@ class LLMService:
             Generated response text
 
         Raises:
+            CircuitOpenError: If the provider circuit is open
+            DeadlineExceededError: If the request deadline passes first
             Exception: If LLM call fails
         """
+        timeout = call_timeout(self.timeout)
+        start = self._start_call(self.breaker)
         try:
-            response = await self.provider.chat_completion(
-                messages=messages,
-                temperature=temperature
+            response = await asyncio.wait_for(
+                self.provider.chat_completion(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=self.max_tokens
+                ),
+                timeout=timeout
             )
-            return response
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
         except Exception as e:
-            raise Exception(f"Failed to generate response: {str(e)}")
+            self._check_deadline(e, "generate_response", start, self.provider, self.breaker)
+            error = self._describe_error(e, timeout)
+            self._finish_call("generate_response", start, self.provider, self.breaker, error)
+            raise Exception(f"Failed to generate response: {error}")
+        self._finish_call("generate_response", start, self.provider, self.breaker)
+        return response
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response from the LLM as a stream of text chunks.
+
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature
+
+        Yields:
+            Chunks of the generated response text
+
+        Raises:
+            CircuitOpenError: If the provider circuit is open
+            DeadlineExceededError: If the request deadline passes mid-stream
+            Exception: If LLM call fails
+        """
+        stream = self._stream_call(
+            "stream_response",
+            self.provider,
+            self.breaker,
+            self.timeout,
+            messages,
+            temperature,
+            self.max_tokens,
+            "Failed to generate response"
+        )
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def stream_structured_data(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """
+        Extract structured data as a stream of text chunks, with the same
+        temperature, provider, timeout and token budget as extract_structured_data.
+        Providers without token streaming yield the whole response at once.
+
+        Args:
+            messages: List of conversation messages including extraction prompt
+
+        Yields:
+            Chunks of the generated JSON
+
+        Raises:
+            CircuitOpenError: If the provider circuit is open
+            DeadlineExceededError: If the request deadline passes mid-stream
+            Exception: If LLM call fails
+        """
+        stream = self._stream_call(
+            "stream_structured_data",
+            self.extraction_provider,
+            self.extraction_breaker,
+            self.extraction_timeout,
+            messages,
+            0.3,
+            self.extraction_max_tokens,
+            "Failed to extract data"
+        )
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def _stream_call(
+        self,
+        operation: str,
+        provider: BaseProvider,
+        breaker: CircuitBreaker,
+        timeout: float,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        failure: str
+    ) -> AsyncIterator[str]:
+        """Stream a completion through the circuit breaker, under the request deadline."""
+        has_deadline = remaining() is not None
+        call_timeout(timeout)
+        start = self._start_call(breaker)
+        chunks = 0
+        stream = provider.stream_chat_completion(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        try:
+            while True:
+                try:
+                    if has_deadline:
+                        # Each chunk must arrive before the request deadline
+                        chunk = await asyncio.wait_for(stream.__anext__(), timeout=call_timeout(timeout))
+                    else:
+                        chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    break
+                chunks += 1
+                if chunks == 1:
+                    logger.debug("First chunk", extra={
+                        "operation": operation,
+                        "latency_ms": round((time.perf_counter() - start) * 1000, 1)
+                    })
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            # Consumer went away mid-stream
+            breaker.record_cancelled()
+            raise
+        except Exception as e:
+            self._check_deadline(e, operation, start, provider, breaker)
+            error = self._describe_error(e, timeout)
+            self._finish_call(operation, start, provider, breaker, error)
+            raise Exception(f"{failure}: {error}")
+        finally:
+            await stream.aclose()
+        self._finish_call(operation, start, provider, breaker)
 
     async def extract_structured_data(
         self,
-        messages: List[Dict[str, str]]
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None
     ) -> str:
         """
         Extract structured data from conversation using LLM.
-        Uses lower temperature for more consistent output.
+        Uses lower temperature for more consistent output, and the
+        extraction provider, timeout and token budget.
 
         Args:
             messages: List of conversation messages including extraction prompt
+            max_tokens: Token budget overriding EXTRACTION_MAX_TOKENS (e.g. for batches)
 
         Returns:
             Generated JSON string
 
         Raises:
+            CircuitOpenError: If the provider circuit is open
+            DeadlineExceededError: If the request deadline passes first
             Exception: If LLM call fails
         """
+        timeout = call_timeout(self.extraction_timeout)
+        start = self._start_call(self.extraction_breaker)
         try:
-            response = await self.provider.chat_completion(
-                messages=messages,
-                temperature=0.3  # Lower temperature for structured output
+            response = await asyncio.wait_for(
+                self.extraction_provider.json_completion(
+                    messages=messages,
+                    temperature=0.3,  # Lower temperature for structured output
+                    max_tokens=max_tokens or self.extraction_max_tokens
+                ),
+                timeout=timeout
             )
-            return response
+        except asyncio.CancelledError:
+            self.extraction_breaker.record_cancelled()
+            raise
         except Exception as e:
-            raise Exception(f"Failed to extract data: {str(e)}")
+            self._check_deadline(
+                e, "extract_structured_data", start, self.extraction_provider, self.extraction_breaker
+            )
+            error = self._describe_error(e, timeout)
+            self._finish_call(
+                "extract_structured_data", start, self.extraction_provider, self.extraction_breaker, error
+            )
+            raise Exception(f"Failed to extract data: {error}")
+        self._finish_call("extract_structured_data", start, self.extraction_provider, self.extraction_breaker)
+        return response
+
+    @staticmethod
+    def _start_call(breaker: CircuitBreaker) -> float:
+        """
+        Check the circuit breaker, reset recorded token usage and return the
+        call start time.
+
+        Raises:
+            CircuitOpenError: If the provider circuit is open
+        """
+        breaker.before_call()
+        reset_usage()
+        return time.perf_counter()
+
+    @staticmethod
+    def _check_deadline(
+        error: Exception,
+        operation: str,
+        start: float,
+        provider: BaseProvider,
+        breaker: CircuitBreaker
+    ) -> None:
+        """
+        Raise DeadlineExceededError if a call timed out because the request
+        deadline was reached. Such calls were cut short by the caller's
+        budget, so they do not count against the provider's circuit.
+        """
+        if not isinstance(error, (asyncio.TimeoutError, DeadlineExceededError)) or not deadline_expired():
+            return
+        breaker.record_cancelled()
+        logger.warning("LLM call", extra={
+            "operation": operation,
+            "provider": provider.name,
+            "model": provider.model_name,
+            "status": "deadline_exceeded",
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "error": "Request deadline exceeded"
+        })
+        raise DeadlineExceededError("Request deadline exceeded")
+
+    @staticmethod
+    def _describe_error(error: Exception, timeout: float) -> str:
+        """Describe a provider error (timeouts have an empty message)."""
+        if isinstance(error, asyncio.TimeoutError):
+            return f"Timed out after {timeout} seconds"
+        return str(error)
+
+    @staticmethod
+    def _finish_call(
+        operation: str,
+        start: float,
+        provider: BaseProvider,
+        breaker: CircuitBreaker,
+        error: Optional[str] = None
+    ) -> None:
+        """Record a finished provider call with the circuit breaker and log it."""
+        latency = time.perf_counter() - start
+        if error:
+            breaker.record_failure()
+        else:
+            breaker.record_success(latency)
+
+        prompt_tokens, completion_tokens = last_usage() or (None, None)
+        logger.log(logging.WARNING if error else logging.INFO, "LLM call", extra={
+            "operation": operation,
+            "provider": provider.name,
+            "model": provider.model_name,
+            "status": "error" if error else "ok",
+            "latency_ms": round(latency * 1000, 1),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "error": error
+        })
 
 
 # Create a singleton instance
@@ -0,0 +1,141 @@
+import re
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from forms.compiler import CompiledForm
+from services.zip_index import normalize_state, normalize_zip
+
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_PATTERN = re.compile(r"(?<!\d)(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)")
+ZIP_PATTERN = re.compile(r"(?<!\d)\d{5}(?:-\d{4})?(?!\d)")
+DATE_PATTERN = re.compile(
+    r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{4}|\d{4}-\d{1,2}-\d{1,2}|[A-Za-z]{3,9}\.? \d{1,2}(?:st|nd|rd|th)?,? \d{4})\b"
+)
+DATE_FORMATS = ["%m/%d/%Y", "%m-%d-%Y", "%Y-%m-%d", "%B %d %Y", "%b %d %Y"]
+
+MAX_DIRECT_ANSWER_LENGTH = 60
+
+# Lead-ins stripped from a direct answer ("it's John", "my email is ...")
+ANSWER_PREFIX = re.compile(r"^(?:it'?s|it is|that'?s|that is|i'?m|i am|this is|my [\w ]{1,30}? is)\s+", re.IGNORECASE)
+
+
+def parse_date(text: str) -> Optional[str]:
+    """Find a date in text and return it as YYYY-MM-DD."""
+    match = DATE_PATTERN.search(text)
+    if not match:
+        return None
+    candidate = re.sub(r"(?<=\d)(?:st|nd|rd|th)|[.,]", "", match.group(0))
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(candidate, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def parse_phone(text: str) -> Optional[str]:
+    """Find a US phone number in text and return its 10 digits."""
+    match = PHONE_PATTERN.search(text)
+    if not match:
+        return None
+    digits = re.sub(r"\D", "", match.group(0))
+    return digits[-10:]
+
+
+def parse_email(text: str) -> Optional[str]:
+    """Find an email address in text."""
+    match = EMAIL_PATTERN.search(text)
+    return match.group(0).lower() if match else None
+
+
+def parse_zip(text: str) -> Optional[str]:
+    """Find a ZIP code in text and return its 5 digits."""
+    match = ZIP_PATTERN.search(text)
+    return normalize_zip(match.group(0)) if match else None
+
+
+def parse_state(text: str) -> Optional[str]:
+    """Interpret a whole answer as a state name or code."""
+    return normalize_state(clean_answer(text))
+
+
+# State names are too ambiguous to find inside free text ("in", "me", "ok"),
+# so states are only read from a direct answer to the state question
+PARSERS: Dict[str, Callable[[str], Optional[str]]] = {
+    "date": parse_date,
+    "phone": parse_phone,
+    "email": parse_email,
+    "zip": parse_zip,
+    "state": parse_state
+}
+SEARCHABLE_FORMATS = {"date", "phone", "email", "zip"}
+
+
+def clean_answer(text: str) -> str:
+    """Strip lead-ins and trailing punctuation from a direct answer."""
+    return ANSWER_PREFIX.sub("", text.strip()).strip(" .!")
+
+
+def extract_locally(
+    form: CompiledForm,
+    form_data: Dict,
+    message: str,
+    asked_field: Optional[str],
+    turn: int
+) -> Dict:
+    """
+    Extract form fields from a single user message without the LLM.
+
+    Used in degraded mode. Fields with a local format (dates, phone
+    numbers, emails, ZIP codes) are recognized anywhere in the message and
+    fill the first empty field of that format. A short answer with no
+    recognized value is taken as the value of the field just asked for.
+    Extracted values get medium confidence so a later LLM extraction over
+    the full conversation can replace them.
+
+    Args:
+        form: Compiled form of the session
+        form_data: Current form data
+        message: The user's message
+        asked_field: Dotted path of the field the previous question asked for
+        turn: Turn number of the message
+
+    Returns:
+        Nested extracted data in the extraction output format
+    """
+    extracted: Dict = {}
+
+    def put(path: str, value: str) -> None:
+        group, _, name = path.rpartition(".")
+        target = extracted.setdefault(group, {}) if group else extracted
+        target[name] = {"value": value, "confidence": "medium", "turn": turn}
+
+    missing = set(form.missing_fields(form_data))
+    if asked_field:
+        missing.add(asked_field)
+
+    asked_format = form.fields[asked_field].local_format if asked_field in form.fields else None
+    if asked_format:
+        value = PARSERS[asked_format](message)
+        if value:
+            put(asked_field, value)
+
+    filled_formats = {asked_format}
+    for path in form.paths:
+        local_format = form.fields[path].local_format
+        if path not in missing or path == asked_field:
+            continue
+        if local_format not in SEARCHABLE_FORMATS or local_format in filled_formats:
+            continue
+        value = PARSERS[local_format](message)
+        if value:
+            put(path, value)
+            filled_formats.add(local_format)
+
+    # A short free-text answer is taken as the value of the field just asked
+    if asked_field in form.fields and not asked_format and not extracted:
+        value = clean_answer(message)
+        if value and len(value) <= MAX_DIRECT_ANSWER_LENGTH:
+            put(asked_field, value)
+
+    return extracted
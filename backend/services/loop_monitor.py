@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+from services.analytics_service import Histogram
+from config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Lag histogram bucket upper bounds in milliseconds
+LAG_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# Weight of the newest sample in the smoothed lag
+SMOOTHING = 0.2
+
+# Frames of the blocked stack included in a stall report
+STACK_DEPTH = 25
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop scheduling delay.
+
+    A background task sleeps for a fixed interval and records how late it
+    wakes up: anything beyond the interval is time the loop spent running
+    other (blocking) work. With stack sampling enabled, a watchdog thread
+    notices when the loop has not checked in for longer than the threshold
+    and logs the stack the loop thread is stuck in, once per stall.
+    """
+
+    def __init__(self, interval: float, threshold_ms: float, sample_stacks: bool = False):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag samples
+            threshold_ms: Lag above which the loop counts as saturated
+            sample_stacks: Log the blocking stack of stalls (debug mode)
+        """
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.sample_stacks = sample_stacks
+
+        self.lag = Histogram(LAG_BUCKETS_MS)
+        self.last_lag_ms = 0.0
+        self.smoothed_lag_ms = 0.0
+        self.stalls = 0
+
+        self.heartbeat = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.watchdog: Optional[threading.Thread] = None
+        self.stopping = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.stopping = threading.Event()
+        self.task = asyncio.create_task(self._run())
+        if self.sample_stacks:
+            self.watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self.watchdog.start()
+
+    def stop(self) -> None:
+        """Stop monitoring."""
+        self.stopping.set()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        self.watchdog = None
+
+    @property
+    def saturated(self) -> bool:
+        """Whether recent scheduling delay is above the threshold."""
+        return self.smoothed_lag_ms > self.threshold_ms
+
+    def get_status(self) -> Dict:
+        """
+        Summarize event loop lag for the health endpoint.
+
+        Returns:
+            Latest and smoothed lag, percentiles, stall count and saturation
+        """
+        p99 = self.lag.percentile(0.99)
+        return {
+            "lag_ms": round(self.last_lag_ms, 1),
+            "smoothed_lag_ms": round(self.smoothed_lag_ms, 1),
+            "p99_lag_ms": round(p99, 1) if p99 is not None else None,
+            "max_lag_ms": round(self.lag.max, 1) if self.lag.max is not None else None,
+            "stalls": self.stalls,
+            "saturated": self.saturated
+        }
+
+    async def _run(self) -> None:
+        """Sample scheduling delay until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.interval)
+            self.heartbeat = time.monotonic()
+            lag_ms = max(loop.time() - before - self.interval, 0.0) * 1000
+            self.last_lag_ms = lag_ms
+            self.smoothed_lag_ms += SMOOTHING * (lag_ms - self.smoothed_lag_ms)
+            self.lag.observe(lag_ms)
+            if lag_ms > self.threshold_ms:
+                self.stalls += 1
+                logger.warning("Event loop lag", extra={"latency_ms": round(lag_ms, 1)})
+
+    def _watch(self) -> None:
+        """Watchdog thread: log the loop thread's stack while it is blocked."""
+        threshold = self.threshold_ms / 1000
+        stopping = self.stopping
+        reported_heartbeat = None
+        while not stopping.wait(max(threshold / 2, 0.01)):
+            heartbeat = self.heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for <= threshold or heartbeat == reported_heartbeat:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            reported_heartbeat = heartbeat
+            stack = "".join(traceback.format_stack(frame, limit=STACK_DEPTH))
+            logger.warning(
+                "Event loop blocked for %.0f ms in:\n%s",
+                blocked_for * 1000,
+                stack,
+                extra={"latency_ms": round(blocked_for * 1000, 1)}
+            )
+
+
+# Create singleton instance
+loop_monitor = LoopLagMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    threshold_ms=settings.LOOP_LAG_THRESHOLD_MS,
+    sample_stacks=settings.DEBUG
+)
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get the event loop monitor instance."""
+    return loop_monitor
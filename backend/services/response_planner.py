@@ -0,0 +1,159 @@
+import re
+from typing import Dict, List, Optional
+from forms.compiler import CompiledForm
+
+
+ACKNOWLEDGEMENTS = [
+    "Thanks!",
+    "Great, thank you!",
+    "Perfect.",
+    "Got it, thanks.",
+    "Wonderful."
+]
+
+NAME_ACKNOWLEDGEMENTS = [
+    "Thanks, {first_name}!",
+    "Nice to meet you, {first_name}!",
+    "Great, thank you {first_name}."
+]
+
+# Used in rotation with the form's own completion message
+COMPLETION_MESSAGE = "Wonderful, that's everything I need. Thanks so much!"
+
+# Cues that the user is correcting, asking or saying something free-form
+CORRECTION_PATTERN = re.compile(
+    r"\b(actually|sorry|wait|no,|not|wrong|mistake|typo|change|instead|meant|correct|update)\b",
+    re.IGNORECASE
+)
+
+MAX_ROUTINE_MESSAGE_LENGTH = 200
+
+
+class ResponsePlanner:
+    """Plans the next assistant reply for routine turns without calling the LLM."""
+
+    def plan_reply(
+        self,
+        form: CompiledForm,
+        user_message: str,
+        previous_data: Dict,
+        new_data: Dict,
+        updated_fields: Dict,
+        turn: int
+    ) -> Optional[str]:
+        """
+        Plan a templated reply when the turn is routine.
+
+        A turn is routine when the user simply answered: the extraction delta
+        is non-empty, every updated field has high confidence, no previously
+        filled field changed, and the message carries no question or
+        correction cues.
+
+        Args:
+            form: Compiled form of the session
+            user_message: The user's message
+            previous_data: Form data before this turn
+            new_data: Form data after extraction
+            updated_fields: Fields updated in this turn
+            turn: User turn number (1-indexed), used to vary phrasing
+
+        Returns:
+            Planned reply, or None if the LLM should respond
+        """
+        if not self._is_routine_turn(user_message, previous_data, updated_fields):
+            return None
+
+        if form.is_complete(new_data):
+            return self._pick([form.schema.completion_message, COMPLETION_MESSAGE], turn)
+
+        question = self._next_question(form, new_data, turn)
+        if question is None:
+            return None
+        acknowledgement = self._acknowledge(new_data, updated_fields, turn)
+        return f"{acknowledgement} {question}"
+
+    def _is_routine_turn(
+        self,
+        user_message: str,
+        previous_data: Dict,
+        updated_fields: Dict
+    ) -> bool:
+        """Check whether a turn can be answered without the LLM."""
+        if not updated_fields:
+            return False
+        if len(user_message) > MAX_ROUTINE_MESSAGE_LENGTH or "?" in user_message:
+            return False
+        if CORRECTION_PATTERN.search(user_message):
+            return False
+
+        for path, field in self._flatten(updated_fields):
+            if field.get("confidence") != "high":
+                return False
+            # A change to a filled field is a correction
+            if self._get(previous_data, path).get("value") is not None:
+                return False
+        return True
+
+    def _acknowledge(self, new_data: Dict, updated_fields: Dict, turn: int) -> str:
+        """Pick an acknowledgement for the captured fields."""
+        first_name = new_data.get("first_name", {}).get("value")
+        if "first_name" in updated_fields and first_name:
+            template = self._pick(NAME_ACKNOWLEDGEMENTS, turn)
+            return template.format(first_name=first_name)
+        return self._pick(ACKNOWLEDGEMENTS, turn)
+
+    def _next_question(self, form: CompiledForm, new_data: Dict, turn: int) -> Optional[str]:
+        """
+        Pick a question for the next missing field or group of fields.
+
+        Combined questions (e.g. full name) are used when all of their fields
+        are missing, and group questions (e.g. full address) when more than
+        one field of the group is missing.
+
+        Returns:
+            Question, or None if the form has no phrasing for the field
+        """
+        missing = form.missing_fields(new_data)
+
+        for fields, questions in form.combined_questions:
+            if missing[0] in fields and all(path in missing for path in fields):
+                return self._pick(questions, turn)
+
+        group, _, _ = missing[0].rpartition(".")
+        if group and form.group_questions.get(group):
+            if sum(path.startswith(f"{group}.") for path in missing) > 1:
+                return self._pick(form.group_questions[group], turn)
+
+        questions = form.questions.get(missing[0])
+        return self._pick(questions, turn) if questions else None
+
+    @staticmethod
+    def _flatten(fields: Dict, prefix: str = ""):
+        """Yield (dotted path, field dict) pairs from a nested field dict."""
+        for name, value in fields.items():
+            path = f"{prefix}{name}"
+            if isinstance(value, dict) and "value" not in value:
+                yield from ResponsePlanner._flatten(value, f"{path}.")
+            else:
+                yield path, value
+
+    @staticmethod
+    def _get(data: Dict, path: str) -> Dict:
+        """Look up a field dict by dotted path."""
+        for part in path.split("."):
+            data = data.get(part, {})
+        return data
+
+    @staticmethod
+    def _pick(options: List[str], turn: int) -> str:
+        """Rotate through phrasings so consecutive turns don't repeat."""
+        return options[turn % len(options)]
+
+
+# Create singleton instance
+response_planner = ResponsePlanner()
+
+
+def get_response_planner() -> ResponsePlanner:
+    """Get the response planner instance."""
+    return response_planner
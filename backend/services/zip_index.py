@@ -0,0 +1,200 @@
+import bisect
+import mmap
+import os
+import struct
+from typing import List, Optional, Tuple
+
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "us_zip_index.bin")
+
+INDEX_MAGIC = b"ZIPIDX1\0"
+# Header: magic, zip count, city count, state count, city name blob size
+INDEX_HEADER = struct.Struct("<8sIIII")
+
+STATE_NAMES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
+    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
+    "DC": "District of Columbia", "FL": "Florida", "GA": "Georgia", "HI": "Hawaii",
+    "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa",
+    "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine",
+    "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska",
+    "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico",
+    "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
+    "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island",
+    "SC": "South Carolina", "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas",
+    "UT": "Utah", "VT": "Vermont", "VA": "Virginia", "WA": "Washington",
+    "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming",
+    "AS": "American Samoa", "GU": "Guam", "MP": "Northern Mariana Islands",
+    "PR": "Puerto Rico", "VI": "U.S. Virgin Islands", "FM": "Micronesia",
+    "MH": "Marshall Islands", "PW": "Palau",
+    "AA": "Armed Forces Americas", "AE": "Armed Forces Europe", "AP": "Armed Forces Pacific"
+}
+
+# Lookup keys are lowercased with periods removed
+STATE_CODES = {
+    **{name.lower().replace(".", ""): code for code, name in STATE_NAMES.items()},
+    **{code.lower(): code for code in STATE_NAMES},
+    "virgin islands": "VI",
+    "washington dc": "DC",
+    "washington, dc": "DC"
+}
+
+
+def normalize_state(state: str) -> Optional[str]:
+    """
+    Convert a state name or code to its 2-letter code.
+
+    Args:
+        state: State name or code, in any case
+
+    Returns:
+        2-letter state code, or None if unknown
+    """
+    return STATE_CODES.get(state.strip().lower().replace(".", ""))
+
+
+def normalize_zip(zip_code: str) -> Optional[str]:
+    """
+    Reduce a ZIP or ZIP+4 to its 5-digit form.
+
+    Args:
+        zip_code: ZIP code as entered
+
+    Returns:
+        5-digit ZIP code, or None if it doesn't start with 5 digits
+    """
+    digits = "".join(ch for ch in zip_code if ch.isdigit())
+    if len(digits) not in (5, 9):
+        return None
+    return digits[:5]
+
+
+class ZipIndex:
+    """
+    Memory-mapped US ZIP -> city/state index.
+
+    The index file holds flat arrays: sorted ZIP codes with the city of each,
+    cities sorted by (state, name) with their state and a slice of ZIP
+    positions, and a blob of city names. Lookups are binary searches over the
+    mapped arrays, so loading is constant-time and the pages are shared
+    between worker processes.
+    """
+
+    def __init__(self, path: str = INDEX_PATH):
+        """
+        Open the index file.
+
+        Args:
+            path: Path to the index file
+        """
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, zip_count, city_count, state_count, names_size = INDEX_HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"Invalid ZIP index file: {path}")
+
+        view = memoryview(self._mmap)
+        offset = INDEX_HEADER.size
+
+        def take(count: int, fmt: str, size: int) -> memoryview:
+            nonlocal offset
+            section = view[offset:offset + count * size].cast(fmt)
+            # Sections are padded to 4-byte alignment
+            offset += (count * size + 3) & ~3
+            return section
+
+        self.zips = take(zip_count, "I", 4)
+        self.zip_cities = take(zip_count, "H", 2)
+        self.city_states = take(city_count, "B", 1)
+        self.city_name_offsets = take(city_count + 1, "I", 4)
+        self.city_zip_offsets = take(city_count + 1, "I", 4)
+        self.city_zips = take(zip_count, "H", 2)
+        self.states = [
+            bytes(view[offset + i * 2:offset + i * 2 + 2]).decode("ascii")
+            for i in range(state_count)
+        ]
+        offset += (state_count * 2 + 3) & ~3
+        self.city_names = view[offset:offset + names_size]
+
+    def _city_name(self, city_id: int) -> str:
+        """Decode a city name by ID."""
+        start = self.city_name_offsets[city_id]
+        end = self.city_name_offsets[city_id + 1]
+        return bytes(self.city_names[start:end]).decode("utf-8")
+
+    def lookup_zip(self, zip_code: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up the city and state for a ZIP code.
+
+        Args:
+            zip_code: ZIP or ZIP+4 code
+
+        Returns:
+            Tuple of (city, 2-letter state), or None if the ZIP is unknown
+        """
+        normalized = normalize_zip(zip_code)
+        if normalized is None:
+            return None
+
+        key = int(normalized)
+        position = bisect.bisect_left(self.zips, key)
+        if position == len(self.zips) or self.zips[position] != key:
+            return None
+
+        city_id = self.zip_cities[position]
+        return self._city_name(city_id), self.states[self.city_states[city_id]]
+
+    def lookup_city(self, city: str, state: str) -> List[str]:
+        """
+        Look up the ZIP codes of a city.
+
+        Args:
+            city: City name, in any case
+            state: State name or code
+
+        Returns:
+            5-digit ZIP codes of the city (empty if unknown)
+        """
+        state_code = normalize_state(state)
+        if state_code is None or state_code not in self.states:
+            return []
+
+        # Cities are sorted by state, then by lowercased name
+        state_id = self.states.index(state_code)
+        low = bisect.bisect_left(self.city_states, state_id)
+        high = bisect.bisect_right(self.city_states, state_id)
+
+        target = city.strip().lower()
+        while low < high:
+            middle = (low + high) // 2
+            if self._city_name(middle).lower() < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        if (low == len(self.city_states)
+                or self.city_states[low] != state_id
+                or self._city_name(low).lower() != target):
+            return []
+
+        start = self.city_zip_offsets[low]
+        end = self.city_zip_offsets[low + 1]
+        return [f"{self.zips[self.city_zips[i]]:05d}" for i in range(start, end)]
+
+
+_zip_index: Optional[ZipIndex] = None
+
+
+def get_zip_index() -> Optional[ZipIndex]:
+    """
+    Get the shared ZIP index, opening it on first use.
+
+    Returns:
+        The ZIP index, or None if the index file is not available
+    """
+    global _zip_index
+    if _zip_index is None and os.path.exists(INDEX_PATH):
+        _zip_index = ZipIndex(INDEX_PATH)
+    return _zip_index
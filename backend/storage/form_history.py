@@ -0,0 +1,159 @@
+import bisect
+from typing import Any, Dict, List, Optional, Tuple
+from forms.registry import compiled_form
+from storage.session_journal import apply_form_delta, flatten_form
+
+
+# A field's stored state: (value, confidence, turn). Tuples are immutable,
+# so versions can share them without copying.
+FieldState = Tuple[Any, Optional[str], Optional[int]]
+
+
+def _field_state(field: Dict) -> FieldState:
+    """Freeze a field value dict."""
+    return (field.get("value"), field.get("confidence"), field.get("turn"))
+
+
+def _field_dict(state: FieldState) -> Dict:
+    """Thaw a field state into a field value dict."""
+    value, confidence, turn = state
+    return {"value": value, "confidence": confidence, "turn": turn}
+
+
+class FormVersion:
+    """
+    One version of a session's form.
+
+    Holds only the fields that changed in this version; every other field
+    is shared with the earlier version that last set it.
+    """
+
+    __slots__ = ("number", "timestamp", "source", "changes")
+
+    def __init__(self, number: int, timestamp: str, source: str, changes: Dict[str, FieldState]):
+        self.number = number
+        self.timestamp = timestamp
+        self.source = source
+        self.changes = changes
+
+    def summary(self) -> Dict:
+        """Version metadata and the paths it changed."""
+        return {
+            "version": self.number,
+            "timestamp": self.timestamp,
+            "source": self.source,
+            "changed_fields": list(self.changes)
+        }
+
+
+class FormHistory:
+    """
+    Versioned history of a session's form data with structural sharing.
+
+    Each update appends a version holding only the changed fields, so
+    memory grows with the number of field changes, not with the number of
+    updates times the form size. A per-field index lists the versions that
+    changed each field, which answers "when did this field change?"
+    directly and rebuilds any earlier version with one binary search per
+    changed field.
+    """
+
+    __slots__ = ("form_id", "versions", "field_versions")
+
+    def __init__(self, form_id: str, form_data: Dict, timestamp: str, source: str = "created"):
+        """
+        Start a history at a session's current form.
+
+        Args:
+            form_id: ID of the form the session fills in
+            form_data: Initial form data (version 0 keeps its filled fields)
+            timestamp: Timestamp of version 0 (ISO format)
+            source: What produced version 0
+        """
+        self.form_id = form_id
+        self.versions: List[FormVersion] = []
+        # Dotted field path -> numbers of the versions that changed it, ascending
+        self.field_versions: Dict[str, List[int]] = {}
+        self.append(
+            {path: field for path, field in flatten_form(form_data).items() if field.get("value") is not None},
+            timestamp,
+            source
+        )
+
+    @property
+    def head(self) -> FormVersion:
+        """The current version."""
+        return self.versions[-1]
+
+    def append(self, delta: Dict[str, Dict], timestamp: str, source: str) -> FormVersion:
+        """
+        Append a version. Costs O(1) plus the number of changed fields.
+
+        Args:
+            delta: Changed fields as dotted path -> field value dict (see form_delta)
+            timestamp: Update timestamp (ISO format)
+            source: What produced the change (e.g. "update", "rollback")
+
+        Returns:
+            The new version
+        """
+        version = FormVersion(
+            len(self.versions),
+            timestamp,
+            source,
+            {path: _field_state(field) for path, field in delta.items()}
+        )
+        self.versions.append(version)
+        for path in version.changes:
+            self.field_versions.setdefault(path, []).append(version.number)
+        return version
+
+    def field_changes(self, path: str) -> List[Dict]:
+        """
+        List the changes of one field, oldest first.
+
+        Args:
+            path: Dotted field path (e.g. "phone" or "address.zip")
+
+        Returns:
+            One entry per change, with the version, timestamp, source, new
+            field value dict and the previous value
+        """
+        changes = []
+        previous = None
+        for number in self.field_versions.get(path, []):
+            version = self.versions[number]
+            field = _field_dict(version.changes[path])
+            changes.append({
+                "version": number,
+                "timestamp": version.timestamp,
+                "source": version.source,
+                "field": field,
+                "previous_value": previous
+            })
+            previous = field["value"]
+        return changes
+
+    def form_at(self, number: int) -> Dict:
+        """
+        Rebuild the form data of a version.
+
+        Args:
+            number: Version number
+
+        Returns:
+            New form data dict
+
+        Raises:
+            IndexError: If the version does not exist
+        """
+        if not 0 <= number < len(self.versions):
+            raise IndexError(f"Unknown form version: {number}")
+        form_data = compiled_form(self.form_id).empty()
+        delta = {}
+        for path, numbers in self.field_versions.items():
+            position = bisect.bisect_right(numbers, number)
+            if position:
+                delta[path] = _field_dict(self.versions[numbers[position - 1]].changes[path])
+        apply_form_delta(form_data, delta)
+        return form_data
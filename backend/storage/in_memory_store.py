@@ -1,17 +1,103 @@
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
+import asyncio
+import itertools
+import time
 import uuid
-from models.intake_form import IntakeFormData
+from forms.registry import compiled_form
+from storage.form_history import FormHistory
+from storage.session_journal import SessionJournal, form_delta
+from storage.session_index import SessionIndex
+from storage.session_tiers import ColdSession, freeze_sessions, memory_report, snapshot_session
+from services.analytics_service import get_analytics_service
 
 
-# In-memory storage for sessions
+# In-memory storage for sessions (hot tier)
 sessions: Dict[str, dict] = {}
 
+# Idle sessions compressed into byte blobs (cold tier), expanded on access
+cold_sessions: Dict[str, ColdSession] = {}
 
-def create_session() -> str:
+# Hot session IDs by last access (monotonic time), least recently used first
+last_access: "OrderedDict[str, float]" = OrderedDict()
+
+# Versioned form history per session (hot or cold), in memory only
+form_histories: Dict[str, FormHistory] = {}
+
+# Optional write-ahead journal for crash recovery
+journal: Optional[SessionJournal] = None
+
+# Analytics updated on every mutation
+analytics = get_analytics_service()
+
+# Secondary indexes for listing sessions, updated on every mutation
+index = SessionIndex()
+
+SORT_KEYS = ("created_at", "last_updated")
+
+
+def open_journal(directory: str, fsync: bool = False) -> int:
+    """
+    Recover sessions from the journal directory and journal all further mutations.
+
+    Args:
+        directory: Directory holding journal and snapshot files
+        fsync: Fsync after every journal record
+
+    Returns:
+        Number of recovered sessions
+    """
+    global journal
+    journal = SessionJournal(directory, fsync=fsync)
+    sessions.clear()
+    cold_sessions.clear()
+    last_access.clear()
+    form_histories.clear()
+    sessions.update(journal.open())
+    now = time.monotonic()
+    for session_id, session in sessions.items():
+        last_access[session_id] = now
+        # History is not journaled; recovered sessions start a new one
+        form_histories[session_id] = FormHistory(
+            session["form_id"], session["form_data"], session["last_updated"], source="recovered"
+        )
+
+    analytics.reset()
+    index.clear()
+    for session in sessions.values():
+        analytics.session_restored(session)
+        index.add(
+            session,
+            complete=compiled_form(session["form_id"]).is_complete(session["form_data"])
+        )
+
+    return len(sessions)
+
+
+async def compact_journal() -> None:
+    """Rotate the journal and write a snapshot of all sessions in a worker thread."""
+    if journal is None:
+        return
+    generation, view = journal.rotate(sessions, cold_sessions)
+    await asyncio.to_thread(journal.write_snapshot, generation, view)
+
+
+def close_journal() -> None:
+    """Stop journaling session mutations."""
+    global journal
+    if journal is not None:
+        journal.close()
+        journal = None
+
+
+def create_session(form_id: str = "demographics") -> str:
     """
     Create a new session and return its ID.
 
+    Args:
+        form_id: ID of the intake form the session fills in
+
     Returns:
         Session ID (UUID)
     """
@@ -20,18 +106,26 @@ def create_session() -> str:
 
     sessions[session_id] = {
         "session_id": session_id,
+        "form_id": form_id,
         "conversation_history": [],
-        "form_data": IntakeFormData().model_dump(),
+        "form_data": compiled_form(form_id).empty(),
         "created_at": now,
         "last_updated": now
     }
+    _touch(session_id)
+    form_histories[session_id] = FormHistory(form_id, sessions[session_id]["form_data"], now)
+
+    if journal is not None:
+        journal.record_create(sessions[session_id])
+    analytics.session_created(session_id)
+    index.add(sessions[session_id])
 
     return session_id
 
 
 def get_session(session_id: str) -> Optional[dict]:
     """
-    Retrieve a session by ID.
+    Retrieve a session by ID, expanding it first if it went cold.
 
     Args:
         session_id: The session ID to retrieve
@@ -39,13 +133,20 @@ def get_session(session_id: str) -> Optional[dict]:
     Returns:
         Session data dict or None if not found
     """
-    return sessions.get(session_id)
+    session = sessions.get(session_id)
+    if session is None:
+        session = _thaw(session_id)
+        if session is None:
+            return None
+    _touch(session_id)
+    return session
 
 
 def update_session(
     session_id: str,
     conversation_history: Optional[list] = None,
-    form_data: Optional[dict] = None
+    form_data: Optional[dict] = None,
+    source: str = "update"
 ) -> bool:
     """
     Update session data.
@@ -54,14 +155,17 @@ def update_session(
         session_id: The session ID to update
         conversation_history: New conversation history (optional)
         form_data: New form data (optional)
+        source: What produced the form data, recorded in its history
 
     Returns:
         True if updated successfully, False if session not found
     """
-    session = sessions.get(session_id)
+    session = get_session(session_id)
     if not session:
         return False
 
+    previous_form_data = session["form_data"]
+
     if conversation_history is not None:
         session["conversation_history"] = conversation_history
 
@@ -69,6 +173,34 @@ def update_session(
         session["form_data"] = form_data
 
     session["last_updated"] = datetime.utcnow().isoformat()
+
+    if form_data is not None:
+        delta = form_delta(previous_form_data, form_data)
+        if delta:
+            form_histories[session_id].append(delta, session["last_updated"], source)
+
+    if journal is not None:
+        journal.record_update(
+            session_id,
+            conversation_history,
+            previous_form_data,
+            form_data,
+            session["last_updated"]
+        )
+
+    analytics.session_updated(
+        session,
+        history_changed=conversation_history is not None,
+        form_changed=form_data is not None
+    )
+    index.update(
+        session,
+        complete=(
+            compiled_form(session["form_id"]).is_complete(form_data)
+            if form_data is not None else None
+        )
+    )
+
     return True
 
 
@@ -82,22 +214,293 @@ def delete_session(session_id: str) -> bool:
     Returns:
         True if deleted successfully, False if session not found
     """
-    if session_id in sessions:
-        del sessions[session_id]
+    if session_id in sessions or session_id in cold_sessions:
+        sessions.pop(session_id, None)
+        cold_sessions.pop(session_id, None)
+        last_access.pop(session_id, None)
+        form_histories.pop(session_id, None)
+        if journal is not None:
+            journal.record_delete(session_id, datetime.utcnow().isoformat())
+        analytics.session_deleted(session_id)
+        index.remove(session_id)
         return True
     return False
 
 
-def get_all_session_ids() -> list:
+def get_all_session_ids() -> Iterator[str]:
+    """
+    Iterate over all session IDs (hot and cold) without copying them.
+    The store must not be mutated while iterating.
+
+    Returns:
+        Iterator of session IDs
+    """
+    return itertools.chain(sessions, cold_sessions)
+
+
+def list_sessions(
+    sort: str = "created_at",
+    descending: bool = True,
+    after: Optional[Tuple[str, str]] = None,
+    limit: int = 50,
+    status: Optional[str] = None,
+    form_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> Tuple[List[dict], Optional[Tuple[str, str]]]:
+    """
+    List a page of sessions from the secondary indexes.
+
+    Work is proportional to the page size (plus sessions skipped by the
+    status and form filters), not to the number of stored sessions.
+
+    Args:
+        sort: Timestamp to order by ("created_at" or "last_updated")
+        descending: Newest first
+        after: Position to resume after, as returned for the previous page
+        limit: Maximum number of sessions to return
+        status: Only "complete" or "incomplete" sessions
+        form_id: Only sessions filling in this form
+        since: Inclusive lower bound on the sort timestamp
+        until: Inclusive upper bound on the sort timestamp
+
+    Returns:
+        Session summaries for the page (cold sessions are not expanded),
+        and the position to resume after if more sessions may follow
+
+    Raises:
+        ValueError: If sort or status is not recognized
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+    if status not in (None, "complete", "incomplete"):
+        raise ValueError(f"Unknown status: {status}")
+
+    page: List[dict] = []
+    position = None
+    wanted_complete = status == "complete"
+    for key, session_id in getattr(index, sort).scan(descending, after, since, until):
+        if status is not None and index.is_complete(session_id) != wanted_complete:
+            continue
+        summary = _summarize(session_id)
+        if form_id is not None and summary["form_id"] != form_id:
+            continue
+        if len(page) == limit:
+            return page, position
+        page.append(summary)
+        position = (key, session_id)
+
+    return page, None
+
+
+def get_form_data(session_id: str) -> Optional[dict]:
     """
-    Get all session IDs.
+    Get a session's form data for reading, without moving a cold session
+    back to the hot tier or counting as an access.
+
+    Args:
+        session_id: The session ID
 
     Returns:
-        List of session IDs
+        Form data dict, or None if not found
     """
-    return list(sessions.keys())
+    session = sessions.get(session_id)
+    if session is not None:
+        return session["form_data"]
+    cold = cold_sessions.get(session_id)
+    if cold is not None:
+        return cold.expand()[1]
+    return None
+
+
+def get_form_history(session_id: str) -> Optional[FormHistory]:
+    """
+    Get a session's form history, without expanding a cold session.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        Form history, or None if not found
+    """
+    return form_histories.get(session_id)
+
+
+def rollback_form(session_id: str, version: int) -> Optional[dict]:
+    """
+    Restore a session's form to an earlier version. The rollback is
+    appended as a new version, so it can itself be undone.
+
+    Args:
+        session_id: The session ID
+        version: Version number to restore
+
+    Returns:
+        The restored form data, or None if the session is not found
+
+    Raises:
+        IndexError: If the version does not exist
+    """
+    history = form_histories.get(session_id)
+    if history is None:
+        return None
+    form_data = history.form_at(version)
+    update_session(session_id, form_data=form_data, source="rollback")
+    return form_data
+
+
+def load_session(session: dict) -> bool:
+    """
+    Load a session held elsewhere (a stateless-mode state token) for the
+    duration of a request. Not journaled.
+
+    Args:
+        session: Session dict
+
+    Returns:
+        True if loaded, False if the session is already loaded
+    """
+    session_id = session["session_id"]
+    if session_id in sessions or session_id in cold_sessions:
+        return False
+    sessions[session_id] = session
+    _touch(session_id)
+    form_histories[session_id] = FormHistory(
+        session["form_id"], session["form_data"], session["last_updated"], source="loaded"
+    )
+    analytics.session_restored(session)
+    index.add(
+        session,
+        complete=compiled_form(session["form_id"]).is_complete(session["form_data"])
+    )
+    return True
+
+
+def unload_session(session_id: str) -> Optional[dict]:
+    """
+    Remove a session loaded with load_session (or created for a stateless
+    client) without journaling a deletion.
+
+    Args:
+        session_id: The session ID
+
+    Returns:
+        The session dict, or None if not loaded
+    """
+    session = get_session(session_id)
+    if session is None:
+        return None
+    del sessions[session_id]
+    last_access.pop(session_id, None)
+    form_histories.pop(session_id, None)
+    analytics.session_deleted(session_id)
+    index.remove(session_id)
+    return session
+
+
+async def freeze_idle_sessions(idle_seconds: float) -> int:
+    """
+    Compress sessions not accessed for idle_seconds into the cold tier.
+
+    Sessions are copied on the event loop and compressed in a worker
+    thread; a session used in the meantime stays hot and its blob is
+    discarded.
+
+    Args:
+        idle_seconds: Idle time after which a session goes cold
+
+    Returns:
+        Number of sessions frozen
+    """
+    cutoff = time.monotonic() - idle_seconds
+    candidates = []
+    for session_id, accessed in last_access.items():
+        if accessed > cutoff:
+            break
+        candidates.append((session_id, accessed))
+    if not candidates:
+        return 0
+
+    frozen = await asyncio.to_thread(
+        freeze_sessions,
+        [snapshot_session(sessions[session_id]) for session_id, _ in candidates]
+    )
+
+    count = 0
+    for (session_id, accessed), cold in zip(candidates, frozen):
+        if last_access.get(session_id) != accessed:
+            continue
+        del sessions[session_id]
+        del last_access[session_id]
+        cold_sessions[session_id] = cold
+        count += 1
+    return count
+
+
+async def get_memory_report(largest: int = 10) -> Dict:
+    """
+    Report memory used per session in each tier, measured in a worker thread.
+
+    Args:
+        largest: Number of largest sessions to list
+
+    Returns:
+        Per-tier session counts and bytes, and the largest sessions
+    """
+    return await asyncio.to_thread(
+        memory_report,
+        list(sessions.values()),
+        list(cold_sessions.values()),
+        largest
+    )
+
+
+def _touch(session_id: str) -> None:
+    """Mark a hot session as just used."""
+    last_access[session_id] = time.monotonic()
+    last_access.move_to_end(session_id)
+
+
+def _thaw(session_id: str) -> Optional[dict]:
+    """Move a cold session back to the hot tier."""
+    cold = cold_sessions.pop(session_id, None)
+    if cold is None:
+        return None
+    session = cold.thaw()
+    sessions[session_id] = session
+    return session
+
+
+def _summarize(session_id: str) -> dict:
+    """Listing metadata of a hot or cold session, without expanding it."""
+    session = sessions.get(session_id)
+    if session is not None:
+        return {
+            "session_id": session_id,
+            "form_id": session["form_id"],
+            "created_at": session["created_at"],
+            "last_updated": session["last_updated"],
+            "message_count": len(session["conversation_history"]),
+            "is_complete": index.is_complete(session_id),
+            "tier": "hot"
+        }
+    cold = cold_sessions[session_id]
+    return {
+        "session_id": session_id,
+        "form_id": cold.form_id,
+        "created_at": cold.created_at,
+        "last_updated": cold.last_updated,
+        "message_count": cold.message_count,
+        "is_complete": index.is_complete(session_id),
+        "tier": "cold"
+    }
 
 
 def clear_all_sessions() -> None:
     """Clear all sessions (useful for testing)."""
     sessions.clear()
+    cold_sessions.clear()
+    last_access.clear()
+    form_histories.clear()
+    analytics.reset()
+    index.clear()
@@ -0,0 +1,181 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+# Stale entries tolerated before a sorted index is rebuilt
+COMPACT_SLACK = 1024
+
+# Sorts after any session ID, for inclusive upper bounds
+MAX_ID = "\uffff"
+
+
+class SortedKeyIndex:
+    """
+    Sessions ordered by a timestamp key.
+
+    Entries are (key, session_id) tuples in a sorted list. Keys only move
+    forward in time, so a changed key is appended at the end and the old
+    entry is left in place as stale; scans skip stale entries and the list
+    is rebuilt once they outnumber the live ones.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.entries: List[Tuple[str, str]] = []
+        self.keys: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def set(self, session_id: str, key: str) -> None:
+        """
+        Add a session or move it to a new key.
+
+        Args:
+            session_id: The session ID
+            key: ISO timestamp the session sorts by
+        """
+        if self.keys.get(session_id) == key:
+            return
+        self.keys[session_id] = key
+        entry = (key, session_id)
+        if not self.entries or entry > self.entries[-1]:
+            self.entries.append(entry)
+        else:
+            position = bisect_left(self.entries, entry)
+            if position < len(self.entries) and self.entries[position] == entry:
+                # A stale entry left by an earlier move becomes live again
+                return
+            self.entries.insert(position, entry)
+        self._maybe_compact()
+
+    def remove(self, session_id: str) -> None:
+        """
+        Remove a session and its live entry from the index, so sessions
+        removed and added back (stateless sessions are loaded for every
+        request) do not leave entries behind.
+        """
+        key = self.keys.pop(session_id, None)
+        if key is None:
+            return
+        entry = (key, session_id)
+        position = bisect_left(self.entries, entry)
+        if position < len(self.entries) and self.entries[position] == entry:
+            del self.entries[position]
+        self._maybe_compact()
+
+    def clear(self) -> None:
+        """Remove all sessions."""
+        self.entries = []
+        self.keys = {}
+
+    def scan(
+        self,
+        descending: bool = False,
+        after: Optional[Tuple[str, str]] = None,
+        lower: Optional[str] = None,
+        upper: Optional[str] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate live entries in key order.
+
+        Args:
+            descending: Iterate from the newest key
+            after: Resume strictly after this (key, session_id) entry
+            lower: Inclusive lower bound on the key
+            upper: Inclusive upper bound on the key
+
+        Yields:
+            (key, session_id) tuples
+        """
+        entries = self.entries
+        keys = self.keys
+
+        if descending:
+            start = len(entries)
+            if upper is not None:
+                start = bisect_right(entries, (upper, MAX_ID))
+            if after is not None:
+                start = min(start, bisect_left(entries, after))
+            for i in range(start - 1, -1, -1):
+                key, session_id = entries[i]
+                if lower is not None and key < lower:
+                    break
+                if keys.get(session_id) == key:
+                    yield key, session_id
+        else:
+            start = 0
+            if lower is not None:
+                start = bisect_left(entries, (lower, ""))
+            if after is not None:
+                start = max(start, bisect_right(entries, after))
+            for i in range(start, len(entries)):
+                key, session_id = entries[i]
+                if upper is not None and key > upper:
+                    break
+                if keys.get(session_id) == key:
+                    yield key, session_id
+
+    def _maybe_compact(self) -> None:
+        """Drop stale entries once they outnumber the live ones."""
+        if len(self.entries) > 2 * len(self.keys) + COMPACT_SLACK:
+            keys = self.keys
+            self.entries = [entry for entry in self.entries if keys.get(entry[1]) == entry[0]]
+
+
+class SessionIndex:
+    """
+    Secondary indexes over the session store: sessions sorted by creation
+    and last update time, and the set of sessions with a complete form.
+    """
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        self.created_at = SortedKeyIndex()
+        self.last_updated = SortedKeyIndex()
+        self.complete: Set[str] = set()
+
+    def add(self, session: dict, complete: bool = False) -> None:
+        """
+        Index a new or recovered session.
+
+        Args:
+            session: Session dict
+            complete: Whether the session's form is complete
+        """
+        session_id = session["session_id"]
+        self.created_at.set(session_id, session["created_at"])
+        self.last_updated.set(session_id, session["last_updated"])
+        if complete:
+            self.complete.add(session_id)
+
+    def update(self, session: dict, complete: Optional[bool] = None) -> None:
+        """
+        Reindex an updated session.
+
+        Args:
+            session: Session dict after the update
+            complete: New completion status, or None if unchanged
+        """
+        session_id = session["session_id"]
+        self.last_updated.set(session_id, session["last_updated"])
+        if complete is True:
+            self.complete.add(session_id)
+        elif complete is False:
+            self.complete.discard(session_id)
+
+    def remove(self, session_id: str) -> None:
+        """Remove a session from all indexes."""
+        self.created_at.remove(session_id)
+        self.last_updated.remove(session_id)
+        self.complete.discard(session_id)
+
+    def clear(self) -> None:
+        """Remove all sessions."""
+        self.created_at.clear()
+        self.last_updated.clear()
+        self.complete.clear()
+
+    def is_complete(self, session_id: str) -> bool:
+        """Whether the session's form is complete."""
+        return session_id in self.complete
@@ -0,0 +1,458 @@
+import json
+import mmap
+import os
+import struct
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from forms.registry import compiled_form
+from storage.session_tiers import ColdSession
+
+
+# Record types
+RECORD_CREATE = 1
+RECORD_TURN = 2
+RECORD_FORM_DELTA = 3
+RECORD_HISTORY = 4
+RECORD_DELETE = 5
+
+ROLES = ["system", "user", "assistant"]
+
+JOURNAL_MAGIC = b"AIJRNL1\0"
+SNAPSHOT_MAGIC = b"AISNAP1\0"
+
+# File header: magic, generation
+FILE_HEADER = struct.Struct("<8sQ")
+# Record frame: payload length, CRC32 of payload
+RECORD_HEADER = struct.Struct("<II")
+# Payload prefix: record type, session UUID, timestamp in microseconds
+PAYLOAD_PREFIX = struct.Struct("<B16sq")
+ROLE_CODE = struct.Struct("<B")
+# Snapshot: session count, then length-prefixed JSON per session
+SNAPSHOT_COUNT = struct.Struct("<I")
+SNAPSHOT_ENTRY = struct.Struct("<I")
+
+JOURNAL_FILE = "sessions.journal"
+ROTATED_JOURNAL_FILE = "sessions.journal.old"
+SNAPSHOT_FILE = "sessions.snapshot"
+
+
+def _to_micros(timestamp: str) -> int:
+    """Convert an ISO UTC timestamp to integer microseconds since the epoch."""
+    moment = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
+    return int(moment.timestamp()) * 1_000_000 + moment.microsecond
+
+
+def _from_micros(micros: int) -> str:
+    """Convert integer microseconds since the epoch to an ISO UTC timestamp."""
+    seconds, microsecond = divmod(micros, 1_000_000)
+    moment = datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=microsecond)
+    return moment.replace(tzinfo=None).isoformat()
+
+
+def flatten_form(form_data: Dict, prefix: str = "") -> Dict[str, Dict]:
+    """
+    Flatten nested form data into dotted field paths.
+
+    Args:
+        form_data: Form data dict (form model_dump())
+        prefix: Path prefix for nested groups
+
+    Returns:
+        Mapping of dotted path to field value dict
+    """
+    flat = {}
+    for name, value in form_data.items():
+        if isinstance(value, dict) and "value" not in value:
+            flat.update(flatten_form(value, f"{prefix}{name}."))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+def form_delta(previous: Dict, current: Dict) -> Dict[str, Dict]:
+    """
+    Compute changed fields between two versions of form data.
+
+    Args:
+        previous: Previous form data dict
+        current: Current form data dict
+
+    Returns:
+        Mapping of dotted path to new field value dict
+    """
+    previous_flat = flatten_form(previous)
+    return {
+        path: value
+        for path, value in flatten_form(current).items()
+        if previous_flat.get(path) != value
+    }
+
+
+def apply_form_delta(form_data: Dict, delta: Dict[str, Dict]) -> None:
+    """Apply a form delta to form data in place."""
+    for path, value in delta.items():
+        target = form_data
+        *parents, name = path.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = value
+
+
+class SessionJournal:
+    """
+    Append-only write-ahead journal of session mutations with snapshots.
+
+    Each mutation is appended as a compact binary record framed by its
+    length and CRC32, so a torn write at the tail is detected and dropped on
+    replay. Compaction rotates the journal and writes a snapshot of every
+    session in a background thread; journals and snapshots carry a
+    generation number so recovery never applies a record twice.
+    """
+
+    def __init__(self, directory: str, fsync: bool = False):
+        """
+        Initialize session journal.
+
+        Args:
+            directory: Directory holding journal and snapshot files
+            fsync: Fsync after every record (survives power loss, not just crashes)
+        """
+        self.directory = directory
+        self.fsync = fsync
+        self.generation = 0
+        self.turn_counts: Dict[str, int] = {}
+        self._fd: Optional[int] = None
+
+    def _path(self, name: str) -> str:
+        """Get the full path of a journal file."""
+        return os.path.join(self.directory, name)
+
+    def open(self) -> Dict[str, dict]:
+        """
+        Recover sessions from disk and open the journal for appending.
+
+        Returns:
+            Recovered sessions keyed by session ID
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        snapshot_generation, sessions = self._load_snapshot()
+        latest_generation = snapshot_generation
+
+        for name in (ROTATED_JOURNAL_FILE, JOURNAL_FILE):
+            generation = self._replay(self._path(name), snapshot_generation, sessions)
+            if generation is not None:
+                latest_generation = max(latest_generation, generation)
+
+        # Fold everything recovered into a fresh snapshot and start a new journal
+        latest_generation = max(latest_generation, 0)
+        self.write_snapshot(latest_generation, self._view(sessions))
+        self.generation = latest_generation + 1
+        self._write_file_header(self._path(JOURNAL_FILE), self.generation)
+        self._fd = os.open(self._path(JOURNAL_FILE), os.O_WRONLY | os.O_APPEND)
+
+        self.turn_counts = {
+            session_id: len(session["conversation_history"])
+            for session_id, session in sessions.items()
+        }
+
+        return sessions
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def record_create(self, session: dict) -> None:
+        """Record a new session. The body is the session's form ID."""
+        self.turn_counts[session["session_id"]] = 0
+        self._append(
+            RECORD_CREATE,
+            session["session_id"],
+            session["created_at"],
+            session["form_id"].encode("utf-8")
+        )
+
+    def record_update(
+        self,
+        session_id: str,
+        conversation_history: Optional[list],
+        previous_form_data: Optional[dict],
+        form_data: Optional[dict],
+        timestamp: str
+    ) -> None:
+        """
+        Record a session update as appended turns and/or a form delta.
+
+        Histories only grow by appending, so only messages past the last
+        journaled turn are written. A shorter history is written in full.
+
+        Args:
+            session_id: The session ID
+            conversation_history: New conversation history (optional)
+            previous_form_data: Form data before the update
+            form_data: New form data (optional)
+            timestamp: Update timestamp (ISO format)
+        """
+        if conversation_history is not None:
+            logged = self.turn_counts.get(session_id, 0)
+            if len(conversation_history) < logged:
+                body = json.dumps(conversation_history, separators=(",", ":")).encode("utf-8")
+                self._append(RECORD_HISTORY, session_id, timestamp, body)
+            else:
+                for message in conversation_history[logged:]:
+                    body = ROLE_CODE.pack(ROLES.index(message["role"])) + message["content"].encode("utf-8")
+                    self._append(RECORD_TURN, session_id, timestamp, body)
+            self.turn_counts[session_id] = len(conversation_history)
+
+        if form_data is not None:
+            delta = form_delta(previous_form_data or {}, form_data)
+            if delta:
+                body = json.dumps(delta, separators=(",", ":")).encode("utf-8")
+                self._append(RECORD_FORM_DELTA, session_id, timestamp, body)
+
+    def record_delete(self, session_id: str, timestamp: str) -> None:
+        """Record a session deletion."""
+        self.turn_counts.pop(session_id, None)
+        self._append(RECORD_DELETE, session_id, timestamp, b"")
+
+    def _append(self, record_type: int, session_id: str, timestamp: str, body: bytes) -> None:
+        """Frame and append a single record."""
+        payload = PAYLOAD_PREFIX.pack(record_type, uuid.UUID(session_id).bytes, _to_micros(timestamp)) + body
+        os.write(self._fd, RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        if self.fsync:
+            os.fsync(self._fd)
+
+    def rotate(
+        self,
+        sessions: Dict[str, dict],
+        cold_sessions: Optional[Dict[str, ColdSession]] = None
+    ) -> Tuple[int, List[tuple]]:
+        """
+        Rotate the journal and capture a snapshot view of all sessions.
+
+        Must run on the event loop, between mutations, so the view matches the
+        rotated journal exactly. Only references are copied here; encoding
+        (and expanding cold sessions) happens later in write_snapshot.
+
+        Args:
+            sessions: Live sessions keyed by session ID
+            cold_sessions: Compressed idle sessions keyed by session ID
+
+        Returns:
+            Tuple of (snapshot generation, session view)
+        """
+        view = self._view(sessions, cold_sessions)
+
+        snapshot_generation = self.generation
+        self.close()
+        rotated_path = self._path(ROTATED_JOURNAL_FILE)
+        if os.path.exists(rotated_path):
+            # An earlier snapshot failed, so the rotated journal still holds
+            # records no snapshot covers: keep them and add this generation's
+            # after them. The file keeps the older generation, so it is
+            # replayed unless a snapshot covering both has been written.
+            self._append_records(self._path(JOURNAL_FILE), rotated_path)
+            os.remove(self._path(JOURNAL_FILE))
+        else:
+            os.replace(self._path(JOURNAL_FILE), rotated_path)
+        self.generation += 1
+        self._write_file_header(self._path(JOURNAL_FILE), self.generation)
+        self._fd = os.open(self._path(JOURNAL_FILE), os.O_WRONLY | os.O_APPEND)
+
+        return snapshot_generation, view
+
+    @staticmethod
+    def _view(
+        sessions: Dict[str, dict],
+        cold_sessions: Optional[Dict[str, ColdSession]] = None
+    ) -> List[tuple]:
+        """
+        Capture references to every session's fields for a snapshot.
+        Cold sessions are captured whole, in place of their history.
+        """
+        view = [
+            (
+                session["session_id"],
+                session["form_id"],
+                session["created_at"],
+                session["last_updated"],
+                list(session["conversation_history"]),
+                session["form_data"]
+            )
+            for session in sessions.values()
+        ]
+        view.extend(
+            (cold.session_id, cold.form_id, cold.created_at, cold.last_updated, cold, None)
+            for cold in (cold_sessions or {}).values()
+        )
+        return view
+
+    def write_snapshot(self, generation: int, view: List[tuple]) -> None:
+        """
+        Write a snapshot file and drop the journal it replaces.
+        Safe to run in a worker thread.
+
+        Args:
+            generation: Generation of the newest journal the snapshot covers
+            view: Session view returned by rotate()
+        """
+        tmp_path = self._path(f"{SNAPSHOT_FILE}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(FILE_HEADER.pack(SNAPSHOT_MAGIC, generation))
+            f.write(SNAPSHOT_COUNT.pack(len(view)))
+            for session_id, form_id, created_at, last_updated, history, form_data in view:
+                if isinstance(history, ColdSession):
+                    history, form_data = history.expand()
+                entry = json.dumps({
+                    "session_id": session_id,
+                    "form_id": form_id,
+                    "conversation_history": history,
+                    "form_data": form_data,
+                    "created_at": created_at,
+                    "last_updated": last_updated
+                }, separators=(",", ":")).encode("utf-8")
+                f.write(SNAPSHOT_ENTRY.pack(len(entry)))
+                f.write(entry)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(SNAPSHOT_FILE))
+
+        rotated_path = self._path(ROTATED_JOURNAL_FILE)
+        if os.path.exists(rotated_path):
+            os.remove(rotated_path)
+
+    def _load_snapshot(self) -> Tuple[int, Dict[str, dict]]:
+        """
+        Load the latest snapshot.
+
+        Returns:
+            Tuple of (snapshot generation or -1, sessions)
+        """
+        sessions: Dict[str, dict] = {}
+        path = self._path(SNAPSHOT_FILE)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return -1, sessions
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, generation = FILE_HEADER.unpack_from(data, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"Invalid snapshot file: {path}")
+            offset = FILE_HEADER.size
+            (count,) = SNAPSHOT_COUNT.unpack_from(data, offset)
+            offset += SNAPSHOT_COUNT.size
+            for _ in range(count):
+                (length,) = SNAPSHOT_ENTRY.unpack_from(data, offset)
+                offset += SNAPSHOT_ENTRY.size
+                session = json.loads(data[offset:offset + length])
+                offset += length
+                # Snapshots written before multiple forms hold demographics sessions
+                session.setdefault("form_id", "demographics")
+                sessions[session["session_id"]] = session
+
+        return generation, sessions
+
+    def _replay(
+        self,
+        path: str,
+        snapshot_generation: int,
+        sessions: Dict[str, dict]
+    ) -> Optional[int]:
+        """
+        Replay journal records newer than the snapshot into sessions.
+
+        Args:
+            path: Journal file path
+            snapshot_generation: Generation covered by the loaded snapshot
+            sessions: Sessions to apply records to
+
+        Returns:
+            Journal generation, or None if the journal is missing
+        """
+        if not os.path.exists(path) or os.path.getsize(path) < FILE_HEADER.size:
+            return None
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, generation = FILE_HEADER.unpack_from(data, 0)
+            if magic != JOURNAL_MAGIC:
+                raise ValueError(f"Invalid journal file: {path}")
+
+            offset = FILE_HEADER.size
+            size = len(data)
+            while offset + RECORD_HEADER.size <= size:
+                length, crc = RECORD_HEADER.unpack_from(data, offset)
+                start = offset + RECORD_HEADER.size
+                payload = data[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    # Torn write from a crash; everything after it is lost
+                    break
+                if generation > snapshot_generation:
+                    self._apply(payload, sessions)
+                offset = start + length
+
+        return generation
+
+    @staticmethod
+    def _apply(payload: bytes, sessions: Dict[str, dict]) -> None:
+        """Apply a single record payload to sessions."""
+        record_type, session_bytes, micros = PAYLOAD_PREFIX.unpack_from(payload, 0)
+        session_id = str(uuid.UUID(bytes=session_bytes))
+        timestamp = _from_micros(micros)
+        body = payload[PAYLOAD_PREFIX.size:]
+
+        if record_type == RECORD_CREATE:
+            form_id = body.decode("utf-8") or "demographics"
+            sessions[session_id] = {
+                "session_id": session_id,
+                "form_id": form_id,
+                "conversation_history": [],
+                "form_data": compiled_form(form_id).empty(),
+                "created_at": timestamp,
+                "last_updated": timestamp
+            }
+            return
+
+        if record_type == RECORD_DELETE:
+            sessions.pop(session_id, None)
+            return
+
+        session = sessions.get(session_id)
+        if session is None:
+            return
+
+        if record_type == RECORD_TURN:
+            (role_code,) = ROLE_CODE.unpack_from(body, 0)
+            session["conversation_history"].append({
+                "role": ROLES[role_code],
+                "content": body[ROLE_CODE.size:].decode("utf-8")
+            })
+        elif record_type == RECORD_HISTORY:
+            session["conversation_history"] = json.loads(body)
+        elif record_type == RECORD_FORM_DELTA:
+            apply_form_delta(session["form_data"], json.loads(body))
+
+        session["last_updated"] = timestamp
+
+    @staticmethod
+    def _append_records(source_path: str, target_path: str) -> None:
+        """Append a journal's records (without its file header) to another journal."""
+        with open(source_path, "rb") as source, open(target_path, "ab") as target:
+            source.seek(FILE_HEADER.size)
+            while True:
+                block = source.read(1 << 20)
+                if not block:
+                    break
+                target.write(block)
+            target.flush()
+            os.fsync(target.fileno())
+
+    @staticmethod
+    def _write_file_header(path: str, generation: int) -> None:
+        """Create a journal file containing only its header."""
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(JOURNAL_MAGIC, generation))
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,181 @@
+import sys
+import zlib
+from typing import Dict, List, Tuple
+from serialization import dumps, loads
+
+
+# zlib level for cold sessions; conversations compress well at the default
+COMPRESSION_LEVEL = 6
+
+
+class ColdSession:
+    """
+    An idle session compressed into a byte blob.
+
+    Listing metadata stays uncompressed, so cold sessions can be listed
+    and indexed without expanding them.
+    """
+
+    __slots__ = ("session_id", "form_id", "created_at", "last_updated", "message_count", "blob")
+
+    def __init__(self, session: dict):
+        """
+        Compress a session. Safe to run in a worker thread.
+
+        Args:
+            session: Session dict
+        """
+        self.session_id = session["session_id"]
+        self.form_id = session["form_id"]
+        self.created_at = session["created_at"]
+        self.last_updated = session["last_updated"]
+        self.message_count = len(session["conversation_history"])
+        self.blob = zlib.compress(
+            dumps([session["conversation_history"], session["form_data"]]),
+            COMPRESSION_LEVEL
+        )
+
+    def expand(self) -> Tuple[list, dict]:
+        """
+        Decompress the session contents.
+
+        Returns:
+            Tuple of (conversation_history, form_data)
+        """
+        conversation_history, form_data = loads(zlib.decompress(self.blob))
+        return conversation_history, form_data
+
+    def thaw(self) -> dict:
+        """
+        Rebuild the session dict.
+
+        Returns:
+            Session dict
+        """
+        conversation_history, form_data = self.expand()
+        return {
+            "session_id": self.session_id,
+            "form_id": self.form_id,
+            "conversation_history": conversation_history,
+            "form_data": form_data,
+            "created_at": self.created_at,
+            "last_updated": self.last_updated
+        }
+
+    def memory_size(self) -> int:
+        """Approximate bytes held by the cold session."""
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.blob)
+            + sys.getsizeof(self.created_at)
+            + sys.getsizeof(self.last_updated)
+        )
+
+
+def snapshot_session(session: dict) -> dict:
+    """
+    Copy a session's mutable contents so it can be read in a worker thread
+    while the event loop keeps changing the live session. Messages and
+    strings are never changed in place, so they are shared.
+
+    Args:
+        session: Session dict
+
+    Returns:
+        Session dict with its own history list and form data dicts
+    """
+    return {
+        **session,
+        "conversation_history": list(session["conversation_history"]),
+        "form_data": _copy_dicts(session["form_data"])
+    }
+
+
+def _copy_dicts(data: Dict) -> Dict:
+    """Copy nested dicts (form data groups and field values)."""
+    return {
+        key: _copy_dicts(value) if isinstance(value, dict) else value
+        for key, value in data.items()
+    }
+
+
+def freeze_sessions(sessions: List[dict]) -> List[ColdSession]:
+    """
+    Compress sessions. Runs in a worker thread.
+
+    Args:
+        sessions: Session dicts
+
+    Returns:
+        Cold sessions in the same order
+    """
+    return [ColdSession(session) for session in sessions]
+
+
+def deep_sizeof(obj) -> int:
+    """
+    Approximate bytes held by a session's object graph (dicts, lists and
+    scalars). Shared interned objects are counted once per call.
+
+    Args:
+        obj: Object to measure
+
+    Returns:
+        Size in bytes
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return total
+
+
+def memory_report(hot: List[dict], cold: List[ColdSession], largest: int = 10) -> Dict:
+    """
+    Measure per-session memory use. Runs in a worker thread.
+
+    Args:
+        hot: Expanded session dicts
+        cold: Cold sessions
+        largest: Number of largest sessions to list
+
+    Returns:
+        Per-tier session counts and bytes, and the largest sessions
+    """
+    sizes = []
+    for session in hot:
+        try:
+            sizes.append(("hot", session["session_id"], deep_sizeof(session)))
+        except RuntimeError:
+            # Changed by the event loop while being measured
+            continue
+    sizes.extend(("cold", session.session_id, session.memory_size()) for session in cold)
+
+    def tier_summary(tier: str) -> Dict:
+        tier_sizes = [size for name, _, size in sizes if name == tier]
+        total = sum(tier_sizes)
+        return {
+            "sessions": len(tier_sizes),
+            "bytes": total,
+            "avg_bytes": round(total / len(tier_sizes)) if tier_sizes else None
+        }
+
+    sizes.sort(key=lambda entry: entry[2], reverse=True)
+    return {
+        "hot": tier_summary("hot"),
+        "cold": tier_summary("cold"),
+        "largest": [
+            {"session_id": session_id, "tier": tier, "bytes": size}
+            for tier, session_id, size in sizes[:largest]
+        ]
+    }
@@ -0,0 +1,158 @@
+import base64
+import binascii
+import hashlib
+import os
+import time
+import zlib
+from typing import Optional
+from forms.registry import compiled_form
+from serialization import dumps, loads
+from storage.session_journal import ROLES, apply_form_delta, flatten_form
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+
+
+TOKEN_VERSION = 1
+NONCE_SIZE = 12
+# Bound to every token so ciphertexts from other uses of the key are rejected
+ASSOCIATED_DATA = b"ai-intake-state-token"
+
+
+class InvalidStateTokenError(Exception):
+    """Raised when a state token is malformed, tampered with or expired."""
+    pass
+
+
+class StateTokenCodec:
+    """
+    Encodes a whole session into an encrypted token held by the client.
+
+    The session is compacted first: the system prompt is dropped (it is
+    rebuilt from the form), messages become [role code, content] pairs and
+    only filled form fields are kept. The result is zlib-compressed and
+    sealed with AES-GCM, which both encrypts it and authenticates it, so
+    a token cannot be read or altered without the secret.
+    """
+
+    def __init__(self, secret: str, ttl_seconds: int):
+        """
+        Initialize the codec.
+
+        Args:
+            secret: Shared secret of all workers
+            ttl_seconds: Age after which a token is rejected
+
+        Raises:
+            RuntimeError: If the cryptography package is not installed
+        """
+        if AESGCM is None:
+            raise RuntimeError("Stateless sessions require the cryptography package")
+        self.aead = AESGCM(hashlib.sha256(secret.encode("utf-8")).digest())
+        self.ttl_seconds = ttl_seconds
+
+    def encode(self, session: dict) -> str:
+        """
+        Encode a session as a state token.
+
+        Args:
+            session: Session dict
+
+        Returns:
+            URL-safe token
+        """
+        history = session["conversation_history"]
+        has_system_prompt = bool(history) and history[0]["role"] == "system"
+        fields = {
+            path: [field["value"], field["confidence"], field["turn"]]
+            for path, field in flatten_form(session["form_data"]).items()
+            if field["value"] is not None
+        }
+        payload = [
+            TOKEN_VERSION,
+            session["session_id"],
+            session["form_id"],
+            session["created_at"],
+            session["last_updated"],
+            int(time.time()),
+            has_system_prompt,
+            [[ROLES.index(msg["role"]), msg["content"]] for msg in history[has_system_prompt:]],
+            fields
+        ]
+
+        nonce = os.urandom(NONCE_SIZE)
+        sealed = self.aead.encrypt(nonce, zlib.compress(dumps(payload), 9), ASSOCIATED_DATA)
+        return base64.urlsafe_b64encode(nonce + sealed).rstrip(b"=").decode("ascii")
+
+    def decode(self, token: str) -> dict:
+        """
+        Decode a state token back into a session dict.
+
+        Args:
+            token: Token produced by encode()
+
+        Returns:
+            Session dict
+
+        Raises:
+            InvalidStateTokenError: If the token is malformed, tampered with or expired
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            plain = self.aead.decrypt(raw[:NONCE_SIZE], raw[NONCE_SIZE:], ASSOCIATED_DATA)
+            (
+                version, session_id, form_id, created_at, last_updated,
+                issued_at, has_system_prompt, messages, fields
+            ) = loads(zlib.decompress(plain))
+        except (binascii.Error, InvalidTag, zlib.error, ValueError, TypeError):
+            raise InvalidStateTokenError("Invalid session state token")
+
+        if version != TOKEN_VERSION:
+            raise InvalidStateTokenError("Unsupported session state token version")
+        if time.time() - issued_at > self.ttl_seconds:
+            raise InvalidStateTokenError("Session state token has expired")
+
+        try:
+            form = compiled_form(form_id)
+        except ValueError:
+            raise InvalidStateTokenError(f"Unknown form in session state token: {form_id}")
+        history = [{"role": ROLES[role], "content": content} for role, content in messages]
+        if has_system_prompt:
+            history.insert(0, {"role": "system", "content": form.system_prompt})
+
+        form_data = form.empty()
+        apply_form_delta(form_data, {
+            path: {"value": value, "confidence": confidence, "turn": turn}
+            for path, (value, confidence, turn) in fields.items()
+        })
+
+        return {
+            "session_id": session_id,
+            "form_id": form_id,
+            "conversation_history": history,
+            "form_data": form_data,
+            "created_at": created_at,
+            "last_updated": last_updated
+        }
+
+
+def create_state_codec(secret: Optional[str], ttl_seconds: int) -> StateTokenCodec:
+    """
+    Create the state token codec for stateless mode.
+
+    Args:
+        secret: STATE_TOKEN_SECRET
+        ttl_seconds: STATE_TOKEN_TTL_SECONDS
+
+    Returns:
+        State token codec
+
+    Raises:
+        ValueError: If no secret is configured
+    """
+    if not secret:
+        raise ValueError("STATE_TOKEN_SECRET is required when STATELESS_SESSIONS is enabled")
+    return StateTokenCodec(secret, ttl_seconds)
@@ -0,0 +1,123 @@
+"""
+Build the bundled US ZIP index (data/us_zip_index.bin).
+
+Accepts either the zips.json(.bz2) dataset shipped with the MIT-licensed
+`zipcodes` package, or a CSV file with zip, city and state columns.
+
+Usage:
+    cd backend
+    python -m tools.build_zip_index SOURCE [--output data/us_zip_index.bin]
+"""
+import argparse
+import bz2
+import csv
+import json
+from array import array
+from typing import Dict, List, Tuple
+from services.zip_index import INDEX_HEADER, INDEX_MAGIC, INDEX_PATH, STATE_NAMES
+
+
+def read_source(path: str) -> List[Tuple[str, str, str]]:
+    """
+    Read (zip, city, state) rows from a source dataset.
+
+    Args:
+        path: Path to a .json, .json.bz2 or .csv file
+
+    Returns:
+        Rows for active ZIP codes in known states
+    """
+    rows = []
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                rows.append((record["zip"], record["city"], record["state"]))
+    else:
+        opener = bz2.open if path.endswith(".bz2") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for record in json.load(f):
+                if record.get("active", True):
+                    rows.append((record["zip_code"], record["city"], record["state"]))
+
+    return [
+        (zip_code.zfill(5), city.strip(), state.upper())
+        for zip_code, city, state in rows
+        if zip_code.isdigit() and state.upper() in STATE_NAMES
+    ]
+
+
+def pad(data: bytes) -> bytes:
+    """Pad a section to 4-byte alignment."""
+    return data + b"\0" * (-len(data) % 4)
+
+
+def build_index(rows: List[Tuple[str, str, str]]) -> bytes:
+    """
+    Encode rows into the index file format read by services.zip_index.ZipIndex.
+
+    Args:
+        rows: (zip, city, state) rows
+
+    Returns:
+        Index file contents
+    """
+    states = sorted({state for _, _, state in rows})
+    state_ids = {state: i for i, state in enumerate(states)}
+
+    # Cities sorted by (state, lowercased name) so lookups can bisect within a state
+    cities = sorted({(state, city) for _, city, state in rows}, key=lambda c: (state_ids[c[0]], c[1].lower()))
+    city_ids: Dict[Tuple[str, str], int] = {city: i for i, city in enumerate(cities)}
+    if len(cities) > 0xFFFF or len(rows) > 0xFFFF:
+        raise ValueError("Index format supports at most 65535 cities and ZIP codes")
+
+    rows = sorted({zip_code: (zip_code, city, state) for zip_code, city, state in rows}.values())
+    zips = array("I", (int(zip_code) for zip_code, _, _ in rows))
+    zip_cities = array("H", (city_ids[(state, city)] for _, city, state in rows))
+
+    city_states = array("B", (state_ids[state] for state, _ in cities))
+
+    names = bytearray()
+    name_offsets = array("I", [0])
+    for _, city in cities:
+        names += city.encode("utf-8")
+        name_offsets.append(len(names))
+
+    zips_by_city: List[List[int]] = [[] for _ in cities]
+    for position, city_id in enumerate(zip_cities):
+        zips_by_city[city_id].append(position)
+    city_zips = array("H")
+    city_zip_offsets = array("I", [0])
+    for positions in zips_by_city:
+        city_zips.extend(positions)
+        city_zip_offsets.append(len(city_zips))
+
+    return b"".join([
+        INDEX_HEADER.pack(INDEX_MAGIC, len(zips), len(cities), len(states), len(names)),
+        pad(zips.tobytes()),
+        pad(zip_cities.tobytes()),
+        pad(city_states.tobytes()),
+        pad(name_offsets.tobytes()),
+        pad(city_zip_offsets.tobytes()),
+        pad(city_zips.tobytes()),
+        pad("".join(states).encode("ascii")),
+        bytes(names)
+    ])
+
+
+def main() -> None:
+    """Build the index file."""
+    parser = argparse.ArgumentParser(description="Build the bundled US ZIP index")
+    parser.add_argument("source", help="zips.json(.bz2) from the zipcodes package, or a zip,city,state CSV")
+    parser.add_argument("--output", default=INDEX_PATH, help="Output index file")
+    args = parser.parse_args()
+
+    rows = read_source(args.source)
+    data = build_index(rows)
+    with open(args.output, "wb") as f:
+        f.write(data)
+
+    print(f"Wrote {len(data)} bytes ({len(rows)} ZIP codes) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
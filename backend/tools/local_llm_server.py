@@ -0,0 +1,165 @@
+"""
+Stand-in for a local OpenAI-compatible inference server.
+
+Serves /v1/models and /v1/chat/completions with scripted replies, so the
+local provider can be exercised without a model server. JSON requests
+(response_format json_object, or prompts asking for JSON) get an empty
+JSON object; other requests get a fixed follow-up question. Capability
+flags make the server reject streaming or JSON mode like servers that
+lack them.
+
+Usage:
+    cd backend
+    python -m tools.local_llm_server [--port 8080] [--api-key KEY]
+        [--no-streaming] [--no-json-mode] [--token-delay 0.02]
+
+    LLM_PROVIDER=local LOCAL_LLM_BASE_URL=http://localhost:8080/v1 python app.py
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+
+MODEL_NAME = "local-stand-in"
+REPLY = "Thanks, I have noted that. Could you tell me a little more?"
+JSON_REPLY = "{}"
+
+
+def scripted_reply(messages: List[Dict[str, str]], json_mode: bool) -> str:
+    """
+    Pick the reply for a request.
+
+    Args:
+        messages: Request messages
+        json_mode: Whether response_format json_object was requested
+
+    Returns:
+        Reply text
+    """
+    if json_mode or "json" in (messages[-1].get("content") or "").lower():
+        return JSON_REPLY
+    return REPLY
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count (whitespace-separated words)."""
+    return len(text.split())
+
+
+def create_app(
+    api_key: Optional[str] = None,
+    streaming: bool = True,
+    json_mode: bool = True,
+    token_delay: float = 0.0
+) -> FastAPI:
+    """
+    Create the stand-in server.
+
+    Args:
+        api_key: Bearer token to require (None accepts any request)
+        streaming: Whether streamed completions are supported
+        json_mode: Whether response_format json_object is supported
+        token_delay: Seconds between streamed chunks
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="Local LLM stand-in")
+
+    def check_auth(authorization: Optional[str]) -> None:
+        if api_key and authorization != f"Bearer {api_key}":
+            raise HTTPException(status_code=401, detail="Invalid API key")
+
+    @app.get("/v1/models")
+    async def list_models(authorization: Optional[str] = Header(None)):
+        check_auth(authorization)
+        return {"object": "list", "data": [{"id": MODEL_NAME, "object": "model", "owned_by": "local"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request, authorization: Optional[str] = Header(None)):
+        check_auth(authorization)
+        body = await request.json()
+        wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+        if wants_json and not json_mode:
+            raise HTTPException(status_code=400, detail="response_format is not supported")
+        if body.get("stream") and not streaming:
+            raise HTTPException(status_code=400, detail="Streaming is not supported")
+
+        messages = body.get("messages") or []
+        reply = scripted_reply(messages, wants_json)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        model = body.get("model") or MODEL_NAME
+        usage = {
+            "prompt_tokens": sum(count_tokens(msg.get("content") or "") for msg in messages),
+            "completion_tokens": count_tokens(reply)
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }
+
+        async def events() -> AsyncIterator[str]:
+            def chunk(delta: dict, finish_reason: Optional[str] = None, **extra) -> str:
+                data = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                    **extra
+                }
+                return f"data: {json.dumps(data)}\n\n"
+
+            yield chunk({"role": "assistant", "content": ""})
+            words = reply.split(" ")
+            for i, word in enumerate(words):
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+                yield chunk({"content": word if i == 0 else f" {word}"})
+            yield chunk({}, "stop", usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main() -> None:
+    """Run the stand-in server."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--api-key", help="Require this bearer token")
+    parser.add_argument("--no-streaming", action="store_true", help="Reject streamed completions")
+    parser.add_argument("--no-json-mode", action="store_true", help="Reject response_format json_object")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    args = parser.parse_args()
+
+    app = create_app(
+        api_key=args.api_key,
+        streaming=not args.no_streaming,
+        json_mode=not args.no_json_mode,
+        token_delay=args.token_delay
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
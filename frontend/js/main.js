@@ -4,6 +4,7 @@
 
 import * as StateManager from './modules/stateManager.js';
 import * as APIClient from './modules/apiClient.js';
+import * as SocketClient from './modules/socketClient.js';
 import * as ChatUI from './modules/chatUI.js';
 import * as FormDisplay from './modules/formDisplay.js';
 
@@ -51,6 +52,9 @@ async function createNewSession() {
         document.getElementById('session-id').textContent =
             sessionData.session_id.slice(0, 8) + '...';
 
+        // Open WebSocket for streamed turns (falls back to HTTP if unavailable)
+        await connectSocket(sessionData.session_id);
+
         ChatUI.setLoading(false);
 
     } catch (error) {
@@ -59,6 +63,69 @@ async function createNewSession() {
     }
 }
 
+// Delay before reopening a dropped WebSocket
+const SOCKET_RECONNECT_DELAY_MS = 2000;
+
+/**
+ * Open the session WebSocket
+ * @param {string} sessionId - The session ID
+ */
+async function connectSocket(sessionId) {
+    let streaming = false;
+
+    try {
+        await SocketClient.connect(sessionId, {
+            token: (event) => {
+                // Start a new assistant message on the first chunk of a turn
+                if (!streaming) {
+                    streaming = true;
+                    StateManager.addMessage('assistant', '');
+                }
+                StateManager.appendToLastMessage(event.content);
+            },
+            assistant_message: () => {
+                streaming = false;
+                StateManager.setLoading(false);
+            },
+            form_field: (event) => {
+                // Fill the form panel while extraction is still streaming
+                StateManager.setFormField(event.path, event.field);
+                FormDisplay.updateFormField(event.path, event.field);
+            },
+            form_update: (event) => {
+                if (event.updated_fields && Object.keys(event.updated_fields).length > 0) {
+                    StateManager.updateFormData(event.updated_fields);
+                }
+            },
+            state: (event) => {
+                APIClient.setStateToken(event.state_token);
+            },
+            close: () => {
+                // A turn in flight over the dropped socket will never finish
+                if (StateManager.getState().isLoading) {
+                    streaming = false;
+                    StateManager.setLoading(false);
+                    ChatUI.showChatError('Connection lost. Please resend your last message.');
+                }
+                // Reconnect; messages go over HTTP until then (or for good if it fails)
+                setTimeout(() => {
+                    if (StateManager.getState().sessionId === sessionId) {
+                        connectSocket(sessionId);
+                    }
+                }, SOCKET_RECONNECT_DELAY_MS);
+            },
+            error: (event) => {
+                streaming = false;
+                StateManager.setLoading(false);
+                showError(event.detail);
+                ChatUI.showChatError(event.detail);
+            }
+        }, APIClient.getStateToken());
+    } catch (error) {
+        console.log('WebSocket unavailable, using HTTP');
+    }
+}
+
 /**
  * Handle sending a message
  * @param {string} message - User message
@@ -81,6 +148,12 @@ async function handleSendMessage(message) {
         // Set loading state
         StateManager.setLoading(true);
 
+        // Prefer the open WebSocket; events arrive through the socket handlers
+        if (SocketClient.isConnected()) {
+            SocketClient.sendMessage(message);
+            return;
+        }
+
         // Send message to API
         const response = await APIClient.sendMessage(state.sessionId, message);
 
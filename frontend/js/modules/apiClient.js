@@ -5,6 +5,82 @@
 // API base URL - adjust based on environment
 const API_BASE_URL = 'http://localhost:8000/api';
 
+// Retries of POST requests that failed with a network error
+const MAX_RETRIES = 2;
+const RETRY_DELAY_MS = 500;
+
+// Session state token, set when the backend runs with stateless sessions
+let stateToken = null;
+
+/**
+ * Get the current session state token
+ * @returns {string|null} State token, or null if the backend keeps sessions
+ */
+export function getStateToken() {
+    return stateToken;
+}
+
+/**
+ * Replace the session state token (e.g. from a WebSocket state event)
+ * @param {string|null} token - New state token
+ */
+export function setStateToken(token) {
+    stateToken = token;
+}
+
+/**
+ * Build request headers, adding the session state token if there is one
+ * @param {Object} headers - Base headers
+ * @returns {Object} Headers to send
+ */
+function withState(headers) {
+    return stateToken ? { ...headers, 'X-Session-State': stateToken } : headers;
+}
+
+/**
+ * Keep the state token returned with a response
+ * @param {Object} data - Response body
+ * @returns {Object} The same response body
+ */
+function keepState(data) {
+    if (data.state_token) {
+        stateToken = data.state_token;
+    }
+    return data;
+}
+
+/**
+ * POST a JSON request, retrying network failures.
+ * Every attempt sends the same Idempotency-Key, so the backend runs the
+ * request once even if an earlier attempt reached it.
+ * @param {string} url - Request URL
+ * @param {string} [body] - JSON request body
+ * @returns {Promise<Response>} Fetch response
+ * @throws {Error} If every attempt fails with a network error
+ */
+async function postWithRetry(url, body) {
+    const idempotencyKey = crypto.randomUUID();
+
+    for (let attempt = 0; ; attempt++) {
+        try {
+            return await fetch(url, {
+                method: 'POST',
+                headers: withState({
+                    'Content-Type': 'application/json',
+                    'Idempotency-Key': idempotencyKey
+                }),
+                body
+            });
+        } catch (error) {
+            // fetch only rejects on network errors
+            if (attempt >= MAX_RETRIES) {
+                throw error;
+            }
+            await new Promise(resolve => setTimeout(resolve, RETRY_DELAY_MS * (attempt + 1)));
+        }
+    }
+}
+
 /**
  * Create a new conversation session
  * @returns {Promise<Object>} Session data with session_id and initial_message
@@ -12,19 +88,16 @@ const API_BASE_URL = 'http://localhost:8000/api';
  */
 export async function createSession() {
     try {
-        const response = await fetch(`${API_BASE_URL}/sessions`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            }
-        });
+        // A new session starts without the previous session's state
+        stateToken = null;
+        const response = await postWithRetry(`${API_BASE_URL}/sessions`);
 
         if (!response.ok) {
             const error = await response.json();
             throw new Error(error.detail || 'Failed to create session');
         }
 
-        return await response.json();
+        return keepState(await response.json());
     } catch (error) {
         throw new Error(`Failed to create session: ${error.message}`);
     }
@@ -39,20 +112,17 @@ export async function createSession() {
  */
 export async function sendMessage(sessionId, message) {
     try {
-        const response = await fetch(`${API_BASE_URL}/sessions/${sessionId}/messages`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ message })
-        });
+        const response = await postWithRetry(
+            `${API_BASE_URL}/sessions/${sessionId}/messages`,
+            JSON.stringify({ message })
+        );
 
         if (!response.ok) {
             const error = await response.json();
             throw new Error(error.detail || 'Failed to send message');
         }
 
-        return await response.json();
+        return keepState(await response.json());
     } catch (error) {
         throw new Error(`Failed to send message: ${error.message}`);
     }
@@ -68,9 +138,9 @@ export async function getSessionState(sessionId) {
     try {
         const response = await fetch(`${API_BASE_URL}/sessions/${sessionId}`, {
             method: 'GET',
-            headers: {
+            headers: withState({
                 'Content-Type': 'application/json'
-            }
+            })
         });
 
         if (!response.ok) {
@@ -104,6 +174,7 @@ export async function deleteSession(sessionId) {
             throw new Error(error.detail || 'Failed to delete session');
         }
 
+        stateToken = null;
         return await response.json();
     } catch (error) {
         throw new Error(`Failed to delete session: ${error.message}`);
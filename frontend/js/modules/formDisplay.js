@@ -56,6 +56,17 @@ export function updateForm(formData, updatedFields = {}) {
     updateFormStatus(isFormComplete(formData));
 }
 
+/**
+ * Update one field as soon as it is extracted, without re-rendering the form
+ * @param {string} fieldName - Dotted field path (e.g. 'address.zip')
+ * @param {Object} fieldData - Field data with value and confidence
+ */
+export function updateFormField(fieldName, fieldData) {
+    const wasFilled = previouslyFilledFields.has(fieldName);
+    updateField(fieldName, fieldData);
+    animateField(fieldName, wasFilled);
+}
+
 /**
  * Update a single field
  * @param {string} fieldName - Field name
@@ -102,36 +113,40 @@ function updateField(fieldName, fieldData) {
 }
 
 /**
- * Highlight recently updated fields
- * @param {Object} updatedFields - Object with updated field names
+ * Play the update animation on a field
+ * @param {string} fieldName - Field name
+ * @param {boolean} wasPreviouslyFilled - Whether the field already had a value
  */
-function highlightUpdatedFields(updatedFields) {
-    // Helper to add animation class
-    const animateField = (fieldName, wasPreviouslyFilled) => {
-        const elementId = fieldMapping[fieldName];
-        if (!elementId) return;
+function animateField(fieldName, wasPreviouslyFilled) {
+    const elementId = fieldMapping[fieldName];
+    if (!elementId) return;
 
-        const element = document.getElementById(elementId);
-        if (!element) return;
+    const element = document.getElementById(elementId);
+    if (!element) return;
 
-        // Choose animation based on whether field was previously filled
-        const animationClass = wasPreviouslyFilled ? 'corrected' : 'updated';
+    // Choose animation based on whether field was previously filled
+    const animationClass = wasPreviouslyFilled ? 'corrected' : 'updated';
 
-        // Remove existing animation classes
-        element.classList.remove('updated', 'corrected');
+    // Remove existing animation classes
+    element.classList.remove('updated', 'corrected');
 
-        // Trigger reflow to restart animation
-        void element.offsetWidth;
+    // Trigger reflow to restart animation
+    void element.offsetWidth;
 
-        // Add animation class
-        element.classList.add(animationClass);
+    // Add animation class
+    element.classList.add(animationClass);
 
-        // Remove animation class after animation completes
-        setTimeout(() => {
-            element.classList.remove(animationClass);
-        }, 1000);
-    };
+    // Remove animation class after animation completes
+    setTimeout(() => {
+        element.classList.remove(animationClass);
+    }, 1000);
+}
 
+/**
+ * Highlight recently updated fields
+ * @param {Object} updatedFields - Object with updated field names
+ */
+function highlightUpdatedFields(updatedFields) {
     // Handle top-level fields
     for (const fieldName of Object.keys(updatedFields)) {
         if (fieldName === 'address') {
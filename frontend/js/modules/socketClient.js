@@ -0,0 +1,93 @@
+/**
+ * Socket Client - Keeps a WebSocket open for a session's chat turns
+ */
+
+// WebSocket base URL - adjust based on environment
+const WS_BASE_URL = 'ws://localhost:8000/api';
+
+let socket = null;
+let handlers = {};
+
+/**
+ * Open a WebSocket connection for a session
+ * @param {string} sessionId - The session ID
+ * @param {Object} eventHandlers - Callbacks keyed by event type
+ *     (token, assistant_message, form_field, form_update, state, error, close)
+ * @param {string|null} [stateToken] - Session state token (stateless backends only)
+ * @returns {Promise<void>} Resolves once the connection is open
+ * @throws {Error} If the connection cannot be opened
+ */
+export function connect(sessionId, eventHandlers, stateToken = null) {
+    // Only one connection at a time; a replaced socket must not deliver events
+    disconnect();
+    handlers = eventHandlers || {};
+    const connectionHandlers = handlers;
+
+    return new Promise((resolve, reject) => {
+        const ws = new WebSocket(`${WS_BASE_URL}/sessions/${sessionId}/ws`);
+        socket = ws;
+        let opened = false;
+
+        ws.addEventListener('open', () => {
+            opened = true;
+            // A stateless backend loads the session from the first frame
+            if (stateToken) {
+                ws.send(JSON.stringify({ type: 'state', state_token: stateToken }));
+            }
+            resolve();
+        });
+
+        ws.addEventListener('error', () => {
+            reject(new Error('Failed to open WebSocket connection'));
+        });
+
+        ws.addEventListener('message', (event) => {
+            if (socket !== ws) return;
+            const data = JSON.parse(event.data);
+            const handler = connectionHandlers[data.type];
+            if (handler) {
+                handler(data);
+            }
+        });
+
+        ws.addEventListener('close', () => {
+            if (socket !== ws) return;
+            socket = null;
+            // Only report drops of an established connection
+            if (opened && connectionHandlers.close) {
+                connectionHandlers.close();
+            }
+        });
+    });
+}
+
+/**
+ * Check whether the connection is open
+ * @returns {boolean} True if messages can be sent over the socket
+ */
+export function isConnected() {
+    return socket !== null && socket.readyState === WebSocket.OPEN;
+}
+
+/**
+ * Send a user message over the socket
+ * @param {string} message - User message
+ * @throws {Error} If the socket is not connected
+ */
+export function sendMessage(message) {
+    if (!isConnected()) {
+        throw new Error('WebSocket is not connected');
+    }
+    socket.send(JSON.stringify({ type: 'message', message }));
+}
+
+/**
+ * Close the connection
+ */
+export function disconnect() {
+    if (socket) {
+        const ws = socket;
+        socket = null;
+        ws.close();
+    }
+}
@@ -70,6 +70,18 @@ export function addMessage(role, content) {
     notifyListeners();
 }
 
+/**
+ * Append streamed text to the last message in the conversation
+ * @param {string} content - Text chunk to append
+ */
+export function appendToLastMessage(content) {
+    const lastMessage = state.messages[state.messages.length - 1];
+    if (lastMessage) {
+        lastMessage.content += content;
+        notifyListeners();
+    }
+}
+
 /**
  * Update form data
  * @param {Object} updates - Form field updates
@@ -83,6 +95,23 @@ export function updateFormData(updates) {
     notifyListeners();
 }
 
+/**
+ * Store one streamed form field without notifying listeners
+ * (the form panel updates that field directly)
+ * @param {string} path - Dotted field path (e.g. 'address.zip')
+ * @param {Object} fieldData - Field data with value and confidence
+ */
+export function setFormField(path, fieldData) {
+    const names = path.split('.');
+    const name = names.pop();
+    let target = state.formData;
+    for (const group of names) {
+        target[group] = { ...(target[group] || {}) };
+        target = target[group];
+    }
+    target[name] = fieldData;
+}
+
 /**
  * Set loading state
  * @param {boolean} loading - Loading state